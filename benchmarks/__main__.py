@@ -0,0 +1,172 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.stages import BACKENDS, compare_results, run_benchmarks
+from benchmarks.synth import DEFAULT_MIX, SynthConfig, ensure_repo, generate_repo
+
+
+def _parse_mix(value: str) -> Dict[str, int]:
+    mix: Dict[str, int] = {}
+    for item in value.split(","):
+        language, _, weight = item.partition("=")
+        try:
+            mix[language.strip()] = int(weight) if weight else 1
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid weight in {item!r}") from None
+    return mix
+
+
+def _add_synth_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = SynthConfig()
+    mix = ",".join(f"{language}={weight}" for language, weight in DEFAULT_MIX.items())
+    parser.add_argument("--files", type=int, default=defaults.files, help="Files to generate")
+    parser.add_argument(
+        "--mix",
+        type=_parse_mix,
+        default=None,
+        help=f"Language weights, e.g. python=3,go=1 (default {mix})",
+    )
+    parser.add_argument(
+        "--functions", type=int, default=defaults.functions, help="Functions per file"
+    )
+    parser.add_argument(
+        "--statements",
+        type=int,
+        default=defaults.statements,
+        help="Statements per innermost function body",
+    )
+    parser.add_argument(
+        "--density",
+        type=float,
+        default=defaults.density,
+        help="Share of statements that are crypto calls",
+    )
+    parser.add_argument(
+        "--depth", type=int, default=defaults.depth, help="Nested functions per body"
+    )
+    parser.add_argument(
+        "--minified",
+        type=float,
+        default=defaults.minified,
+        help="Share of JS/TS files written minified on one line",
+    )
+    parser.add_argument("--seed", type=int, default=defaults.seed, help="Generator seed")
+
+
+def _config(args: argparse.Namespace) -> SynthConfig:
+    return SynthConfig(
+        files=args.files,
+        mix=args.mix if args.mix is not None else dict(DEFAULT_MIX),
+        functions=args.functions,
+        statements=args.statements,
+        density=args.density,
+        depth=args.depth,
+        minified=args.minified,
+        seed=args.seed,
+    )
+
+
+def _write_json(payload: dict, out: Optional[Path]) -> None:
+    text = json.dumps(payload, indent=2, sort_keys=True) + "\n"
+    if out is None or str(out) == "-":
+        sys.stdout.write(text)
+    else:
+        out.write_text(text, encoding="utf-8")
+
+
+def _generate(args: argparse.Namespace) -> int:
+    try:
+        stats = generate_repo(args.repo, _config(args))
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    _write_json(asdict(stats), None)
+    return 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    config = _config(args)
+    backends: List[str] = args.backend or list(BACKENDS)
+    with tempfile.TemporaryDirectory(prefix="cbom-bench-") as temp:
+        root = args.repo or Path(temp) / "repo"
+        try:
+            stats = ensure_repo(root, config)
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        results = run_benchmarks(
+            root, config, stats, repeat=args.repeat, jobs=args.jobs, backends=backends
+        )
+    _write_json(results, args.out)
+    for stage, timing in results["stages"].items():
+        print(f"{stage:24} {timing['best'] * 1000:10.1f} ms", file=sys.stderr)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    old = json.loads(args.old.read_text(encoding="utf-8"))
+    new = json.loads(args.new.read_text(encoding="utf-8"))
+    if old.get("config") != new.get("config"):
+        print("warning: results were produced from different repo configs", file=sys.stderr)
+    rows = compare_results(old, new, threshold=args.threshold)
+    for stage, before, after, regressed in rows:
+        change = (after - before) / before * 100 if before else 0.0
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{stage:24} {before * 1000:10.1f} ms {after * 1000:10.1f} ms {change:+7.1f}%{flag}")
+    return 1 if any(row[3] for row in rows) else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    generate = subparsers.add_parser("generate", help="Write a synthetic repository")
+    generate.add_argument("repo", type=Path, help="Directory to generate into")
+    _add_synth_arguments(generate)
+    generate.set_defaults(func=_generate)
+
+    run = subparsers.add_parser("run", help="Time each scan stage on a synthetic repository")
+    _add_synth_arguments(run)
+    run.add_argument(
+        "--repo",
+        type=Path,
+        default=None,
+        help="Keep the generated repository here and reuse it when the config matches",
+    )
+    run.add_argument("--repeat", type=int, default=3, help="Runs per stage; the best is reported")
+    run.add_argument("--jobs", type=int, default=1, help="Worker processes for end-to-end")
+    run.add_argument(
+        "--backend",
+        action="append",
+        choices=BACKENDS,
+        help="Backend to time (repeatable; default all)",
+    )
+    run.add_argument("--out", type=Path, default=None, help="Results JSON path (default stdout)")
+    run.set_defaults(func=_run)
+
+    compare = subparsers.add_parser("compare", help="Compare two results files")
+    compare.add_argument("old", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown fraction that counts as a regression (default 0.1)",
+    )
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+"""Per-stage timing of the scan pipeline."""
+
+from __future__ import annotations
+
+import gc
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from cbom_scanner import __version__
+from cbom_scanner.core import instrument
+from cbom_scanner.core.discovery import iter_files
+from cbom_scanner.core.dispatch import DispatchTable
+from cbom_scanner.core.models import CryptoFinding, RawFinding
+from cbom_scanner.core.normalizer import clear_cache, normalize_many
+from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.core.orchestrator import Orchestrator
+from cbom_scanner.core.utils import read_source
+from cbom_scanner.formats.cbom import write_cbom
+from cbom_scanner.scanners.base import LanguageScanner
+from cbom_scanner.scanners.registry import build_scanners
+
+from benchmarks.synth import RepoStats, SynthConfig
+
+
+RESULTS_FORMAT = 2
+
+# "tree-sitter" is each scanner's ``scan_source``, as ``scan`` runs it;
+# "regex" is its ``scan_heuristic`` line matcher.
+BACKENDS = ("tree-sitter", "regex")
+
+_Source = Tuple[Path, str, LanguageScanner]
+
+
+def _timing(samples: List[float]) -> Dict[str, object]:
+    return {
+        "best": min(samples),
+        "median": statistics.median(samples),
+        "samples": samples,
+    }
+
+
+def _time(function: Callable[[], object], repeat: int) -> Tuple[Dict[str, object], object]:
+    """Run ``function`` ``repeat`` times and time each run."""
+    samples: List[float] = []
+    result: object = None
+    for _ in range(repeat):
+        # As timeit does: collect first, then keep the collector out of the sample.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            result = function()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return _timing(samples), result
+
+
+def _read_sources(files: Sequence[Path], table: DispatchTable) -> List[_Source]:
+    return [
+        (path, read_source(path), table.scanners[index])
+        for path in files
+        for index in table.route(path)
+    ]
+
+
+def _scan(sources: Sequence[_Source]) -> List[RawFinding]:
+    raws: List[RawFinding] = []
+    for path, text, scanner in sources:
+        raws.extend(scanner.scan_source(str(path), text))
+    return raws
+
+
+def _scan_heuristic(sources: Sequence[_Source]) -> List[RawFinding]:
+    raws: List[RawFinding] = []
+    for path, text, scanner in sources:
+        raws.extend(scanner.scan_heuristic(str(path), text))
+    return raws
+
+
+def _time_scan(
+    sources: Sequence[_Source], repeat: int
+) -> Tuple[Dict[str, object], Dict[str, object], List[RawFinding]]:
+    """Time ``scan_source`` over ``sources``, split into its parse and match stages.
+
+    The scanners charge tree-sitter parsing to the ``parse`` instrument
+    stage; the rest of each run (matching, constant resolution, building
+    findings) is the match time.
+    """
+    parse: List[float] = []
+    match: List[float] = []
+    raws: List[RawFinding] = []
+    for _ in range(repeat):
+        recorder = instrument.Recorder()
+        gc.collect()
+        gc.disable()
+        try:
+            with instrument.recording(recorder):
+                start = time.perf_counter()
+                raws = _scan(sources)
+                total = time.perf_counter() - start
+        finally:
+            gc.enable()
+        timing = recorder.stages.get("parse")
+        parsed = timing.wall if timing is not None else 0.0
+        parse.append(parsed)
+        match.append(total - parsed)
+    return _timing(parse), _timing(match), raws
+
+
+def _normalize(raws: Sequence[RawFinding]) -> List[CryptoFinding]:
+    # Start cold so every sample pays for the distinct field combinations.
+    clear_cache()
+    return normalize_many(raws)
+
+
+def _serialize(findings: Sequence[CryptoFinding]) -> None:
+    ordered = sorted(findings, key=lambda finding: finding.id)
+    write_cbom(Path(os.devnull), "synth", ordered)
+
+
+def run_benchmarks(
+    root: Path,
+    config: SynthConfig,
+    stats: RepoStats,
+    repeat: int = 3,
+    jobs: int = 1,
+    backends: Sequence[str] = BACKENDS,
+) -> dict:
+    """Time each pipeline stage over the repository at ``root``.
+
+    Stages run in isolation on the previous stage's output, so their times add
+    up to a serial scan without the orchestration around it. ``end-to-end`` is
+    a full ``Orchestrator.scan`` with the result cache off.
+    """
+    options = ScanOptions(include_ts=True, jobs=jobs)
+    scanners = build_scanners()
+    table = DispatchTable(scanners, options)
+    stages: Dict[str, dict] = {}
+    findings: Dict[str, int] = {}
+
+    stages["discovery"], files = _time(lambda: list(iter_files(root, options.discovery)), repeat)
+    stages["read"], sources = _time(lambda: _read_sources(files, table), repeat)
+    # Load grammars, queries and rules up front, as the scan daemon does, so
+    # the first sample does not pay for them.
+    for scanner in scanners:
+        scanner.scan_source("<warm-up>", "")
+    for backend in backends:
+        if backend == "tree-sitter":
+            parse, match, raws = _time_scan(sources, repeat)
+            stages[f"{backend}.parse"], stages[f"{backend}.match"] = parse, match
+        else:
+            stages[f"{backend}.match"], raws = _time(lambda: _scan_heuristic(sources), repeat)
+        stages[f"{backend}.normalize"], normalized = _time(lambda: _normalize(raws), repeat)
+        stages[f"{backend}.serialize"], _ = _time(lambda: _serialize(normalized), repeat)
+        findings[backend] = len(normalized)
+    orchestrator = Orchestrator(scanners)
+    stages["end-to-end"], scanned = _time(lambda: orchestrator.scan(root, options), repeat)
+    findings["end-to-end"] = len(scanned)
+
+    return {
+        "format": RESULTS_FORMAT,
+        "generatedAt": datetime.now(timezone.utc).isoformat(),
+        "environment": {
+            "tool": __version__,
+            "python": sys.version.split()[0],
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "config": asdict(config),
+        "repo": asdict(stats),
+        "repeat": repeat,
+        "jobs": jobs,
+        "stages": stages,
+        "findings": findings,
+    }
+
+
+def compare_results(
+    old: dict, new: dict, threshold: float = 0.1, min_delta: float = 0.005
+) -> List[Tuple[str, float, float, bool]]:
+    """Return (stage, old best, new best, regressed) for stages in both runs.
+
+    A stage regresses when it got slower by more than ``threshold`` (a
+    fraction) and by more than ``min_delta`` seconds, which keeps sub-
+    millisecond noise from failing a comparison.
+    """
+    rows: List[Tuple[str, float, float, bool]] = []
+    for stage, timing in new.get("stages", {}).items():
+        previous = old.get("stages", {}).get(stage)
+        if previous is None:
+            continue
+        before, after = previous["best"], timing["best"]
+        regressed = after > before * (1 + threshold) and after - before > min_delta
+        rows.append((stage, before, after, regressed))
+    return rows
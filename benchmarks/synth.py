@@ -0,0 +1,249 @@
+"""Deterministic synthetic repositories for benchmarking."""
+
+from __future__ import annotations
+
+import json
+import random
+import shutil
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from cbom_scanner.core.rules import CallRule, RuleSet, load_rule_sets
+
+
+# Written at the root of every generated tree; holds the generating config.
+MARKER = ".cbom-synth.json"
+
+RULES_DIR = Path(__file__).parents[1] / "cbom_scanner" / "rules"
+
+# Generated language -> (file suffix, rule set language).
+LANGUAGES: Dict[str, Tuple[str, str]] = {
+    "python": (".py", "python"),
+    "javascript": (".js", "node"),
+    "typescript": (".ts", "node"),
+    "go": (".go", "go"),
+    "rust": (".rs", "rust"),
+    "c": (".c", "c"),
+    "cpp": (".cpp", "c"),
+    "java": (".java", "java"),
+    "csharp": (".cs", "csharp"),
+}
+
+DEFAULT_MIX = {
+    "python": 3,
+    "javascript": 3,
+    "typescript": 1,
+    "go": 2,
+    "rust": 1,
+    "c": 2,
+    "cpp": 1,
+    "java": 2,
+    "csharp": 1,
+}
+
+_ARG_VALUES = {
+    "algorithm": ("aes-256-gcm", "aes-128-cbc", "sha256", "rsa", "chacha20-poly1305"),
+    "mode": ("GCM", "CBC", "CTR"),
+    "key_size_bits": ("128", "256", "2048", "prime256v1"),
+}
+
+
+@dataclass(frozen=True)
+class SynthConfig:
+    files: int = 1000
+    # Relative weights of generated languages.
+    mix: Dict[str, int] = field(default_factory=lambda: dict(DEFAULT_MIX))
+    # Functions per file and statements per innermost function body.
+    functions: int = 8
+    statements: int = 12
+    # Share of statements that are crypto calls matched by the rules.
+    density: float = 0.1
+    # Levels of nested functions/callbacks around each body.
+    depth: int = 2
+    # Share of JavaScript/TypeScript files written as a single minified line.
+    minified: float = 0.05
+    # Files per directory before a new directory is started.
+    fanout: int = 50
+    seed: int = 0
+
+
+@dataclass
+class RepoStats:
+    files: int = 0
+    bytes: int = 0
+    lines: int = 0
+    crypto_calls: int = 0
+    minified_files: int = 0
+    by_language: Dict[str, int] = field(default_factory=dict)
+
+
+class _Writer:
+    """Emits one language's syntax for the shared file skeleton."""
+
+    def __init__(self, language: str) -> None:
+        self.language = language
+
+    def prologue(self, index: int) -> List[str]:
+        if self.language == "go":
+            return ["package synth", ""]
+        if self.language in ("java", "csharp"):
+            return [f"class Synth{index} {{"]
+        return []
+
+    def epilogue(self) -> List[str]:
+        return ["}"] if self.language in ("java", "csharp") else []
+
+    def open_function(self, name: str, level: int) -> str:
+        language = self.language
+        if level == 0:
+            return {
+                "python": f"def {name}(data):",
+                "javascript": f"function {name}(data) {{",
+                "typescript": f"function {name}(data: string): void {{",
+                "go": f"func {name}(data string) {{",
+                "rust": f"fn {name}(data: &str) {{",
+                "c": f"void {name}(const char *data) {{",
+                "cpp": f"void Synth::{name}(const char *data) {{",
+                "java": f"void {name}(String data) {{",
+                "csharp": f"void {name}(string data) {{",
+            }[language]
+        return {
+            "python": f"def {name}(data):",
+            "javascript": "run(function () {",
+            "typescript": "run(() => {",
+            "go": "func() {",
+            "rust": f"let {name} = || {{",
+            "c": "{",
+            "cpp": f"auto {name} = [&]() {{",
+            "java": f"Runnable {name} = () -> {{",
+            "csharp": f"Action {name} = () => {{",
+        }[language]
+
+    def close_function(self, level: int) -> List[str]:
+        language = self.language
+        if language == "python":
+            return []
+        if level == 0 or language == "c":
+            return ["}"]
+        return {
+            "javascript": ["});"],
+            "typescript": ["});"],
+            "go": ["}()"],
+        }.get(language, ["};"])
+
+    def statement(self, call: str, args: List[str]) -> str:
+        text = f"{call}({', '.join(args)})"
+        if self.language == "python":
+            return f"result = {text}"
+        if self.language == "go":
+            return text
+        return text + ";"
+
+    def string(self, value: str) -> str:
+        return f'"{value}"'
+
+
+def _crypto_statement(writer: _Writer, rule: CallRule, rng: random.Random) -> str:
+    count = max(rule.arg_indexes.values(), default=-1) + 1
+    args = ["data"] * max(count, 1)
+    for key, index in rule.arg_indexes.items():
+        args[index] = writer.string(rng.choice(_ARG_VALUES[key]))
+    return writer.statement(rule.call, args)
+
+
+def _noise_statement(writer: _Writer, rng: random.Random) -> str:
+    return writer.statement(f"helper_{rng.randrange(64)}", ["data", str(rng.randrange(1000))])
+
+
+def render_file(
+    language: str, index: int, rule_set: RuleSet, config: SynthConfig, rng: random.Random
+) -> Tuple[str, int, bool]:
+    """Return (source, crypto call count, minified) for one generated file."""
+    writer = _Writer(language)
+    indent = "    "
+    lines = writer.prologue(index)
+    base = 1 if language in ("java", "csharp") else 0
+    crypto = 0
+    for function in range(config.functions):
+        for level in range(config.depth + 1):
+            name = f"fn_{index}_{function}_{level}"
+            lines.append(indent * (base + level) + writer.open_function(name, level))
+        body_indent = indent * (base + config.depth + 1)
+        for _ in range(config.statements):
+            if rule_set.calls and rng.random() < config.density:
+                rule = rng.choice(rule_set.calls)
+                lines.append(body_indent + _crypto_statement(writer, rule, rng))
+                crypto += 1
+            else:
+                lines.append(body_indent + _noise_statement(writer, rng))
+        for level in reversed(range(config.depth + 1)):
+            lines.extend(indent * (base + level) + line for line in writer.close_function(level))
+        lines.append("")
+    lines.extend(writer.epilogue())
+    minified = language in ("javascript", "typescript") and rng.random() < config.minified
+    if minified:
+        return "".join(line.strip() for line in lines) + "\n", crypto, True
+    return "\n".join(lines) + "\n", crypto, False
+
+
+def _read_marker(root: Path) -> Optional[dict]:
+    try:
+        return json.loads((root / MARKER).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_marker(root: Path, marker: dict) -> None:
+    (root / MARKER).write_text(json.dumps(marker, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def generate_repo(root: Path, config: SynthConfig) -> RepoStats:
+    """Write a synthetic repository under ``root``.
+
+    The same config always produces byte-identical trees. A tree previously
+    generated at ``root`` is replaced; any other non-empty directory is
+    rejected rather than deleted.
+    """
+    if root.exists() and any(root.iterdir()):
+        if _read_marker(root) is None:
+            raise ValueError(f"{root} is not empty and was not generated by the benchmarks")
+        shutil.rmtree(root)
+    root.mkdir(parents=True, exist_ok=True)
+    # Written first so an interrupted run can still be replaced; the stats
+    # are added once the tree is complete.
+    _write_marker(root, {"config": asdict(config)})
+    rule_sets = load_rule_sets(RULES_DIR)
+    rng = random.Random(config.seed)
+    languages = sorted(language for language, weight in config.mix.items() if weight > 0)
+    unknown = set(languages) - set(LANGUAGES)
+    if unknown:
+        raise ValueError(f"unknown languages: {', '.join(sorted(unknown))}")
+    weights = [config.mix[language] for language in languages]
+    stats = RepoStats()
+    for index in range(config.files):
+        language = rng.choices(languages, weights)[0]
+        suffix, rules_language = LANGUAGES[language]
+        source, crypto, minified = render_file(
+            language, index, rule_sets[rules_language], config, rng
+        )
+        directory = root / f"pkg{index // config.fanout:04d}"
+        directory.mkdir(exist_ok=True)
+        data = source.encode("utf-8")
+        (directory / f"synth_{index:06d}{suffix}").write_bytes(data)
+        stats.files += 1
+        stats.bytes += len(data)
+        stats.lines += source.count("\n")
+        stats.crypto_calls += crypto
+        stats.minified_files += minified
+        stats.by_language[language] = stats.by_language.get(language, 0) + 1
+    _write_marker(root, {"config": asdict(config), "stats": asdict(stats)})
+    return stats
+
+
+def ensure_repo(root: Path, config: SynthConfig) -> RepoStats:
+    """Reuse the tree at ``root`` if it was generated from ``config``, else generate it."""
+    marker = _read_marker(root)
+    if marker is not None and marker.get("config") == asdict(config) and "stats" in marker:
+        return RepoStats(**marker["stats"])
+    return generate_repo(root, config)
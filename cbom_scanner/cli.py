@@ -3,51 +3,349 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
 from pathlib import Path
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Tuple
 
+from cbom_scanner.core import instrument
+from cbom_scanner.core.bundle import BundleError, compile_rules, load_bundle, write_bundle
+from cbom_scanner.core.cache import default_cache_dir
+from cbom_scanner.core.diff import ADDED, CHANGED, REMOVED, Change, DiffSummary, diff_findings
+from cbom_scanner.core.git import GitError
+from cbom_scanner.core.models import CryptoFinding
 from cbom_scanner.core.orchestrator import Orchestrator
-from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.core.shard import merge_findings, parse_shard
+from cbom_scanner.core.options import (
+    DEFAULT_ARCHIVE_DEPTH,
+    DEFAULT_CACHE_MAX_BYTES,
+    DEFAULT_HOST,
+    DEFAULT_MEMORY_ENTRIES,
+    DEFAULT_PARSE_LIMIT,
+    DEFAULT_PORT,
+    DEFAULT_PREFETCH_BYTES,
+    DEFAULT_PREFETCH_THREADS,
+    DEFAULT_SNIPPET_CHARS,
+    TOKEN_ENV,
+    DiscoveryOptions,
+    ScanOptions,
+    SourceLimits,
+)
 from cbom_scanner.formats.cbom import write_cbom
 from cbom_scanner.formats.cyclonedx import write_cyclonedx
-from cbom_scanner.scanners import (
-    CScanner,
-    CSharpScanner,
-    GoScanner,
-    JavaScanner,
-    NodeScanner,
-    PythonScanner,
-    RustScanner,
-)
+from cbom_scanner.formats.diff import write_diff_json, write_diff_text
+from cbom_scanner.formats.ndjson import write_ndjson
+from cbom_scanner.formats.reader import iter_findings, load_report
+from cbom_scanner.scanners.registry import RULES_DIR, build_scanners
 
 
-def _build_scanners() -> List:
-    rules_dir = Path(__file__).parent / "rules"
-    return [
-        NodeScanner(rules_dir / "node.yaml"),
-        GoScanner(rules_dir / "go.yaml"),
-        RustScanner(rules_dir / "rust.yaml"),
-        CScanner(rules_dir / "c.yaml"),
-        PythonScanner(rules_dir / "python.yaml"),
-        JavaScanner(rules_dir / "java.yaml"),
-        CSharpScanner(rules_dir / "csharp.yaml"),
-    ]
+def _build_scanners(rules: Optional[str] = None) -> List:
+    # Scanner modules are imported, and their rules loaded, only once a
+    # file is routed to them.
+    bundle = load_bundle(Path(rules)) if rules is not None else None
+    return build_scanners(bundle=bundle)
 
 
 def _scan_repo(args: argparse.Namespace) -> int:
+    if not (args.stats or args.profile):
+        return _run_scan(args)
+    recorder = instrument.Recorder(slowest=args.slowest)
+    with instrument.recording(recorder):
+        status = _run_scan(args)
+    report = recorder.report()
+    if args.stats:
+        instrument.write_text_report(report, sys.stderr)
+    if args.profile:
+        Path(args.profile).write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    return status
+
+
+def _scan_options(
+    args: argparse.Namespace,
+    jobs: int = 1,
+    prefetch: int = 0,
+    prefetch_bytes: int = DEFAULT_PREFETCH_BYTES,
+) -> ScanOptions:
+    discovery = DiscoveryOptions(
+        use_ignore_files=not args.no_ignore,
+        default_excludes=not args.no_default_excludes,
+        max_file_size=args.max_file_size,
+        max_depth=args.max_depth,
+        follow_symlinks=args.follow_symlinks,
+        archive_depth=args.archive_depth,
+    )
+    cache_dir = None
+    if not args.no_cache:
+        cache_dir = Path(args.cache_dir) if args.cache_dir else default_cache_dir()
+    return ScanOptions(
+        include_ts=args.include_ts,
+        jobs=jobs,
+        discovery=discovery,
+        cache_dir=cache_dir,
+        cache_max_bytes=args.cache_max_size,
+        limits=SourceLimits(
+            parse_limit=args.parse_limit,
+            snippet_chars=args.max_snippet,
+            skip_generated=args.skip_generated,
+        ),
+        prefetch_threads=prefetch,
+        prefetch_bytes=prefetch_bytes,
+    )
+
+
+def _serve(args: argparse.Namespace) -> int:
+    # The HTTP stack is only needed here; keep it off every other command's startup.
+    import secrets
+
+    from cbom_scanner.core.server import ScanService, make_server, server_url
+
+    try:
+        scanners = _build_scanners(args.rules)
+    except BundleError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    service = ScanService(scanners, _scan_options(args), args.memory_entries)
+    service.warm()
+    # Any local process can reach a TCP port; a Unix socket is owner-only already.
+    token = None
+    if not args.socket:
+        token = os.environ.get(TOKEN_ENV) or secrets.token_urlsafe(32)
+    try:
+        server = make_server(
+            service,
+            host=args.host,
+            port=args.port,
+            socket_path=Path(args.socket) if args.socket else None,
+            verbose=args.verbose,
+            token=token,
+        )
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(f"cbom_scanner serving on {server_url(server)}", file=sys.stderr)
+    if token is not None:
+        print(f"scan requests need 'Authorization: Bearer {token}'", file=sys.stderr)
+    sys.stderr.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _run_scan(args: argparse.Namespace) -> int:
     repo_path = Path(args.repo).resolve()
-    orchestrator = Orchestrator(_build_scanners())
-    options = ScanOptions(include_ts=args.include_ts)
-    findings = orchestrator.scan(repo_path, options)
-    component = repo_path.name
+    try:
+        orchestrator = Orchestrator(_build_scanners(args.rules))
+    except BundleError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    options = _scan_options(
+        args, jobs=args.jobs, prefetch=args.prefetch, prefetch_bytes=args.prefetch_memory
+    )
+    if args.shard is not None and args.since is not None:
+        print("error: --shard cannot be combined with --since", file=sys.stderr)
+        return 2
+    if args.rev is not None and (args.since, args.baseline, args.shard) != (None, None, None):
+        print("error: --rev cannot be combined with --since, --baseline or --shard", file=sys.stderr)
+        return 2
+    if args.since is not None or args.baseline is not None:
+        if args.since is None or args.baseline is None:
+            print("error: --since and --baseline must be used together", file=sys.stderr)
+            return 2
+        try:
+            baseline = load_report(Path(args.baseline))
+        except (OSError, ValueError) as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+        try:
+            findings = orchestrator.scan_changes(
+                repo_path, args.since, baseline.findings, options
+            )
+        except GitError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+    elif args.rev is not None:
+        try:
+            findings = orchestrator.iter_scan_revision(
+                repo_path, args.rev, options, ordered=not args.unsorted
+            )
+        except GitError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+    elif args.shard is not None:
+        index, count = args.shard
+        files = orchestrator.shard_files(repo_path, index, count, options.discovery)
+        findings = orchestrator.iter_scan_files(files, options, ordered=not args.unsorted)
+    else:
+        findings = orchestrator.iter_scan(repo_path, options, ordered=not args.unsorted)
+    with instrument.stage("write"):
+        _write_report(args, repo_path.name, findings)
+    return 0
+
+
+def _write_report(
+    args: argparse.Namespace, component: str, findings: Iterable[CryptoFinding]
+) -> None:
     out_path = Path(args.out) if args.out is not None else None
     if args.format == "cbom":
         write_cbom(out_path, component, findings)
+    elif args.format == "ndjson":
+        write_ndjson(out_path, component, findings)
     else:
         write_cyclonedx(out_path, component, findings)
+
+
+def _merge(args: argparse.Namespace) -> int:
+    try:
+        reports = [load_report(Path(path)) for path in args.reports]
+        components = {report.component for report in reports}
+        if len(components) > 1:
+            names = ", ".join(sorted(components))
+            raise ValueError(f"inputs are for different components: {names}")
+        findings = merge_findings(report.findings for report in reports)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    _write_report(args, reports[0].component, findings)
+    return 0
+
+
+def _diff(args: argparse.Namespace) -> int:
+    summary = DiffSummary()
+    fail_on = set(args.fail_on or ())
+    algorithms = {name.upper() for name in args.fail_algorithm or ()}
+    failed = False
+
+    def gated(changes: Iterable[Change]) -> Iterator[Change]:
+        nonlocal failed
+        for change in changes:
+            if change.kind in fail_on and (
+                not algorithms or change.finding.algorithm.upper() in algorithms
+            ):
+                failed = True
+            yield change
+
+    old_path, new_path = Path(args.old), Path(args.new)
+    changes = gated(diff_findings(iter_findings(old_path), iter_findings(new_path), summary))
+    out_path = Path(args.out) if args.out is not None else None
+    try:
+        if args.format == "json":
+            write_diff_json(out_path, str(old_path), str(new_path), changes, summary)
+        else:
+            write_diff_text(out_path, changes, summary)
+    except (OSError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    return 1 if failed else 0
+
+
+def _shard_spec(value: str) -> Tuple[int, int]:
+    try:
+        return parse_shard(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
+def _compile_rules(args: argparse.Namespace) -> int:
+    try:
+        bundle = compile_rules([RULES_DIR, *map(Path, args.packs)])
+        write_bundle(bundle, Path(args.out))
+    except (OSError, BundleError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    print(
+        f"{args.out}: {bundle.rule_count} rules for {len(bundle.rule_sets)} languages,"
+        f" fingerprint {bundle.fingerprint[:16]}",
+        file=sys.stderr,
+    )
     return 0
 
 
+def _add_source_arguments(parser: argparse.ArgumentParser) -> None:
+    """Arguments that choose the files scanned and how, shared by scan and serve."""
+    parser.add_argument(
+        "--include-ts",
+        action="store_true",
+        help="Include TypeScript files in Node scanner",
+    )
+    parser.add_argument(
+        "--no-ignore",
+        action="store_true",
+        help="Do not honour .gitignore and .cbomignore files",
+    )
+    parser.add_argument(
+        "--no-default-excludes",
+        action="store_true",
+        help="Also walk .git, node_modules, vendor, target and build output",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=int,
+        default=None,
+        help="Skip files larger than this many bytes",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        default=None,
+        help="Do not descend more than this many directories below the repo",
+    )
+    parser.add_argument(
+        "--parse-limit",
+        type=int,
+        default=DEFAULT_PARSE_LIMIT,
+        help="Scan files larger than this many bytes line by line instead of parsing them",
+    )
+    parser.add_argument(
+        "--max-snippet",
+        type=int,
+        default=DEFAULT_SNIPPET_CHARS,
+        help="Cut longer snippets to this many characters around the match",
+    )
+    parser.add_argument(
+        "--skip-generated",
+        action="store_true",
+        help="Skip minified and generated files instead of scanning them",
+    )
+    parser.add_argument(
+        "--archive-depth",
+        type=int,
+        default=DEFAULT_ARCHIVE_DEPTH,
+        help="Scan inside zip/jar/wheel/tar archives nested up to this deep (0 disables)",
+    )
+    parser.add_argument(
+        "--follow-symlinks",
+        action="store_true",
+        help="Descend into symlinked directories (loops are detected and skipped)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Directory for the per-file result cache (default: ~/.cache/cbom-scanner)",
+    )
+    parser.add_argument(
+        "--cache-max-size",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES,
+        help="Evict least recently used cache entries above this many bytes",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the per-file result cache",
+    )
+    parser.add_argument(
+        "--rules",
+        default=None,
+        metavar="BUNDLE",
+        help="Use the rules of a bundle built by 'rules compile' instead of the rule files",
+    )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="cbom_scanner")
     sub = parser.add_subparsers(dest="command", required=True)
@@ -61,16 +359,166 @@ def build_parser() -> argparse.ArgumentParser:
     )
     scan.add_argument(
         "--format",
-        choices=["cbom", "cyclonedx"],
+        choices=["cbom", "cyclonedx", "ndjson"],
         default="cyclonedx",
         help="Output format",
     )
+    _add_source_arguments(scan)
     scan.add_argument(
-        "--include-ts",
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes (default: CPU count, 1 disables the pool)",
+    )
+    scan.add_argument(
+        "--prefetch",
+        type=int,
+        default=DEFAULT_PREFETCH_THREADS,
+        metavar="THREADS",
+        help="Threads reading files ahead of a --jobs 1 scan (0 disables read-ahead)",
+    )
+    scan.add_argument(
+        "--prefetch-memory",
+        type=int,
+        default=DEFAULT_PREFETCH_BYTES,
+        metavar="BYTES",
+        help="Most file contents buffered by read-ahead at once",
+    )
+    scan.add_argument(
+        "--since",
+        default=None,
+        help="Only rescan files changed since this git revision (requires --baseline)",
+    )
+    scan.add_argument(
+        "--baseline",
+        default=None,
+        help="Previous CBOM or CycloneDX report to update with the rescanned files",
+    )
+    scan.add_argument(
+        "--rev",
+        default=None,
+        help="Scan this git revision from the object database instead of the working tree",
+    )
+    scan.add_argument(
+        "--shard",
+        type=_shard_spec,
+        default=None,
+        metavar="I/N",
+        help="Scan only shard I of N (1-based), balanced by file size; see the merge command",
+    )
+    scan.add_argument(
+        "--unsorted",
         action="store_true",
-        help="Include TypeScript files in Node scanner",
+        help="Write findings as files are scanned instead of sorted by id",
+    )
+    scan.add_argument(
+        "--stats",
+        action="store_true",
+        help="Print per-stage, per-scanner and slowest-file timings to stderr",
+    )
+    scan.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="Write the same timings as JSON to PATH",
+    )
+    scan.add_argument(
+        "--slowest",
+        type=int,
+        default=instrument.DEFAULT_SLOWEST,
+        help="Number of slowest files to report with --stats/--profile",
     )
     scan.set_defaults(func=_scan_repo)
+
+    merge = sub.add_parser("merge", help="Combine the reports of scan --shard runs")
+    merge.add_argument("reports", nargs="+", help="CBOM or CycloneDX reports, one per shard")
+    merge.add_argument(
+        "--out",
+        default="-",
+        help="Output JSON path (use '-' for stdout)",
+    )
+    merge.add_argument(
+        "--format",
+        choices=["cbom", "cyclonedx", "ndjson"],
+        default="cyclonedx",
+        help="Output format",
+    )
+    merge.set_defaults(func=_merge)
+
+    diff = sub.add_parser("diff", help="Compare two CBOM or CycloneDX reports")
+    diff.add_argument("old", help="Earlier report")
+    diff.add_argument("new", help="Later report")
+    diff.add_argument(
+        "--out",
+        default="-",
+        help="Output path (use '-' for stdout)",
+    )
+    diff.add_argument(
+        "--format",
+        choices=["text", "json"],
+        default="text",
+        help="Output format",
+    )
+    diff.add_argument(
+        "--fail-on",
+        action="append",
+        choices=[ADDED, REMOVED, CHANGED],
+        help="Exit with status 1 if there are changes of this kind (repeatable)",
+    )
+    diff.add_argument(
+        "--fail-algorithm",
+        action="append",
+        metavar="NAME",
+        help="Only let --fail-on changes to this algorithm, e.g. MD5, fail (repeatable)",
+    )
+    diff.set_defaults(func=_diff)
+
+    rules = sub.add_parser("rules", help="Manage rule files")
+    rules_sub = rules.add_subparsers(dest="rules_command", required=True)
+    compile_ = rules_sub.add_parser(
+        "compile", help="Validate the rule files and build a precompiled rule bundle"
+    )
+    compile_.add_argument(
+        "packs",
+        nargs="*",
+        help="Extra rule files or directories, merged after the built-in rules",
+    )
+    compile_.add_argument("--out", required=True, help="Bundle path to write")
+    compile_.set_defaults(func=_compile_rules)
+
+    serve = sub.add_parser(
+        "serve", help="Keep scanners warm and answer scan requests over local HTTP"
+    )
+    _add_source_arguments(serve)
+    serve.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help="Loopback address to listen on",
+    )
+    serve.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help="TCP port to listen on (0 picks a free port)",
+    )
+    serve.add_argument(
+        "--socket",
+        default=None,
+        metavar="PATH",
+        help="Listen on a Unix socket at PATH instead of TCP",
+    )
+    serve.add_argument(
+        "--memory-entries",
+        type=int,
+        default=DEFAULT_MEMORY_ENTRIES,
+        help="Number of per-file results kept in memory between requests",
+    )
+    serve.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every request to stderr",
+    )
+    serve.set_defaults(func=_serve)
     return parser
 
 
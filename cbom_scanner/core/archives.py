@@ -0,0 +1,168 @@
+"""Archives (zip, jar, wheel, tar) scanned in place as virtual directories."""
+
+from __future__ import annotations
+
+import io
+import lzma
+import tarfile
+import zipfile
+import zlib
+from typing import IO, Callable, Iterable, Iterator, Optional, Tuple
+
+from cbom_scanner.core import instrument
+from cbom_scanner.core.discovery import DEFAULT_EXCLUDES
+from cbom_scanner.core.options import DiscoveryOptions
+from cbom_scanner.core.sources import MemorySource, ScanSource
+
+
+ZIP_SUFFIXES = (".zip", ".jar", ".war", ".ear", ".aar", ".whl")
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+
+# Separates an archive from the path of a member inside it, as in
+# ``app.jar!/com/example/Crypto.java``.
+MEMBER_SEPARATOR = "!/"
+
+# Members larger than this (or than ``max_file_size``) are skipped, whatever
+# size the archive claims for them.
+MAX_MEMBER_BYTES = 64 * 1024 * 1024
+
+_ARCHIVE_ERRORS = (
+    OSError,
+    EOFError,
+    zipfile.BadZipFile,
+    zipfile.LargeZipFile,
+    tarfile.TarError,
+    zlib.error,
+    lzma.LZMAError,
+    NotImplementedError,
+)
+
+# (member path, declared size, reader returning its bytes or None if too large)
+_Entry = Tuple[str, int, Callable[[], Optional[bytes]]]
+
+
+def archive_kind(name: str) -> Optional[str]:
+    """Return ``"zip"``, ``"tar"`` or None for a file name."""
+    lowered = name.lower()
+    if lowered.endswith(ZIP_SUFFIXES):
+        return "zip"
+    if lowered.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+
+def _excluded(member: str, options: DiscoveryOptions) -> bool:
+    if not options.default_excludes:
+        return False
+    return any(part in DEFAULT_EXCLUDES for part in member.split("/")[:-1])
+
+
+class _Walker:
+    def __init__(
+        self,
+        archive: ScanSource,
+        options: DiscoveryOptions,
+        wanted: Callable[[str], bool],
+    ) -> None:
+        self.label = str(archive)
+        self.origin = archive.origin if isinstance(archive, MemorySource) else archive
+        self.options = options
+        self.wanted = wanted
+        self.limit = MAX_MEMBER_BYTES
+        if options.max_file_size is not None:
+            self.limit = min(self.limit, options.max_file_size)
+
+    def members(
+        self, fileobj: IO[bytes], kind: str, prefix: str, depth: int
+    ) -> Iterator[MemorySource]:
+        entries = self._zip_entries if kind == "zip" else self._tar_entries
+        try:
+            for member, size, read in entries(fileobj):
+                member = member.lstrip("/")
+                if not member or _excluded(member, self.options):
+                    continue
+                nested = archive_kind(member) if depth < self.options.archive_depth else None
+                if nested is None and not self.wanted(member):
+                    continue
+                if size > self.limit:
+                    continue
+                data = read()
+                if data is None:
+                    continue
+                if nested is not None:
+                    yield from self.members(
+                        io.BytesIO(data), nested, prefix + member + MEMBER_SEPARATOR, depth + 1
+                    )
+                else:
+                    path = f"{self.label}{MEMBER_SEPARATOR}{prefix}{member}"
+                    yield MemorySource(path, data, origin=self.origin)
+        except _ARCHIVE_ERRORS:
+            # A truncated or corrupt archive ends its listing early; members
+            # already yielded stand.
+            instrument.count("archiveErrors")
+
+    def _read_limited(self, stream: IO[bytes]) -> Optional[bytes]:
+        # Declared sizes can lie; never read past the limit.
+        data = stream.read(self.limit + 1)
+        return data if len(data) <= self.limit else None
+
+    def _zip_entries(self, fileobj: IO[bytes]) -> Iterator[_Entry]:
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                # Directories, and encrypted members that cannot be read.
+                if info.is_dir() or info.flag_bits & 0x1:
+                    continue
+
+                def read(info: zipfile.ZipInfo = info) -> Optional[bytes]:
+                    with archive.open(info) as stream:
+                        return self._read_limited(stream)
+
+                yield info.filename, info.file_size, read
+
+    def _tar_entries(self, fileobj: IO[bytes]) -> Iterator[_Entry]:
+        # Stream mode reads members in order, without seeking back.
+        with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+            for info in archive:
+                if not info.isfile():
+                    continue
+
+                def read(info: tarfile.TarInfo = info) -> Optional[bytes]:
+                    stream = archive.extractfile(info)
+                    return self._read_limited(stream) if stream is not None else None
+
+                yield info.name, info.size, read
+
+
+def iter_members(
+    source: ScanSource, options: DiscoveryOptions, wanted: Callable[[str], bool]
+) -> Iterator[MemorySource]:
+    """Yield the members of archive ``source`` for which ``wanted(member)`` is true.
+
+    Members are reported as ``archive!/member``. Archives inside it are
+    opened in memory and walked as well while fewer than
+    ``options.archive_depth`` archives deep.
+    """
+    kind = archive_kind(source.name)
+    if kind is None or options.archive_depth < 1:
+        return
+    walker = _Walker(source, options, wanted)
+    if isinstance(source, MemorySource):
+        yield from walker.members(io.BytesIO(source.data), kind, "", 1)
+        return
+    try:
+        handle = open(source, "rb")
+    except OSError:
+        return
+    with handle:
+        yield from walker.members(handle, kind, "", 1)
+
+
+def iter_sources(
+    files: Iterable[ScanSource], options: DiscoveryOptions, wanted: Callable[[str], bool]
+) -> Iterator[ScanSource]:
+    """Yield ``files``, with each supported archive replaced by its wanted members."""
+    for source in files:
+        if options.archive_depth > 0 and archive_kind(source.name) is not None:
+            yield from iter_members(source, options, wanted)
+        else:
+            yield source
@@ -0,0 +1,188 @@
+"""Precompiled rule bundles: validated rule sets with their matcher indexes built ahead of time."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from cbom_scanner import __version__
+from cbom_scanner.core.matcher import TextMatcher
+from cbom_scanner.core.rules import RuleSet, check_rules, parse_rules
+
+
+# A bundle is this magic line, a JSON header line, then a JSON body holding
+# each language's rules and matcher index. It is plain data: loading checks
+# it like a rule file and never runs code from it.
+BUNDLE_MAGIC = b"cbom-rules\n"
+# Bump when the body layout, or that of ``TextMatcher.index()``, changes;
+# bundles from another format or package version are refused.
+BUNDLE_FORMAT = 2
+
+RULE_SUFFIXES = (".yaml", ".json")
+
+
+class BundleError(ValueError):
+    """Rule files that do not compile, or a bundle that cannot be loaded."""
+
+
+@dataclass(frozen=True)
+class RuleBundle:
+    # Over every rule set's fingerprint and matcher index, so it changes
+    # with any rule and exposes an index edited apart from its rules.
+    fingerprint: str
+    rule_sets: Dict[str, RuleSet]
+
+    @property
+    def rule_count(self) -> int:
+        return sum(len(rule_set.calls) for rule_set in self.rule_sets.values())
+
+
+def rule_files(paths: Iterable[Path]) -> List[Path]:
+    """``paths`` with every directory replaced by its rule files, sorted."""
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(
+                sorted(child for child in path.iterdir() if child.suffix in RULE_SUFFIXES)
+            )
+        else:
+            files.append(path)
+    return files
+
+
+def _bundle_fingerprint(rule_sets: Dict[str, RuleSet]) -> str:
+    entries = sorted(
+        (name, rules.fingerprint, rules.text_matcher.index()) for name, rules in rule_sets.items()
+    )
+    payload = json.dumps([BUNDLE_FORMAT, entries], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compile_rules(paths: Sequence[Path]) -> RuleBundle:
+    """Validate the rule files in ``paths`` and build one bundle from them.
+
+    Files for the same language (an organisation's pack next to the
+    built-in rules) are merged in order: imports are combined and calls
+    appended. Raises ``BundleError`` listing every problem found.
+    """
+    problems: List[str] = []
+    merged: Dict[str, Dict[str, Any]] = {}
+    owners: Dict[Tuple[str, str], Path] = {}
+    for path in rule_files(paths):
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, UnicodeDecodeError, ValueError) as exc:
+            problems.append(f"{path}: {exc}")
+            continue
+        found = check_rules(data, str(path))
+        if found:
+            problems.extend(found)
+            continue
+        language = data.get("language", path.stem)
+        target = merged.setdefault(language, {"language": language, "imports": [], "calls": []})
+        target["imports"].extend(
+            entry for entry in data.get("imports", []) if entry not in target["imports"]
+        )
+        for rule in data.get("calls", []):
+            key = (language, rule["id"])
+            if key in owners:
+                problems.append(
+                    f"{path}: rule {rule['id']!r} is already defined in {owners[key]}"
+                )
+                continue
+            owners[key] = path
+            target["calls"].append(rule)
+    if problems:
+        raise BundleError("\n".join(problems))
+    rule_sets = {language: parse_rules(data, language) for language, data in merged.items()}
+    return RuleBundle(_bundle_fingerprint(rule_sets), rule_sets)
+
+
+def write_bundle(bundle: RuleBundle, path: Path) -> None:
+    header = {
+        "format": BUNDLE_FORMAT,
+        "version": __version__,
+        "fingerprint": bundle.fingerprint,
+        "languages": sorted(bundle.rule_sets),
+        "rules": bundle.rule_count,
+    }
+    # The text matcher's trie is the costly part to build, so its tables are
+    # stored; the call matcher is cheap to rebuild on first use.
+    body = {
+        language: {"rules": asdict(rule_set), "textIndex": rule_set.text_matcher.index()}
+        for language, rule_set in bundle.rule_sets.items()
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    handle, temp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(handle, "wb") as stream:
+            stream.write(BUNDLE_MAGIC)
+            stream.write(json.dumps(header, sort_keys=True).encode("utf-8") + b"\n")
+            stream.write(json.dumps(body, sort_keys=True).encode("utf-8") + b"\n")
+        os.replace(temp_name, path)
+    except BaseException:
+        os.unlink(temp_name)
+        raise
+
+
+def _load_rule_set(path: Path, language: str, entry: Any) -> RuleSet:
+    rules = entry.get("rules") if isinstance(entry, dict) else None
+    problems = check_rules(rules, f"{path} ({language})")
+    if problems:
+        raise BundleError("\n".join(problems))
+    rule_set = parse_rules(rules, language)
+    try:
+        text_matcher = TextMatcher(rule_set.calls, entry["textIndex"])
+    except (KeyError, TypeError, ValueError) as exc:
+        raise BundleError(f"{path} is corrupt: {language}: {exc}") from None
+    # Fills the cached property, so the stored index is what scans use.
+    vars(rule_set)["text_matcher"] = text_matcher
+    return rule_set
+
+
+def load_bundle(path: Path) -> RuleBundle:
+    """Load a bundle written by ``write_bundle``.
+
+    The rules are checked as ``rules compile`` checks rule files, and the
+    fingerprint in the header must match them and the stored matcher index,
+    so an index edited or left stale apart from its rules is refused at
+    load rather than failing mid-scan.
+    """
+    try:
+        with open(path, "rb") as stream:
+            if stream.readline() != BUNDLE_MAGIC:
+                raise BundleError(f"{path} is not a rule bundle")
+            try:
+                header = json.loads(stream.readline())
+            except ValueError:
+                raise BundleError(f"{path} has a corrupt header") from None
+            if not isinstance(header, dict):
+                raise BundleError(f"{path} has a corrupt header")
+            if header.get("format") != BUNDLE_FORMAT or header.get("version") != __version__:
+                raise BundleError(
+                    f"{path} was compiled by cbom_scanner {header.get('version')};"
+                    " run 'cbom_scanner rules compile' again"
+                )
+            try:
+                body = json.loads(stream.read())
+            except ValueError as exc:
+                raise BundleError(f"{path} is corrupt: {exc}") from None
+    except OSError as exc:
+        raise BundleError(f"cannot read {path}: {exc}") from exc
+    if not isinstance(body, dict):
+        raise BundleError(f"{path} is corrupt: expected a JSON object")
+    rule_sets = {
+        language: _load_rule_set(path, language, entry) for language, entry in body.items()
+    }
+    fingerprint = _bundle_fingerprint(rule_sets)
+    if header.get("fingerprint") != fingerprint:
+        raise BundleError(
+            f"{path} is corrupt: its rules and index do not match the header fingerprint"
+        )
+    return RuleBundle(fingerprint, rule_sets)
+
@@ -0,0 +1,238 @@
+"""Persistent content-addressed cache of per-file scan results."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import ExitStack
+from dataclasses import asdict, fields, replace
+from pathlib import Path
+from typing import List, Optional
+
+from cbom_scanner import __version__
+from cbom_scanner.core import instrument
+from cbom_scanner.core.models import RawFinding
+from cbom_scanner.core.limits import (
+    Source,
+    apply_limits,
+    classify,
+    heuristic_reason,
+    open_source,
+)
+from cbom_scanner.core.options import DEFAULT_CACHE_MAX_BYTES, ScanOptions, SourceLimits
+from cbom_scanner.core.sources import MemorySource, ScanSource
+from cbom_scanner.core.utils import decode_source, iter_source_windows
+from cbom_scanner.scanners.base import LanguageScanner
+
+
+CACHE_FORMAT = "2"
+
+_RAW_FIELDS = tuple(field.name for field in fields(RawFinding) if field.name != "file")
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "cbom-scanner"
+
+
+class ScanCache:
+    """Stores each file's ``RawFinding`` list keyed by content and scanner.
+
+    Entries do not record the file path, so identical content found at another
+    path (or in another checkout) is a hit; the path is filled in on load.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        # Bytes written by ``put`` since the last eviction pass, and the
+        # cache size that pass left behind (unknown until one has run).
+        self.written = 0
+        self._size: Optional[int] = None
+
+    @classmethod
+    def from_options(cls, options: ScanOptions) -> Optional["ScanCache"]:
+        if options.cache_dir is None:
+            return None
+        return cls(options.cache_dir, options.cache_max_bytes)
+
+    def key(
+        self,
+        scanner: LanguageScanner,
+        suffix: str,
+        content_id: str,
+        limits: Optional[SourceLimits] = None,
+        kind: Optional[str] = None,
+        reason: Optional[str] = None,
+    ) -> str:
+        """Key of one file's findings.
+
+        ``kind`` and ``reason`` are what ``classify`` and ``heuristic_reason``
+        found. The file name can change them (``app.min.js``), so the same
+        content under another name may need its own entry.
+        """
+        limits_id = json.dumps(asdict(limits or SourceLimits()), sort_keys=True)
+        payload = "|".join(
+            [
+                CACHE_FORMAT,
+                __version__,
+                scanner.fingerprint(),
+                suffix,
+                content_id,
+                limits_id,
+                kind or "",
+                reason or "",
+            ]
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def get(self, key: str, file: str) -> Optional[List[RawFinding]]:
+        entry = self._entry_path(key)
+        # Like a failed write, a damaged or foreign entry is only a miss.
+        try:
+            records = json.loads(entry.read_text(encoding="utf-8"))
+            if not isinstance(records, list):
+                raise TypeError("cache entry is not a list")
+            findings = [
+                RawFinding(file=file, **{name: record[name] for name in _RAW_FIELDS})
+                for record in records
+            ]
+        except (OSError, ValueError, KeyError, TypeError):
+            self.misses += 1
+            return None
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+        self.hits += 1
+        return findings
+
+    def put(self, key: str, findings: List[RawFinding]) -> None:
+        records = []
+        for finding in findings:
+            record = asdict(finding)
+            del record["file"]
+            records.append(record)
+        data = json.dumps(records, separators=(",", ":")).encode("utf-8")
+        entry = self._entry_path(key)
+        # A read-only or full cache directory must never fail the scan.
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            handle, temp_path = tempfile.mkstemp(dir=entry.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "wb") as stream:
+                stream.write(data)
+            os.replace(temp_path, entry)
+            self.written += len(data)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+    def trim(self) -> int:
+        """Evict old entries if what was written since the last pass may need it.
+
+        ``evict`` stats every entry in the cache, so it only runs once
+        ``put`` has written something, and not while the size the last pass
+        found plus what was written since is still within ``max_bytes``.
+        """
+        if not self.written:
+            return 0
+        if self._size is not None and self._size + self.written <= self.max_bytes:
+            return 0
+        return self.evict()
+
+    def evict(self) -> int:
+        entries = []
+        total = 0
+        for entry in self.directory.glob("*/*.json"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry))
+            total += stat.st_size
+        removed = 0
+        entries.sort()
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                entry.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        self.written = 0
+        self._size = total
+        return removed
+
+
+def _content_id(path: ScanSource, data: Source) -> str:
+    if isinstance(path, MemorySource) and path.content_id is not None:
+        return path.content_id
+    return hashlib.sha256(data).hexdigest()
+
+
+def scan_file_cached(
+    scanner: LanguageScanner,
+    path: ScanSource,
+    cache: Optional[ScanCache],
+    limits: Optional[SourceLimits] = None,
+) -> List[RawFinding]:
+    """Scan one file within ``limits``, reusing cached results when possible.
+
+    Minified files and files over the parse limit get the scanner's heuristic
+    line matcher; generated files are scanned normally. Either way their
+    findings say so in ``notes``, unless ``skip_generated`` drops the file
+    (minified bundles count as generated output).
+    """
+    limits = limits if limits is not None else SourceLimits()
+    with ExitStack() as stack:
+        with instrument.stage("read"):
+            data = stack.enter_context(open_source(path))
+        kind = classify(path, data)
+        if kind is not None:
+            instrument.count(f"{kind}Files")
+            if limits.skip_generated:
+                return []
+        reason = heuristic_reason(data, kind, limits)
+        if cache is not None:
+            with instrument.stage("cache"):
+                key = cache.key(
+                    scanner, path.suffix, _content_id(path, data), limits, kind, reason
+                )
+                findings = cache.get(key, str(path))
+            if findings is not None:
+                instrument.count("cacheHits")
+                return findings
+            instrument.count("cacheMisses")
+        if reason is None:
+            text = decode_source(data)
+        else:
+            # The line matcher only needs whole lines, so a large (possibly
+            # memory-mapped) file is decoded a window at a time.
+            findings = []
+            for lines_before, window in iter_source_windows(data):
+                findings.extend(
+                    replace(finding, line=finding.line + lines_before)
+                    for finding in scanner.scan_heuristic(str(path), window)
+                )
+    if reason is None:
+        findings = scanner.scan_source(str(path), text)
+    note = "; ".join(dict.fromkeys(note for note in (reason, kind) if note is not None))
+    findings = apply_limits(findings, limits, note=note or None)
+    if cache is not None:
+        with instrument.stage("cache"):
+            cache.put(key, findings)
+    return findings
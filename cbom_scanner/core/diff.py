@@ -0,0 +1,182 @@
+"""Comparison of two scan results keyed by finding id."""
+
+from __future__ import annotations
+
+import heapq
+import pickle
+import tempfile
+from dataclasses import dataclass, field
+from itertools import groupby
+from operator import attrgetter
+from typing import IO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cbom_scanner.core.models import CryptoFinding
+
+
+# Findings sorted in memory at once; larger inputs are sorted in runs of this
+# size spilled to temporary files and merged.
+DEFAULT_RUN_SIZE = 100_000
+
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# Report field name and accessor of everything a finding's id does not cover.
+_COMPARED: Tuple[Tuple[str, Callable[[CryptoFinding], object]], ...] = (
+    ("assetType", attrgetter("asset_type")),
+    ("keySizeBits", attrgetter("key_size_bits")),
+    ("library", attrgetter("library")),
+    ("confidence", attrgetter("confidence")),
+    ("notes", attrgetter("notes")),
+    ("evidence.column", attrgetter("evidence.column")),
+    ("evidence.function", attrgetter("evidence.function")),
+    ("evidence.snippet", attrgetter("evidence.snippet")),
+)
+
+_finding_id = attrgetter("id")
+
+GroupKey = Tuple[str, str, str]
+
+
+@dataclass(frozen=True)
+class Change:
+    kind: str
+    old: Optional[CryptoFinding]
+    new: Optional[CryptoFinding]
+    # Report fields that differ, for ``CHANGED``.
+    fields: Tuple[str, ...] = ()
+
+    @property
+    def finding(self) -> CryptoFinding:
+        """The finding as it is now, or as it was for removals."""
+        return self.new if self.new is not None else self.old  # type: ignore[return-value]
+
+
+@dataclass
+class GroupCounts:
+    old: int = 0
+    new: int = 0
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+
+
+@dataclass
+class DiffSummary:
+    """Totals and per-(algorithm, mode, key size) counts, filled in by ``diff_findings``."""
+
+    added: int = 0
+    removed: int = 0
+    changed: int = 0
+    unchanged: int = 0
+    groups: Dict[GroupKey, GroupCounts] = field(default_factory=dict)
+
+    def group(self, finding: CryptoFinding) -> GroupCounts:
+        key = (finding.algorithm, finding.mode, finding.key_size_bits)
+        counts = self.groups.get(key)
+        if counts is None:
+            counts = self.groups[key] = GroupCounts()
+        return counts
+
+
+def _spill(run: List[CryptoFinding]) -> IO[bytes]:
+    spill = tempfile.TemporaryFile()
+    # One pickle per finding, so reading back holds one finding at a time.
+    for finding in run:
+        pickle.dump(finding, spill, protocol=pickle.HIGHEST_PROTOCOL)
+    spill.seek(0)
+    return spill
+
+
+def _unspill(spill: IO[bytes]) -> Iterator[CryptoFinding]:
+    with spill:
+        while True:
+            try:
+                yield pickle.load(spill)
+            except EOFError:
+                return
+
+
+def sorted_by_id(
+    findings: Iterable[CryptoFinding], run_size: int = DEFAULT_RUN_SIZE
+) -> Iterator[CryptoFinding]:
+    """Yield ``findings`` stably sorted by id, holding at most ``run_size`` of them."""
+    spills: List[IO[bytes]] = []
+    run: List[CryptoFinding] = []
+    try:
+        for finding in findings:
+            run.append(finding)
+            if len(run) >= run_size:
+                run.sort(key=_finding_id)
+                spills.append(_spill(run))
+                run = []
+        run.sort(key=_finding_id)
+        if not spills:
+            yield from run
+            return
+        # heapq.merge prefers earlier inputs on ties, which keeps the sort stable.
+        yield from heapq.merge(
+            *(_unspill(spill) for spill in spills), iter(run), key=_finding_id
+        )
+    finally:
+        for spill in spills:
+            spill.close()
+
+
+def _changed_fields(old: CryptoFinding, new: CryptoFinding) -> Tuple[str, ...]:
+    return tuple(name for name, value in _COMPARED if value(old) != value(new))
+
+
+def _id_groups(findings: Iterable[CryptoFinding]) -> Iterator[Tuple[str, List[CryptoFinding]]]:
+    for finding_id, group in groupby(findings, key=_finding_id):
+        yield finding_id, list(group)
+
+
+def diff_findings(
+    old: Iterable[CryptoFinding],
+    new: Iterable[CryptoFinding],
+    summary: DiffSummary,
+    run_size: int = DEFAULT_RUN_SIZE,
+) -> Iterator[Change]:
+    """Yield the changes from ``old`` to ``new`` in id order, counting them in ``summary``.
+
+    Both sides are sorted by id, in runs spilled to disk past ``run_size``
+    findings, and merge-joined, so memory stays bounded by ``run_size``
+    findings per side plus the group counts. Findings that share an id
+    (several matches on one line) are paired in report order.
+    """
+    old_groups = _id_groups(sorted_by_id(old, run_size))
+    new_groups = _id_groups(sorted_by_id(new, run_size))
+    old_group = next(old_groups, None)
+    new_group = next(new_groups, None)
+    while old_group is not None or new_group is not None:
+        if new_group is None or (old_group is not None and old_group[0] < new_group[0]):
+            olds, news = old_group[1], []  # type: ignore[index]
+            old_group = next(old_groups, None)
+        elif old_group is None or new_group[0] < old_group[0]:
+            olds, news = [], new_group[1]
+            new_group = next(new_groups, None)
+        else:
+            olds, news = old_group[1], new_group[1]
+            old_group = next(old_groups, None)
+            new_group = next(new_groups, None)
+        for finding in olds:
+            summary.group(finding).old += 1
+        for finding in news:
+            summary.group(finding).new += 1
+        for before, after in zip(olds, news):
+            fields = _changed_fields(before, after)
+            if not fields:
+                summary.unchanged += 1
+                continue
+            summary.changed += 1
+            summary.group(after).changed += 1
+            yield Change(CHANGED, before, after, fields)
+        for before in olds[len(news) :]:
+            summary.removed += 1
+            summary.group(before).removed += 1
+            yield Change(REMOVED, before, None)
+        for after in news[len(olds) :]:
+            summary.added += 1
+            summary.group(after).added += 1
+            yield Change(ADDED, None, after)
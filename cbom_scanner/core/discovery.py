@@ -0,0 +1,359 @@
+"""File discovery with directory pruning and ignore-file support."""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Pattern, Sequence, Set, Tuple
+
+from cbom_scanner.core.options import DiscoveryOptions
+
+
+DEFAULT_EXCLUDES = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        ".tox",
+        ".nox",
+        ".venv",
+        "venv",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".cbom-cache",
+        "__pycache__",
+        "node_modules",
+        "bower_components",
+        "vendor",
+        "target",
+        "build",
+        "dist",
+        ".gradle",
+        ".idea",
+    }
+)
+
+IGNORE_FILES = (".gitignore", ".cbomignore")
+
+_Frame = Tuple[
+    Iterator[os.DirEntry], str, List["IgnoreRules"], int, FrozenSet[Tuple[int, int]]
+]
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+
+
+def _translate_class(pattern: str, start: int) -> Tuple[Optional[str], int]:
+    end = start + 1
+    if end < len(pattern) and pattern[end] in "!^":
+        end += 1
+    if end < len(pattern) and pattern[end] == "]":
+        end += 1
+    end = pattern.find("]", end)
+    if end == -1:
+        return None, start + 1
+    body = pattern[start + 1 : end].replace("\\", "\\\\")
+    if body[:1] in ("!", "^"):
+        body = "^" + body[1:]
+    return f"[{body}]", end + 1
+
+
+def _translate(pattern: str) -> str:
+    out: List[str] = []
+    index = 0
+    while index < len(pattern):
+        char = pattern[index]
+        if char == "*":
+            if pattern.startswith("**", index):
+                index += 2
+                if index < len(pattern) and pattern[index] == "/":
+                    out.append("(?:.*/)?")
+                    index += 1
+                else:
+                    out.append(".*")
+                continue
+            out.append("[^/]*")
+        elif char == "?":
+            out.append("[^/]")
+        elif char == "[":
+            translated, index = _translate_class(pattern, index)
+            out.append(translated if translated is not None else re.escape(char))
+            continue
+        elif char == "\\" and index + 1 < len(pattern):
+            index += 1
+            out.append(re.escape(pattern[index]))
+        else:
+            out.append(re.escape(char))
+        index += 1
+    return "".join(out)
+
+
+def parse_ignore_line(line: str) -> Optional[IgnorePattern]:
+    line = line.rstrip("\n").rstrip("\r")
+    if not line or line.startswith("#"):
+        return None
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\"):
+        line = line[1:]
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+    anchored = "/" in line
+    line = line.lstrip("/")
+    regex = _translate(line)
+    if not anchored:
+        regex = "(?:.*/)?" + regex
+    return IgnorePattern(regex=re.compile(regex, re.DOTALL), negate=negate, dir_only=dir_only)
+
+
+class IgnoreRules:
+    def __init__(self, base: str, patterns: Sequence[IgnorePattern]) -> None:
+        self.base = base
+        self.patterns = patterns
+
+    @classmethod
+    def from_file(cls, base: str, path: Path) -> "IgnoreRules":
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            text = ""
+        return cls.from_text(base, text)
+
+    @classmethod
+    def from_text(cls, base: str, text: str) -> "IgnoreRules":
+        patterns = [pattern for pattern in map(parse_ignore_line, text.splitlines()) if pattern]
+        return cls(base, patterns)
+
+    def match(self, rel_path: str, is_dir: bool) -> Optional[bool]:
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return None
+            rel_path = rel_path[len(self.base) + 1 :]
+        result: Optional[bool] = None
+        for pattern in self.patterns:
+            if pattern.dir_only and not is_dir:
+                continue
+            if pattern.regex.fullmatch(rel_path):
+                result = not pattern.negate
+        return result
+
+
+def _is_ignored(rules: Sequence[IgnoreRules], rel_path: str, is_dir: bool) -> bool:
+    ignored = False
+    for rule in rules:
+        verdict = rule.match(rel_path, is_dir)
+        if verdict is not None:
+            ignored = verdict
+    return ignored
+
+
+def _load_ignore_rules(directory: str, rel_dir: str, names: Set[str]) -> List[IgnoreRules]:
+    rules: List[IgnoreRules] = []
+    for name in IGNORE_FILES:
+        if name in names:
+            rule = IgnoreRules.from_file(rel_dir, Path(directory) / name)
+            if rule.patterns:
+                rules.append(rule)
+    return rules
+
+
+def _sorted_entries(directory: str) -> List[os.DirEntry]:
+    try:
+        with os.scandir(directory) as iterator:
+            return sorted(iterator, key=lambda entry: entry.name)
+    except OSError:
+        return []
+
+
+def _dir_key(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino
+
+
+def _base_rules(root: Path, options: DiscoveryOptions) -> List[IgnoreRules]:
+    if not options.use_ignore_files:
+        return []
+    exclude = root / ".git" / "info" / "exclude"
+    if exclude.is_file():
+        return [IgnoreRules.from_file("", exclude)]
+    return []
+
+
+def _open_frame(
+    directory: str,
+    rel_dir: str,
+    rules: List[IgnoreRules],
+    depth: int,
+    ancestors: FrozenSet[Tuple[int, int]],
+    options: DiscoveryOptions,
+) -> _Frame:
+    entries = _sorted_entries(directory)
+    if options.use_ignore_files:
+        names = {entry.name for entry in entries}
+        rules = rules + _load_ignore_rules(directory, rel_dir, names)
+    return iter(entries), rel_dir, rules, depth, ancestors
+
+
+def iter_files(root: Path, options: Optional[DiscoveryOptions] = None) -> Iterator[Path]:
+    """Yield files under ``root`` in the same order as ``sorted(root.rglob("*"))``.
+
+    Excluded directories are pruned before they are listed, and files are
+    yielded as the walk reaches them.
+    """
+    options = options or DiscoveryOptions()
+    base_rules = _base_rules(root, options)
+    root_key = _dir_key(str(root)) if options.follow_symlinks else None
+    ancestors: FrozenSet[Tuple[int, int]] = frozenset({root_key} if root_key else ())
+    frames = [_open_frame(str(root), "", base_rules, 0, ancestors, options)]
+    while frames:
+        iterator, rel_dir, rules, depth, ancestors = frames[-1]
+        entry = next(iterator, None)
+        if entry is None:
+            frames.pop()
+            continue
+        rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            is_dir = entry.is_dir()
+            is_symlink = is_dir and entry.is_symlink()
+        except OSError:
+            continue
+        if is_dir:
+            if is_symlink and not options.follow_symlinks:
+                continue
+            if options.default_excludes and entry.name in DEFAULT_EXCLUDES:
+                continue
+            if options.max_depth is not None and depth >= options.max_depth:
+                continue
+            if rules and _is_ignored(rules, rel_path, True):
+                continue
+            if options.follow_symlinks:
+                key = _dir_key(entry.path)
+                if key is None or key in ancestors:
+                    continue
+                ancestors = ancestors | {key}
+            frames.append(
+                _open_frame(entry.path, rel_path, rules, depth + 1, ancestors, options)
+            )
+            continue
+        try:
+            if not entry.is_file():
+                continue
+            if options.max_file_size is not None and entry.stat().st_size > options.max_file_size:
+                continue
+        except OSError:
+            continue
+        if rules and _is_ignored(rules, rel_path, False):
+            continue
+        yield Path(entry.path)
+
+
+class IgnoreTree:
+    """Ignore rules in effect per directory, loaded on first use.
+
+    ``load(rel_dir)`` returns the rules of the ignore files in one directory;
+    each directory also inherits its parent's.
+    """
+
+    def __init__(
+        self,
+        base_rules: List[IgnoreRules],
+        load: Optional[Callable[[str], List[IgnoreRules]]],
+        options: DiscoveryOptions,
+    ) -> None:
+        self.options = options
+        self._base_rules = base_rules
+        self._load = load
+        self._rules: Dict[str, List[IgnoreRules]] = {}
+
+    def rules_for(self, rel_dir: str) -> List[IgnoreRules]:
+        rules = self._rules.get(rel_dir)
+        if rules is None:
+            parent = self.rules_for(rel_dir.rpartition("/")[0]) if rel_dir else self._base_rules
+            rules = parent
+            if self._load is not None:
+                rules = parent + self._load(rel_dir)
+            self._rules[rel_dir] = rules
+        return rules
+
+    def selected(
+        self, rel_path: str, skip_dir: Optional[Callable[[str], bool]] = None
+    ) -> bool:
+        """Whether a walk would reach file ``rel_path`` through its directories.
+
+        ``skip_dir(rel_dir)`` can prune further directories, e.g. symlinks.
+        """
+        options = self.options
+        parts = rel_path.split("/")
+        if options.max_depth is not None and len(parts) - 1 > options.max_depth:
+            return False
+        rel_dir = ""
+        for name in parts[:-1]:
+            child = f"{rel_dir}/{name}" if rel_dir else name
+            if options.default_excludes and name in DEFAULT_EXCLUDES:
+                return False
+            if skip_dir is not None and skip_dir(child):
+                return False
+            if _is_ignored(self.rules_for(rel_dir), child, True):
+                return False
+            rel_dir = child
+        return not _is_ignored(self.rules_for(rel_dir), rel_path, False)
+
+
+def walk_order(rel_path: str) -> List[str]:
+    """Sort key putting relative POSIX paths in ``iter_files`` order."""
+    return rel_path.split("/")
+
+
+def select_files(
+    root: Path, rel_paths: Iterable[str], options: Optional[DiscoveryOptions] = None
+) -> List[Path]:
+    """Return those of ``rel_paths`` that ``iter_files`` would yield, in walk order.
+
+    Lets callers that already know which files changed apply the same
+    excludes, ignore files and limits as a full walk without walking.
+    """
+    options = options or DiscoveryOptions()
+
+    def load(rel_dir: str) -> List[IgnoreRules]:
+        directory = os.path.join(root, rel_dir)
+        names = {name for name in IGNORE_FILES if os.path.isfile(os.path.join(directory, name))}
+        return _load_ignore_rules(directory, rel_dir, names)
+
+    def symlink(rel_dir: str) -> bool:
+        return os.path.islink(os.path.join(root, rel_dir))
+
+    tree = IgnoreTree(
+        _base_rules(root, options), load if options.use_ignore_files else None, options
+    )
+    skip_dir = None if options.follow_symlinks else symlink
+
+    def selected(rel_path: str) -> bool:
+        path = os.path.join(root, rel_path)
+        try:
+            if not os.path.isfile(path):
+                return False
+            if options.max_file_size is not None and os.path.getsize(path) > options.max_file_size:
+                return False
+        except OSError:
+            return False
+        return tree.selected(rel_path, skip_dir)
+
+    ordered = sorted(set(rel_paths), key=walk_order)
+    return [root / rel_path for rel_path in ordered if selected(rel_path)]
@@ -0,0 +1,45 @@
+"""Suffix-indexed routing of files to scanners."""
+
+from __future__ import annotations
+
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Sequence, Tuple
+
+from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.scanners.base import LanguageScanner
+
+
+class DispatchTable:
+    def __init__(self, scanners: Sequence[LanguageScanner], options: ScanOptions) -> None:
+        self.scanners = scanners
+        self.options = options
+        by_suffix: Dict[str, List[int]] = {}
+        fallback: List[int] = []
+        for index, scanner in enumerate(scanners):
+            suffixes = scanner.suffixes_for(options)
+            if not suffixes:
+                fallback.append(index)
+                continue
+            for suffix in suffixes:
+                by_suffix.setdefault(suffix, []).append(index)
+        self._by_suffix: Dict[str, Tuple[int, ...]] = {
+            suffix: tuple(indexes) for suffix, indexes in by_suffix.items()
+        }
+        self._fallback = tuple(fallback)
+
+    def wants(self, name: str) -> bool:
+        """Whether any scanner handles a file at POSIX path ``name``."""
+        return bool(self.route(PurePosixPath(name)))
+
+    def route(self, path: Path) -> Tuple[int, ...]:
+        indexes = self._by_suffix.get(path.suffix, ())
+        if not self._fallback:
+            return indexes
+        extra = [
+            index
+            for index in self._fallback
+            if self.scanners[index].supports(path, self.options)
+        ]
+        if not extra:
+            return indexes
+        return tuple(sorted(indexes + tuple(extra)))
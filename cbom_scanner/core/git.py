@@ -0,0 +1,146 @@
+"""Helpers for reading change information from a local git repository."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import IO, Iterable, Iterator, List, Sequence, Set, Tuple
+
+
+class GitError(RuntimeError):
+    pass
+
+
+@dataclass
+class GitChanges:
+    # Paths are relative to the scanned directory, in POSIX form.
+    changed: Set[str] = field(default_factory=set)
+    removed: Set[str] = field(default_factory=set)
+
+    @property
+    def affected(self) -> Set[str]:
+        return self.changed | self.removed
+
+
+def run_git(repo_path: Path, args: List[str]) -> bytes:
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git executable not found") from exc
+    except subprocess.CalledProcessError as exc:
+        message = exc.stderr.decode("utf-8", errors="replace").strip()
+        raise GitError(f"git {' '.join(args)} failed: {message}") from exc
+    return completed.stdout
+
+
+def _split_z(output: bytes) -> List[str]:
+    return [item.decode("utf-8", errors="surrogateescape") for item in output.split(b"\0") if item]
+
+
+def changed_files(repo_path: Path, since: str) -> GitChanges:
+    """Files that differ between ``since`` and the working tree, plus untracked files."""
+    changes = GitChanges()
+    items = _split_z(
+        run_git(
+            repo_path,
+            ["diff", "--name-status", "-z", "-M", "--relative", "--no-ext-diff", since, "--"],
+        )
+    )
+    index = 0
+    while index < len(items):
+        status = items[index]
+        kind = status[:1]
+        if kind in ("R", "C"):
+            old_path, new_path = items[index + 1], items[index + 2]
+            if kind == "R":
+                changes.removed.add(old_path)
+            changes.changed.add(new_path)
+            index += 3
+            continue
+        path = items[index + 1]
+        if kind == "D":
+            changes.removed.add(path)
+        else:
+            changes.changed.add(path)
+        index += 2
+    untracked = run_git(repo_path, ["ls-files", "--others", "--exclude-standard", "-z"])
+    changes.changed.update(_split_z(untracked))
+    return changes
+
+
+@dataclass(frozen=True)
+class TreeEntry:
+    # Relative to the directory git was run in, in POSIX form.
+    path: str
+    blob: str
+    size: int
+
+
+def list_tree(repo_path: Path, rev: str) -> List[TreeEntry]:
+    """Regular files of ``rev`` under ``repo_path``, from the object database.
+
+    Symlinks and submodules are left out: their objects are not file contents.
+    """
+    if rev.startswith("-"):
+        raise GitError(f"invalid revision {rev!r}")
+    entries: List[TreeEntry] = []
+    for item in _split_z(run_git(repo_path, ["ls-tree", "-r", "-l", "-z", rev, "--"])):
+        info, _, path = item.partition("\t")
+        mode, kind, blob, size = info.split()
+        if kind != "blob" or mode == "120000":
+            continue
+        entries.append(TreeEntry(path, blob, int(size)))
+    return entries
+
+
+def _feed(stream: IO[bytes], blobs: Iterable[str]) -> None:
+    try:
+        for blob in blobs:
+            stream.write(blob.encode("ascii") + b"\n")
+        stream.close()
+    except OSError:
+        # The reader stopped early and the process is gone.
+        pass
+
+
+def iter_blobs(repo_path: Path, blobs: Sequence[str]) -> Iterator[Tuple[str, bytes]]:
+    """Yield ``(blob id, contents)`` for ``blobs`` in order, from one ``git cat-file``.
+
+    Ids are written from a separate thread, so neither side of the pipe
+    waits on the other however many blobs are requested.
+    """
+    try:
+        process = subprocess.Popen(
+            ["git", "-C", str(repo_path), "cat-file", "--batch"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except FileNotFoundError as exc:
+        raise GitError("git executable not found") from exc
+    assert process.stdin is not None and process.stdout is not None
+    writer = threading.Thread(target=_feed, args=(process.stdin, list(blobs)), daemon=True)
+    writer.start()
+    try:
+        for blob in blobs:
+            header = process.stdout.readline().split()
+            if len(header) != 3:
+                raise GitError(f"git cat-file: object {blob} is missing")
+            size = int(header[2])
+            data = process.stdout.read(size)
+            process.stdout.read(1)
+            if len(data) != size:
+                raise GitError(f"git cat-file: object {blob} is truncated")
+            yield blob, data
+    finally:
+        process.kill()
+        process.wait()
+        process.stdout.close()
+        writer.join()
@@ -0,0 +1,42 @@
+"""Splicing of rescanned files into a previous scan result."""
+
+from __future__ import annotations
+
+from pathlib import PurePath
+from typing import Iterable, List, Optional, Set
+
+from cbom_scanner.core.archives import MEMBER_SEPARATOR
+from cbom_scanner.core.models import CryptoFinding
+
+
+def _relative_file(file: str, repo_path: PurePath, affected: Set[str]) -> Optional[str]:
+    # Findings inside an archive belong to the archive file.
+    path = PurePath(file.split(MEMBER_SEPARATOR, 1)[0])
+    try:
+        return path.relative_to(repo_path).as_posix()
+    except ValueError:
+        pass
+    # The baseline may come from a checkout at another location; fall back to
+    # the longest path suffix that names an affected file.
+    parts = path.parts
+    for start in range(len(parts)):
+        candidate = "/".join(parts[start:])
+        if candidate in affected:
+            return candidate
+    return None
+
+
+def splice_findings(
+    baseline: Iterable[CryptoFinding],
+    fresh: Iterable[CryptoFinding],
+    repo_path: PurePath,
+    affected: Set[str],
+) -> List[CryptoFinding]:
+    """Replace baseline findings for ``affected`` files with ``fresh`` ones."""
+    kept = [
+        finding
+        for finding in baseline
+        if _relative_file(finding.evidence.file, repo_path, affected) not in affected
+    ]
+    kept.extend(fresh)
+    return sorted(kept, key=lambda finding: finding.id)
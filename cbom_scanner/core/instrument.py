@@ -0,0 +1,338 @@
+"""Optional timing and throughput instrumentation for scans.
+
+Hooks in the pipeline call the module-level helpers below. Until a
+``Recorder`` is installed with ``recording()`` they return a shared no-op
+context manager or return immediately, so leaving them in hot paths is free.
+"""
+
+from __future__ import annotations
+
+import heapq
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import ContextManager, Dict, Iterable, Iterator, List, Optional, TextIO, TypeVar
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None
+
+
+T = TypeVar("T")
+
+_END = object()
+
+DEFAULT_SLOWEST = 10
+
+_NULL: ContextManager[None] = nullcontext()
+
+_recorder: Optional["Recorder"] = None
+
+
+@dataclass
+class Timing:
+    wall: float = 0.0
+    cpu: float = 0.0
+    calls: int = 0
+
+    def add(self, other: "Timing") -> None:
+        self.wall += other.wall
+        self.cpu += other.cpu
+        self.calls += other.calls
+
+
+@dataclass
+class ScannerStats:
+    files: int = 0
+    bytes: int = 0
+    lines: int = 0
+    wall: float = 0.0
+    cpu: float = 0.0
+
+    def add(self, other: "ScannerStats") -> None:
+        self.files += other.files
+        self.bytes += other.bytes
+        self.lines += other.lines
+        self.wall += other.wall
+        self.cpu += other.cpu
+
+
+@dataclass(order=True)
+class FileTiming:
+    wall: float
+    file: str = field(compare=False)
+    scanner: str = field(compare=False)
+    bytes: int = field(default=0, compare=False)
+    lines: int = field(default=0, compare=False)
+
+
+class Recorder:
+    """Accumulates per-stage, per-scanner and per-file measurements.
+
+    Stage times are exclusive: entering a stage pauses the one around it, so
+    a writer pulling findings through a streaming scan is charged only for
+    writing. In a serial scan the stages sum to at most the total; with
+    worker processes, their stage and scanner times are summed across
+    workers, and the parent's time blocked on them is the ``wait`` stage.
+    """
+
+    def __init__(self, slowest: int = DEFAULT_SLOWEST) -> None:
+        self.slowest = slowest
+        self.stages: Dict[str, Timing] = {}
+        self.scanners: Dict[str, ScannerStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.bytes = 0
+        self.lines = 0
+        self._files: List[FileTiming] = []
+        # Open stages, innermost last: [name, wall start, cpu start].
+        self._stack: List[List] = []
+        self._current_file: Optional[FileTiming] = None
+        self._started = (time.perf_counter(), time.process_time())
+
+    def _charge(self, frame: List, wall: float, cpu: float) -> None:
+        timing = self.stages.get(frame[0])
+        if timing is None:
+            timing = self.stages[frame[0]] = Timing()
+        timing.wall += wall - frame[1]
+        timing.cpu += cpu - frame[2]
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), time.process_time()
+        if self._stack:
+            self._charge(self._stack[-1], wall, cpu)
+        frame = [name, wall, cpu]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter(), time.process_time()
+            self._charge(frame, wall, cpu)
+            self.stages[name].calls += 1
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1:] = [wall, cpu]
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """Charge the time spent producing each item of ``items`` to ``name``."""
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                item = next(iterator, _END)
+            if item is _END:
+                return
+            yield item
+
+    @contextmanager
+    def scan_file(self, scanner: str, path: Path) -> Iterator[None]:
+        outer = self._current_file
+        record = self._current_file = FileTiming(0.0, str(path), scanner)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            with self.stage("match"):
+                yield
+        finally:
+            record.wall = time.perf_counter() - wall
+            stats = self.scanners.get(scanner)
+            if stats is None:
+                stats = self.scanners[scanner] = ScannerStats()
+            stats.files += 1
+            stats.bytes += record.bytes
+            stats.lines += record.lines
+            stats.wall += record.wall
+            stats.cpu += time.process_time() - cpu
+            self._current_file = outer
+            self._keep_slowest(record)
+
+    def _keep_slowest(self, record: FileTiming) -> None:
+        if len(self._files) < self.slowest:
+            heapq.heappush(self._files, record)
+        elif self.slowest and record > self._files[0]:
+            heapq.heapreplace(self._files, record)
+
+    def source(self, size: int, lines: int) -> None:
+        self.bytes += size
+        self.lines += lines
+        if self._current_file is not None:
+            self._current_file.bytes += size
+            self._current_file.lines += lines
+
+    def count(self, name: str, amount: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def drain(self) -> dict:
+        """Return everything recorded so far as picklable data and start over.
+
+        Worker processes send this back with their results; the parent
+        ``merge``s it.
+        """
+        snapshot = {
+            "stages": self.stages,
+            "scanners": self.scanners,
+            "counters": self.counters,
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "files": self._files,
+        }
+        self.stages, self.scanners, self.counters = {}, {}, {}
+        self.bytes = self.lines = 0
+        self._files = []
+        return snapshot
+
+    def merge(self, snapshot: dict) -> None:
+        for name, timing in snapshot["stages"].items():
+            self.stages.setdefault(name, Timing()).add(timing)
+        for name, stats in snapshot["scanners"].items():
+            self.scanners.setdefault(name, ScannerStats()).add(stats)
+        for name, amount in snapshot["counters"].items():
+            self.count(name, amount)
+        self.bytes += snapshot["bytes"]
+        self.lines += snapshot["lines"]
+        for record in snapshot["files"]:
+            self._keep_slowest(record)
+
+    def report(self) -> dict:
+        wall = time.perf_counter() - self._started[0]
+        cpu = time.process_time() - self._started[1]
+        stages = {
+            name: {"wallSeconds": timing.wall, "cpuSeconds": timing.cpu, "calls": timing.calls}
+            for name, timing in sorted(self.stages.items())
+        }
+        scanners = {
+            name: {
+                "files": stats.files,
+                "bytes": stats.bytes,
+                "lines": stats.lines,
+                "wallSeconds": stats.wall,
+                "cpuSeconds": stats.cpu,
+            }
+            for name, stats in sorted(self.scanners.items())
+        }
+        slowest = [
+            {
+                "file": record.file,
+                "scanner": record.scanner,
+                "wallSeconds": record.wall,
+                "bytes": record.bytes,
+                "lines": record.lines,
+            }
+            for record in sorted(self._files, reverse=True)
+        ]
+        return {
+            "wallSeconds": wall,
+            "cpuSeconds": cpu,
+            "files": sum(stats.files for stats in self.scanners.values()),
+            "bytes": self.bytes,
+            "lines": self.lines,
+            "bytesPerSecond": self.bytes / wall if wall else 0.0,
+            "linesPerSecond": self.lines / wall if wall else 0.0,
+            "peakMemoryBytes": peak_memory(),
+            "stages": stages,
+            "scanners": scanners,
+            "counters": dict(sorted(self.counters.items())),
+            "slowestFiles": slowest,
+        }
+
+
+def peak_memory() -> Dict[str, Optional[int]]:
+    """Peak resident set size of this process and of its finished children."""
+    if resource is None:  # pragma: no cover
+        return {"self": None, "children": None}
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere.
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def active() -> Optional[Recorder]:
+    return _recorder
+
+
+@contextmanager
+def recording(recorder: Optional[Recorder]) -> Iterator[Optional[Recorder]]:
+    """Install ``recorder`` for hooks in this process while the block runs."""
+    global _recorder
+    previous, _recorder = _recorder, recorder
+    try:
+        yield recorder
+    finally:
+        _recorder = previous
+
+
+def install(recorder: Optional[Recorder]) -> None:
+    """Install ``recorder`` for the rest of the process (worker processes)."""
+    global _recorder
+    _recorder = recorder
+
+
+def stage(name: str) -> ContextManager[None]:
+    recorder = _recorder
+    return _NULL if recorder is None else recorder.stage(name)
+
+
+def scan_file(scanner: str, path: Path) -> ContextManager[None]:
+    recorder = _recorder
+    return _NULL if recorder is None else recorder.scan_file(scanner, path)
+
+
+def timed(name: str, items: Iterable[T]) -> Iterable[T]:
+    recorder = _recorder
+    return items if recorder is None else recorder.timed(name, items)
+
+
+def source(size: int, text: str) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.source(size, text.count("\n"))
+
+
+def count(name: str, amount: int = 1) -> None:
+    recorder = _recorder
+    if recorder is not None:
+        recorder.count(name, amount)
+
+
+def _seconds(value: float) -> str:
+    return f"{value * 1000:10.1f} ms"
+
+
+def write_text_report(report: dict, stream: TextIO) -> None:
+    peak = report["peakMemoryBytes"]
+    lines = [
+        "scan statistics",
+        f"  total    {_seconds(report['wallSeconds'])} wall {_seconds(report['cpuSeconds'])} cpu",
+        f"  input    {report['files']} files, {report['bytes']} bytes, {report['lines']} lines"
+        f" ({report['bytesPerSecond'] / 1e6:.2f} MB/s, {report['linesPerSecond']:.0f} lines/s)",
+    ]
+    if peak["self"] is not None:
+        lines.append(
+            f"  memory   peak {peak['self'] / 2**20:.1f} MiB"
+            f" (workers {peak['children'] / 2**20:.1f} MiB)"
+        )
+    lines.append("  stages (exclusive)")
+    for name, timing in report["stages"].items():
+        lines.append(
+            f"    {name:12} {_seconds(timing['wallSeconds'])} wall"
+            f" {_seconds(timing['cpuSeconds'])} cpu {timing['calls']:8} calls"
+        )
+    lines.append("  scanners")
+    for name, stats in report["scanners"].items():
+        lines.append(
+            f"    {name:12} {_seconds(stats['wallSeconds'])} wall"
+            f" {_seconds(stats['cpuSeconds'])} cpu {stats['files']:8} files"
+        )
+    for name, amount in report["counters"].items():
+        lines.append(f"  {name:10} {amount}")
+    if report["slowestFiles"]:
+        lines.append("  slowest files")
+        for record in report["slowestFiles"]:
+            lines.append(
+                f"    {_seconds(record['wallSeconds'])}  {record['file']}"
+                f" ({record['scanner']}, {record['bytes']} bytes)"
+            )
+    stream.write("\n".join(lines) + "\n")
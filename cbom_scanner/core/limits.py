@@ -0,0 +1,123 @@
+"""Source size budgets, minified/generated detection and snippet windows."""
+
+from __future__ import annotations
+
+import mmap
+import os
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Iterator, List, Optional, Union
+
+from cbom_scanner.core.models import RawFinding
+from cbom_scanner.core.options import SourceLimits
+from cbom_scanner.core.sources import MemorySource, ScanSource
+
+
+Source = Union[bytes, mmap.mmap]
+
+# Files at least this large are memory-mapped rather than read into memory.
+MMAP_THRESHOLD = 1024 * 1024
+
+MINIFIED = "minified"
+GENERATED = "generated"
+LARGE = "large file"
+SNIPPET_TRUNCATED = "snippet truncated"
+
+_MINIFIED_NAMES = (".min.", "-min.", ".bundle.", ".chunk.")
+# Average line length above which a file is considered minified. Files below
+# _MINIFIED_MIN_BYTES are never considered minified.
+_MINIFIED_LINE_CHARS = 500
+_MINIFIED_MIN_BYTES = 4096
+_GENERATED_MARKERS = (
+    b"@generated",
+    b"DO NOT EDIT",
+    b"<auto-generated",
+    b"This file was automatically generated",
+    b"This file is automatically generated",
+)
+_GENERATED_HEAD_BYTES = 2048
+
+
+@contextmanager
+def open_source(path: ScanSource) -> Iterator[Source]:
+    """Yield the file's bytes, memory-mapped for large files."""
+    if isinstance(path, MemorySource):
+        yield path.data
+        return
+    with open(path, "rb") as handle:
+        if os.fstat(handle.fileno()).st_size < MMAP_THRESHOLD:
+            yield handle.read()
+            return
+        try:
+            mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+        if mapped is None:
+            yield handle.read()
+            return
+        with mapped:
+            yield mapped
+
+
+def _long_lines(data: Source) -> bool:
+    # Minified if there are fewer line breaks than one per _MINIFIED_LINE_CHARS
+    # bytes; stops as soon as enough are found, so normal files cost little.
+    allowed = len(data) // _MINIFIED_LINE_CHARS
+    position = 0
+    for _ in range(allowed + 1):
+        position = data.find(b"\n", position) + 1
+        if position == 0:
+            return True
+    return False
+
+
+def classify(path: ScanSource, data: Source) -> Optional[str]:
+    """Return ``MINIFIED``, ``GENERATED`` or None for an ordinary source file."""
+    name = path.name.lower()
+    if any(marker in name for marker in _MINIFIED_NAMES):
+        return MINIFIED
+    head = data[:_GENERATED_HEAD_BYTES]
+    if any(marker in head for marker in _GENERATED_MARKERS):
+        return GENERATED
+    if len(data) >= _MINIFIED_MIN_BYTES and _long_lines(data):
+        return MINIFIED
+    return None
+
+
+def heuristic_reason(data: Source, kind: Optional[str], limits: SourceLimits) -> Optional[str]:
+    """Why the file should get the line-based matcher instead of a parse, if it should."""
+    if kind == MINIFIED:
+        return MINIFIED
+    if limits.parse_limit is not None and len(data) > limits.parse_limit:
+        return LARGE
+    return None
+
+
+def add_note(notes: Optional[str], note: str) -> str:
+    return f"{notes}; {note}" if notes else note
+
+
+def clip_snippet(snippet: str, column: int, limit: int) -> str:
+    """Cut ``snippet`` to ``limit`` characters around 1-based ``column``."""
+    if len(snippet) <= limit:
+        return snippet
+    start = min(max(column - 1 - limit // 2, 0), len(snippet) - limit)
+    return snippet[start : start + limit].strip()
+
+
+def apply_limits(
+    findings: List[RawFinding], limits: SourceLimits, note: Optional[str] = None
+) -> List[RawFinding]:
+    """Cap snippets and add ``note``; changed findings say so in ``notes``."""
+    limit = limits.snippet_chars
+    result: List[RawFinding] = []
+    for finding in findings:
+        notes = add_note(finding.notes, note) if note else finding.notes
+        snippet = finding.snippet
+        if limit is not None and len(snippet) > limit:
+            snippet = clip_snippet(snippet, finding.column, limit)
+            notes = add_note(notes, SNIPPET_TRUNCATED)
+        if notes is not finding.notes:
+            finding = replace(finding, snippet=snippet, notes=notes)
+        result.append(finding)
+    return result
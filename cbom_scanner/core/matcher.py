@@ -0,0 +1,255 @@
+"""Compiled matchers for rule sets."""
+
+from __future__ import annotations
+
+import re
+from bisect import bisect_right
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Sequence,
+    Tuple,
+    TYPE_CHECKING,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cbom_scanner.core.rules import CallRule
+
+
+_MEMO_LIMIT = 8192
+# Up to this many distinct calls, one str.find pass per call beats a single
+# regex pass over the buffer.
+_FIND_LIMIT = 16
+
+
+class CallMatcher:
+    """Finds the rules whose ``call`` is a suffix of a call site's function text.
+
+    Rules are bucketed by the length of their ``call`` so a lookup costs one
+    slice and one dict probe per distinct length rather than one ``endswith``
+    per rule. Matches are returned in rule-file order.
+    """
+
+    def __init__(self, rules: Sequence["CallRule"]) -> None:
+        by_length: Dict[int, Dict[str, List[Tuple[int, "CallRule"]]]] = {}
+        for index, rule in enumerate(rules):
+            by_length.setdefault(len(rule.call), {}).setdefault(rule.call, []).append(
+                (index, rule)
+            )
+        self._tables = sorted(
+            (length, {call: tuple(entries) for call, entries in table.items()})
+            for length, table in by_length.items()
+        )
+        self._memo: Dict[str, Tuple["CallRule", ...]] = {}
+
+    def match(self, function_text: str) -> Tuple["CallRule", ...]:
+        cached = self._memo.get(function_text)
+        if cached is not None:
+            return cached
+        size = len(function_text)
+        found: List[Tuple[int, "CallRule"]] = []
+        groups = 0
+        for length, table in self._tables:
+            if length > size:
+                break
+            entries = table.get(function_text[size - length :])
+            if entries:
+                found.extend(entries)
+                groups += 1
+        if groups > 1:
+            found.sort(key=lambda entry: entry[0])
+        result = tuple(rule for _, rule in found)
+        if len(self._memo) >= _MEMO_LIMIT:
+            self._memo.clear()
+        self._memo[function_text] = result
+        return result
+
+
+# str.splitlines() also breaks on these; text read through universal newlines
+# rarely contains any, which lets the common case count "\n" only.
+_EXOTIC_BREAKS = "\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK_RE = re.compile("\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
+def _load_index(
+    index: Dict[str, Any], calls: Tuple[str, ...]
+) -> Tuple[Dict[str, Tuple[str, ...]], Optional[str]]:
+    prefixes = index["prefixes"]
+    pattern_source = index["pattern"]
+    # Every call the pattern can match must have its prefixes listed, and
+    # only the rules' own calls may appear among them.
+    known = set(calls)
+    valid = (
+        isinstance(prefixes, dict)
+        and set(prefixes) == known
+        and all(
+            isinstance(others, list) and known.issuperset(others) for others in prefixes.values()
+        )
+        and (pattern_source is None) == (len(calls) <= _FIND_LIMIT)
+        and (pattern_source is None or isinstance(pattern_source, str))
+    )
+    if not valid:
+        raise ValueError("matcher index does not match the rules")
+    return {call: tuple(others) for call, others in prefixes.items()}, pattern_source
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    trie: Dict[str, dict] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        branches = [
+            re.escape(char) + build(child) for char, child in sorted(node.items()) if char
+        ]
+        if not branches:
+            return ""
+        terminal = "" in node
+        if len(branches) == 1 and not terminal:
+            return branches[0]
+        group = "(?:" + "|".join(branches) + ")"
+        # Greedy optional group: the longest word wins at each position.
+        return group + "?" if terminal else group
+
+    return build(trie)
+
+
+class _LineLocator:
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self._starts: Optional[List[int]] = None
+        self._ends: List[int] = []
+        if any(char in text for char in _EXOTIC_BREAKS):
+            starts = [0]
+            for match in _LINE_BREAK_RE.finditer(text):
+                self._ends.append(match.start())
+                starts.append(match.end())
+            self._ends.append(len(text))
+            self._starts = starts
+        self._counted = 0
+        self._index = 0
+
+    def locate(self, offset: int) -> Tuple[int, int, int]:
+        if self._starts is not None:
+            index = bisect_right(self._starts, offset) - 1
+            return index, self._starts[index], self._ends[index]
+        text = self.text
+        self._index += text.count("\n", self._counted, offset)
+        self._counted = offset
+        start = text.rfind("\n", 0, offset) + 1
+        end = text.find("\n", offset)
+        return self._index, start, len(text) if end == -1 else end
+
+
+class TextMatcher:
+    """Finds, per line, every rule whose ``call`` occurs in the line.
+
+    The buffer is scanned in one pass per distinct call with ``str.find`` for
+    small rule sets, or once with a trie-shaped alternation regex for large
+    ones; the regex search restarts one character after each hit so
+    overlapping calls are seen, and shorter calls that are prefixes of a hit
+    are implied by it. Results equal checking ``rule.call in line`` for every
+    rule on every line, with the column of the first occurrence.
+
+    ``index`` takes the tables returned by ``index()`` for the same rules,
+    as stored in a rule bundle, instead of building them again.
+    """
+
+    def __init__(
+        self, rules: Sequence["CallRule"], index: Optional[Dict[str, Any]] = None
+    ) -> None:
+        self._rules = tuple(rules)
+        self._rules_by_call: Dict[str, List[Tuple[int, "CallRule"]]] = {}
+        for position, rule in enumerate(rules):
+            self._rules_by_call.setdefault(rule.call, []).append((position, rule))
+        self._calls = tuple(call for call in self._rules_by_call if call)
+        # Compiled on first use: many scans never take the regex path.
+        self._pattern: Optional[Pattern[str]] = None
+        if index is None:
+            self._prefixes = {
+                call: tuple(other for other in self._calls if call.startswith(other))
+                for call in self._calls
+            }
+            self._pattern_source: Optional[str] = None
+            if len(self._calls) > _FIND_LIMIT:
+                self._pattern_source = _trie_pattern(self._calls)
+        else:
+            self._prefixes, self._pattern_source = _load_index(index, self._calls)
+        self._matches_every_line = "" in self._rules_by_call
+
+    def index(self) -> Dict[str, Any]:
+        """The tables built from the rules, as plain data for a rule bundle."""
+        return {
+            "pattern": self._pattern_source,
+            "prefixes": {call: list(others) for call, others in self._prefixes.items()},
+        }
+
+    def _find_hits(self, text: str) -> List[Tuple[int, Tuple[str, ...]]]:
+        hits: List[Tuple[int, Tuple[str, ...]]] = []
+        if self._pattern_source is not None:
+            if self._pattern is None:
+                self._pattern = re.compile(self._pattern_source)
+            search = self._pattern.search
+            match = search(text)
+            while match is not None:
+                offset = match.start()
+                hits.append((offset, self._prefixes[match.group()]))
+                match = search(text, offset + 1)
+            return hits
+        for call in self._calls:
+            calls = (call,)
+            offset = text.find(call)
+            while offset != -1:
+                hits.append((offset, calls))
+                offset = text.find(call, offset + 1)
+        hits.sort(key=lambda hit: hit[0])
+        return hits
+
+    def scan(self, text: str) -> Iterator[Tuple[int, str, List[Tuple["CallRule", int]]]]:
+        if self._matches_every_line:
+            yield from self._scan_lines(text)
+            return
+        hits = self._find_hits(text)
+        if not hits:
+            return
+        locator = _LineLocator(text)
+        line_index = -1
+        line_start = line_end = 0
+        first_seen: Dict[str, int] = {}
+        for offset, calls in hits:
+            if offset > line_end or line_index < 0:
+                if first_seen:
+                    yield self._line_hits(line_index, text[line_start:line_end], first_seen)
+                    first_seen = {}
+                line_index, line_start, line_end = locator.locate(offset)
+            for call in calls:
+                if call not in first_seen and offset + len(call) <= line_end:
+                    first_seen[call] = offset - line_start
+        if first_seen:
+            yield self._line_hits(line_index, text[line_start:line_end], first_seen)
+
+    def _line_hits(
+        self, line_index: int, line: str, first_seen: Dict[str, int]
+    ) -> Tuple[int, str, List[Tuple["CallRule", int]]]:
+        entries = [
+            (index, rule, first_seen[call])
+            for call in first_seen
+            for index, rule in self._rules_by_call[call]
+        ]
+        entries.sort(key=lambda entry: entry[0])
+        return line_index + 1, line, [(rule, column + 1) for _, rule, column in entries]
+
+    def _scan_lines(self, text: str) -> Iterator[Tuple[int, str, List[Tuple["CallRule", int]]]]:
+        for index, line in enumerate(text.splitlines(), start=1):
+            hits = [(rule, line.find(rule.call) + 1) for rule in self._rules if rule.call in line]
+            if hits:
+                yield index, line, hits
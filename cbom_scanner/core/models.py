@@ -2,21 +2,46 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import sys
+from dataclasses import dataclass, fields
+from typing import ClassVar, Optional, Tuple
 
 
-@dataclass(frozen=True)
-class Evidence:
+class _Compact:
+    """Slotted-model helpers.
+
+    Fields named in ``_interned`` (paths, function names and categorical
+    values such as library, api and confidence) are interned, so the many
+    findings that repeat them share one string. Pickling goes back through
+    ``__init__`` so findings returned by worker processes are interned too.
+    """
+
+    __slots__ = ()
+    _interned: ClassVar[Tuple[str, ...]] = ()
+
+    def __post_init__(self) -> None:
+        for name in self._interned:
+            value = getattr(self, name)
+            if type(value) is str:
+                object.__setattr__(self, name, sys.intern(value))
+
+    def __reduce__(self):
+        return type(self), tuple(getattr(self, field.name) for field in fields(self))
+
+
+@dataclass(frozen=True, slots=True)
+class Evidence(_Compact):
     file: str
     line: int
     column: int
     function: Optional[str]
     snippet: str
 
+    _interned: ClassVar[Tuple[str, ...]] = ("file", "function")
+
 
-@dataclass(frozen=True)
-class CryptoFinding:
+@dataclass(frozen=True, slots=True)
+class CryptoFinding(_Compact):
     id: str
     asset_type: str
     algorithm: str
@@ -28,9 +53,20 @@ class CryptoFinding:
     evidence: Evidence
     notes: Optional[str] = None
 
+    _interned: ClassVar[Tuple[str, ...]] = (
+        "asset_type",
+        "algorithm",
+        "mode",
+        "key_size_bits",
+        "library",
+        "api",
+        "confidence",
+        "notes",
+    )
 
-@dataclass(frozen=True)
-class RawFinding:
+
+@dataclass(frozen=True, slots=True)
+class RawFinding(_Compact):
     file: str
     line: int
     column: int
@@ -44,3 +80,16 @@ class RawFinding:
     confidence: str
     asset_type: Optional[str]
     notes: Optional[str]
+
+    _interned: ClassVar[Tuple[str, ...]] = (
+        "file",
+        "function",
+        "api",
+        "library",
+        "algorithm",
+        "mode",
+        "key_size_bits",
+        "confidence",
+        "asset_type",
+        "notes",
+    )
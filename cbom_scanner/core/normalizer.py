@@ -4,7 +4,8 @@ from __future__ import annotations
 
 import hashlib
 from dataclasses import replace
-from typing import Optional
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from cbom_scanner.core.models import CryptoFinding, Evidence, RawFinding
 
@@ -36,6 +37,32 @@ _ALG_MAP = {
 
 _AES_PREFIXES = ("aes-", "aes_", "aes/")
 
+_DIGESTS = ("sha1", "sha224", "sha256", "sha384", "sha512")
+
+# Checked in order; the first name contained in the key size wins.
+_CURVE_SIZES = (
+    ("p256", "256"),
+    ("p-256", "256"),
+    ("prime256v1", "256"),
+    ("secp256r1", "256"),
+    ("secp256k1", "256"),
+    ("nid-x9-62-prime256v1", "256"),
+    ("p384", "384"),
+    ("p-384", "384"),
+    ("secp384r1", "384"),
+    ("nid-secp384r1", "384"),
+    ("p521", "521"),
+    ("p-521", "521"),
+    ("secp521r1", "521"),
+    ("nid-secp521r1", "521"),
+)
+
+# Distinct (algorithm, mode, key size, asset type) inputs remembered across
+# findings; real code bases repeat a few hundred of them.
+_NORMALIZE_CACHE_SIZE = 4096
+
+_Fields = Tuple[Optional[str], Optional[str], Optional[str], Optional[str]]
+
 
 def _stable_id(raw: RawFinding, algorithm: str, mode: str) -> str:
     payload = "|".join(
@@ -66,11 +93,11 @@ def _parse_aes(algorithm: str) -> tuple[str, str, str]:
 def _parse_signature_algorithm(algorithm: str) -> Optional[tuple[str, str]]:
     normalized = algorithm.lower().replace("_", "-").replace("/", "-")
     if "rsa" in normalized and "sha" in normalized:
-        for digest in ("sha1", "sha224", "sha256", "sha384", "sha512"):
+        for digest in _DIGESTS:
             if digest in normalized:
                 return "RSA", _ALG_MAP[digest][0]
     if "ecdsa" in normalized and "sha" in normalized:
-        for digest in ("sha1", "sha224", "sha256", "sha384", "sha512"):
+        for digest in _DIGESTS:
             if digest in normalized:
                 return "ECDSA", _ALG_MAP[digest][0]
     return None
@@ -86,35 +113,30 @@ def _normalize_mode(mode: Optional[str]) -> str:
 def _normalize_key_size(key_size_bits: Optional[str]) -> str:
     if not key_size_bits:
         return "UNKNOWN"
-    normalized = key_size_bits.replace("_", "-")
-    curve_map = {
-        "p256": "256",
-        "p-256": "256",
-        "prime256v1": "256",
-        "secp256r1": "256",
-        "secp256k1": "256",
-        "nid-x9-62-prime256v1": "256",
-        "p384": "384",
-        "p-384": "384",
-        "secp384r1": "384",
-        "nid-secp384r1": "384",
-        "p521": "521",
-        "p-521": "521",
-        "secp521r1": "521",
-        "nid-secp521r1": "521",
-    }
-    lowered = normalized.lower()
-    for key, size in curve_map.items():
+    lowered = key_size_bits.replace("_", "-").lower()
+    for key, size in _CURVE_SIZES:
         if key in lowered:
             return size
     return key_size_bits
 
 
 def _normalize_algorithm(raw: RawFinding) -> tuple[str, str, str, Optional[str]]:
-    algorithm = raw.algorithm
-    mode = raw.mode or "UNKNOWN"
-    key_size = raw.key_size_bits or "UNKNOWN"
-    asset_type = raw.asset_type
+    return _normalize_fields(raw.algorithm, raw.mode, raw.key_size_bits, raw.asset_type)
+
+
+def _raw_fields(raw: RawFinding) -> _Fields:
+    return raw.algorithm, raw.mode, raw.key_size_bits, raw.asset_type
+
+
+@lru_cache(maxsize=_NORMALIZE_CACHE_SIZE)
+def _normalize_fields(
+    algorithm: Optional[str],
+    mode: Optional[str],
+    key_size_bits: Optional[str],
+    asset_type: Optional[str],
+) -> tuple[str, str, str, Optional[str]]:
+    mode = mode or "UNKNOWN"
+    key_size = key_size_bits or "UNKNOWN"
     if algorithm:
         lowered = algorithm.lower()
         compact = lowered.replace("-", "").replace("_", "")
@@ -157,8 +179,32 @@ def _normalize_algorithm(raw: RawFinding) -> tuple[str, str, str, Optional[str]]
     return algorithm, _normalize_mode(mode), _normalize_key_size(key_size), asset_type
 
 
+def clear_cache() -> None:
+    """Forget the memoised field combinations, so the next batch starts cold."""
+    _normalize_fields.cache_clear()
+
+
 def normalize(raw: RawFinding) -> CryptoFinding:
-    algorithm, mode, key_size, asset_type = _normalize_algorithm(raw)
+    return _build_finding(raw, _normalize_fields(*_raw_fields(raw)))
+
+
+def normalize_many(raws: Iterable[RawFinding]) -> List[CryptoFinding]:
+    """Normalize a batch, resolving each distinct field combination once."""
+    resolved: Dict[_Fields, tuple[str, str, str, Optional[str]]] = {}
+    findings: List[CryptoFinding] = []
+    for raw in raws:
+        fields = _raw_fields(raw)
+        normalized = resolved.get(fields)
+        if normalized is None:
+            normalized = resolved[fields] = _normalize_fields(*fields)
+        findings.append(_build_finding(raw, normalized))
+    return findings
+
+
+def _build_finding(
+    raw: RawFinding, normalized: tuple[str, str, str, Optional[str]]
+) -> CryptoFinding:
+    algorithm, mode, key_size, asset_type = normalized
     asset_type = asset_type or "UNKNOWN"
     evidence = Evidence(
         file=raw.file,
@@ -2,9 +2,58 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_PARSE_LIMIT = 2 * 1024 * 1024
+DEFAULT_SNIPPET_CHARS = 200
+DEFAULT_ARCHIVE_DEPTH = 2
+DEFAULT_PREFETCH_THREADS = 4
+DEFAULT_PREFETCH_BYTES = 64 * 1024 * 1024
+
+# Defaults of the scan daemon (``cbom_scanner.core.server``).
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MEMORY_ENTRIES = 100_000
+# Environment variable holding the daemon's bearer token; one is generated if unset.
+TOKEN_ENV = "CBOM_SCANNER_TOKEN"
+
+
+@dataclass(frozen=True)
+class DiscoveryOptions:
+    use_ignore_files: bool = True
+    default_excludes: bool = True
+    max_file_size: Optional[int] = None
+    max_depth: Optional[int] = None
+    follow_symlinks: bool = False
+    # Archives nested this deep are opened and their members scanned; 0
+    # leaves archives alone.
+    archive_depth: int = DEFAULT_ARCHIVE_DEPTH
+
+
+@dataclass(frozen=True)
+class SourceLimits:
+    # Files larger than this many bytes are scanned with the line-based
+    # heuristic matcher instead of being parsed.
+    parse_limit: Optional[int] = DEFAULT_PARSE_LIMIT
+    # Snippets longer than this are cut to a window around the match.
+    snippet_chars: Optional[int] = DEFAULT_SNIPPET_CHARS
+    # Skip minified and generated files instead of scanning them.
+    skip_generated: bool = False
 
 
 @dataclass(frozen=True)
 class ScanOptions:
     include_ts: bool = False
+    jobs: int = 1
+    discovery: DiscoveryOptions = field(default_factory=DiscoveryOptions)
+    cache_dir: Optional[Path] = None
+    cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES
+    limits: SourceLimits = field(default_factory=SourceLimits)
+    # Threads reading files ahead of a single-process scan (0 reads each file
+    # when it is scanned), and the most file contents they may buffer.
+    prefetch_threads: int = 0
+    prefetch_bytes: int = DEFAULT_PREFETCH_BYTES
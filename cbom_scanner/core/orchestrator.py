@@ -4,11 +4,21 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Sequence
+from typing import Iterable, Iterator, List, Optional, Sequence
 
+from cbom_scanner.core import instrument
+from cbom_scanner.core.archives import iter_sources
+from cbom_scanner.core.cache import ScanCache, scan_file_cached
+from cbom_scanner.core.discovery import iter_files, select_files
+from cbom_scanner.core.dispatch import DispatchTable
+from cbom_scanner.core.git import changed_files
+from cbom_scanner.core.incremental import splice_findings
 from cbom_scanner.core.models import CryptoFinding
-from cbom_scanner.core.options import ScanOptions
-from cbom_scanner.core.normalizer import normalize
+from cbom_scanner.core.options import DiscoveryOptions, ScanOptions
+from cbom_scanner.core.normalizer import normalize_many
+from cbom_scanner.core.revision import revision_sources
+from cbom_scanner.core.shard import shard_files
+from cbom_scanner.core.sources import ScanSource
 from cbom_scanner.scanners.base import LanguageScanner
 
 
@@ -16,17 +26,99 @@ class Orchestrator:
     def __init__(self, scanners: Sequence[LanguageScanner]) -> None:
         self.scanners = scanners
 
-    def discover_files(self, repo_path: Path) -> List[Path]:
-        files = [path for path in repo_path.rglob("*") if path.is_file()]
-        return sorted(files)
+    def iter_files(
+        self, repo_path: Path, options: Optional[DiscoveryOptions] = None
+    ) -> Iterator[Path]:
+        return iter_files(repo_path, options)
+
+    def discover_files(
+        self, repo_path: Path, options: Optional[DiscoveryOptions] = None
+    ) -> List[Path]:
+        return list(self.iter_files(repo_path, options))
+
+    def shard_files(
+        self,
+        repo_path: Path,
+        index: int,
+        count: int,
+        options: Optional[DiscoveryOptions] = None,
+    ) -> List[Path]:
+        """Files of shard ``index`` (1-based) of ``count``, balanced by size."""
+        return shard_files(repo_path, self.discover_files(repo_path, options), index, count)
 
     def scan(self, repo_path: Path, options: ScanOptions) -> List[CryptoFinding]:
-        files = self.discover_files(repo_path)
-        findings: List[CryptoFinding] = []
-        for scanner in self.scanners:
-            supported = [path for path in files if scanner.supports(path, options)]
-            if not supported:
-                continue
-            raw_findings = scanner.scan(supported)
-            findings.extend(normalize(raw) for raw in raw_findings)
-        return sorted(findings, key=lambda finding: finding.id)
+        return list(self.iter_scan(repo_path, options, ordered=True))
+
+    def iter_scan(
+        self, repo_path: Path, options: ScanOptions, ordered: bool = False
+    ) -> Iterator[CryptoFinding]:
+        files = self.iter_files(repo_path, options.discovery)
+        return self.iter_scan_files(files, options, ordered=ordered)
+
+    def iter_scan_revision(
+        self, repo_path: Path, rev: str, options: ScanOptions, ordered: bool = False
+    ) -> Iterator[CryptoFinding]:
+        """Scan the files of git revision ``rev`` without checking it out."""
+        table = DispatchTable(self.scanners, options)
+        sources = revision_sources(repo_path, rev, options.discovery, table.wants)
+        return self.iter_scan_files(sources, options, ordered=ordered)
+
+    def scan_changes(
+        self,
+        repo_path: Path,
+        since: str,
+        baseline: Sequence[CryptoFinding],
+        options: ScanOptions,
+    ) -> List[CryptoFinding]:
+        changes = changed_files(repo_path, since)
+        files = select_files(repo_path, changes.changed, options.discovery)
+        fresh = self.scan_files(files, options)
+        return splice_findings(baseline, fresh, repo_path, changes.affected)
+
+    def scan_files(self, files: Iterable[Path], options: ScanOptions) -> List[CryptoFinding]:
+        return list(self.iter_scan_files(files, options, ordered=True))
+
+    def iter_scan_files(
+        self, files: Iterable[ScanSource], options: ScanOptions, ordered: bool = False
+    ) -> Iterator[CryptoFinding]:
+        findings = self._iter_findings(files, options)
+        if ordered:
+            with instrument.stage("sort"):
+                return iter(sorted(findings, key=lambda finding: finding.id))
+        return findings
+
+    def _iter_findings(
+        self, files: Iterable[ScanSource], options: ScanOptions
+    ) -> Iterator[CryptoFinding]:
+        # Findings come out file by file in discovery order, and per file in
+        # scanner order, so the ordered mode sorts ties exactly as before.
+        table = DispatchTable(self.scanners, options)
+        files = instrument.timed("discovery", files)
+        sources = instrument.timed("read", iter_sources(files, options.discovery, table.wants))
+        if options.prefetch_threads > 0 and options.jobs <= 1:
+            # Worker processes already overlap their reads with each other;
+            # prefetching is for the single-process scan.
+            from cbom_scanner.core.prefetch import prefetch_sources
+
+            wanted = (source for source in sources if table.route(source))
+            sources = prefetch_sources(wanted, options.prefetch_threads, options.prefetch_bytes)
+        tasks = ((index, source) for source in sources for index in table.route(source))
+        cache = ScanCache.from_options(options)
+        try:
+            if options.jobs > 1:
+                # Imported here: multiprocessing is a noticeable share of the
+                # startup of small single-process scans.
+                from cbom_scanner.core.parallel import scan_parallel
+
+                yield from scan_parallel(self.scanners, tasks, options.jobs, cache, options.limits)
+                return
+            for index, path in tasks:
+                scanner = self.scanners[index]
+                with instrument.scan_file(scanner.language, path):
+                    raw_findings = scan_file_cached(scanner, path, cache, options.limits)
+                with instrument.stage("normalize"):
+                    findings = normalize_many(raw_findings)
+                yield from findings
+        finally:
+            if cache is not None:
+                cache.trim()
@@ -0,0 +1,115 @@
+"""Process pool execution of per-file scanner work."""
+
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cbom_scanner.core import instrument
+from cbom_scanner.core.cache import ScanCache, scan_file_cached
+from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.core.normalizer import normalize_many
+from cbom_scanner.core.options import SourceLimits
+from cbom_scanner.core.sources import ScanSource
+from cbom_scanner.scanners.base import LanguageScanner
+
+
+ScanTask = Tuple[int, ScanSource]
+
+# Tasks are shipped to workers in small chunks, and only a bounded number of
+# chunks per worker is in flight, so results stream back in task order while
+# discovery is still producing tasks.
+_CHUNKSIZE = 8
+_CHUNKS_PER_WORKER = 4
+
+# Scanners installed once per worker process so rule sets and parsers stay warm
+# across every file the worker handles.
+_worker_scanners: Sequence[LanguageScanner] = ()
+_worker_cache: Optional[ScanCache] = None
+_worker_limits: Optional[SourceLimits] = None
+
+
+def _init_worker(
+    scanners: Sequence[LanguageScanner],
+    cache_dir: Optional[Path],
+    limits: Optional[SourceLimits],
+    slowest: Optional[int],
+) -> None:
+    global _worker_scanners, _worker_cache, _worker_limits
+    _worker_scanners = scanners
+    _worker_cache = ScanCache(cache_dir) if cache_dir is not None else None
+    _worker_limits = limits
+    # Workers record only when the parent does; each chunk's measurements
+    # travel back with its findings.
+    instrument.install(instrument.Recorder(slowest) if slowest is not None else None)
+
+
+def _scan_chunk(chunk: List[ScanTask]) -> Tuple[List[CryptoFinding], Optional[dict], int]:
+    findings: List[CryptoFinding] = []
+    for index, path in chunk:
+        scanner = _worker_scanners[index]
+        with instrument.scan_file(scanner.language, path):
+            raw_findings = scan_file_cached(scanner, path, _worker_cache, _worker_limits)
+        with instrument.stage("normalize"):
+            findings.extend(normalize_many(raw_findings))
+    recorder = instrument.active()
+    # Cache bytes this chunk wrote, so the parent knows whether to evict.
+    written = 0
+    if _worker_cache is not None:
+        written, _worker_cache.written = _worker_cache.written, 0
+    return findings, recorder.drain() if recorder is not None else None, written
+
+
+def _results(future: Future, cache: Optional[ScanCache]) -> List[CryptoFinding]:
+    with instrument.stage("wait"):
+        findings, snapshot, written = future.result()
+    if snapshot is not None:
+        instrument.active().merge(snapshot)
+    if cache is not None:
+        cache.written += written
+    return findings
+
+
+def _chunks(tasks: Iterable[ScanTask]) -> Iterator[List[ScanTask]]:
+    iterator = iter(tasks)
+    while True:
+        chunk = list(islice(iterator, _CHUNKSIZE))
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_parallel(
+    scanners: Sequence[LanguageScanner],
+    tasks: Iterable[ScanTask],
+    jobs: int,
+    cache: Optional[ScanCache] = None,
+    limits: Optional[SourceLimits] = None,
+) -> Iterator[CryptoFinding]:
+    """Scan ``tasks`` on ``jobs`` worker processes, yielding findings in task order.
+
+    Workers share ``cache``'s directory; the bytes they write are added to
+    ``cache.written`` so the caller can decide whether to evict.
+    """
+    recorder = instrument.active()
+    slowest = recorder.slowest if recorder is not None else None
+    cache_dir = cache.directory if cache is not None else None
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(list(scanners), cache_dir, limits, slowest),
+    ) as pool:
+        pending: Deque[Future] = deque()
+        try:
+            for chunk in _chunks(tasks):
+                pending.append(pool.submit(_scan_chunk, chunk))
+                if len(pending) >= jobs * _CHUNKS_PER_WORKER:
+                    yield from _results(pending.popleft(), cache)
+            while pending:
+                yield from _results(pending.popleft(), cache)
+        finally:
+            for future in pending:
+                future.cancel()
@@ -0,0 +1,81 @@
+"""Read-ahead of file contents on background threads, overlapping I/O with scanning."""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Iterable, Iterator, Optional, Tuple
+
+from cbom_scanner.core import instrument
+from cbom_scanner.core.sources import MemorySource, ScanSource
+
+
+# Files read ahead per thread, so a thread always has the next read queued.
+_FILES_PER_THREAD = 4
+
+
+def _read(path: Path, limit: int) -> Optional[bytes]:
+    try:
+        with open(path, "rb") as handle:
+            if os.fstat(handle.fileno()).st_size > limit:
+                return None
+            data = handle.read(limit + 1)
+    except OSError:
+        return None
+    # The file may have grown since the size check.
+    return data if len(data) <= limit else None
+
+
+def prefetch_sources(
+    sources: Iterable[ScanSource], threads: int, budget: int
+) -> Iterator[ScanSource]:
+    """Yield ``sources`` in order, with files read ahead on ``threads`` threads.
+
+    At most ``threads * 4`` files are read ahead, none larger than that
+    share of ``budget``, so buffered contents never exceed ``budget`` bytes.
+    Prefetched files come out as ``MemorySource`` under the same name;
+    larger files, and files that fail to read, come out unchanged and are
+    read by the scanner as before. Only the consuming thread records
+    instrumentation: the reader threads do nothing but read.
+    """
+    depth = threads * _FILES_PER_THREAD
+    limit = budget // depth
+    pending: Deque[Tuple[ScanSource, Optional[Future]]] = deque()
+    iterator = iter(sources)
+
+    def fill() -> None:
+        while len(pending) < depth:
+            source = next(iterator, None)
+            if source is None:
+                return
+            if isinstance(source, MemorySource):
+                pending.append((source, None))
+            else:
+                pending.append((source, pool.submit(_read, source, limit)))
+
+    with ThreadPoolExecutor(max_workers=threads, thread_name_prefix="cbom-prefetch") as pool:
+        try:
+            while True:
+                # Refilled before taking the next file, so the file being
+                # scanned counts against ``depth`` too.
+                fill()
+                if not pending:
+                    return
+                source, future = pending.popleft()
+                if future is None:
+                    yield source
+                    continue
+                # Time the scan spends waiting on reads that are not done yet.
+                with instrument.stage("prefetch"):
+                    data = future.result()
+                if data is None:
+                    yield source
+                    continue
+                instrument.count("prefetchedFiles")
+                yield MemorySource(str(source), data, origin=source)
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
@@ -0,0 +1,84 @@
+"""Sources read from a git revision's object database instead of a checkout."""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from cbom_scanner.core.archives import archive_kind
+from cbom_scanner.core.discovery import (
+    IGNORE_FILES,
+    IgnoreRules,
+    IgnoreTree,
+    _base_rules,
+    walk_order,
+)
+from cbom_scanner.core.git import TreeEntry, iter_blobs, list_tree
+from cbom_scanner.core.options import DiscoveryOptions
+from cbom_scanner.core.sources import MemorySource
+
+
+def _ignore_loader(
+    repo_path: Path, entries: List[TreeEntry]
+) -> Callable[[str], List[IgnoreRules]]:
+    # Ignore files are read from the revision, not the working tree, so the
+    # selection is the one a checkout of ``rev`` would get.
+    found = [entry for entry in entries if entry.path.rpartition("/")[2] in IGNORE_FILES]
+    texts = dict(iter_blobs(repo_path, [entry.blob for entry in found]))
+    by_dir: Dict[str, Dict[str, IgnoreRules]] = defaultdict(dict)
+    for entry in found:
+        rel_dir, _, name = entry.path.rpartition("/")
+        text = texts[entry.blob].decode("utf-8", errors="replace")
+        by_dir[rel_dir][name] = IgnoreRules.from_text(rel_dir, text)
+
+    def load(rel_dir: str) -> List[IgnoreRules]:
+        rules = by_dir.get(rel_dir, {})
+        return [rules[name] for name in IGNORE_FILES if name in rules and rules[name].patterns]
+
+    return load
+
+
+def revision_sources(
+    repo_path: Path,
+    rev: str,
+    options: Optional[DiscoveryOptions] = None,
+    wanted: Optional[Callable[[str], bool]] = None,
+) -> Iterator[MemorySource]:
+    """Yield the files of ``rev`` under ``repo_path`` that a scan of its checkout would read.
+
+    Sources are named as if ``rev`` were checked out at ``repo_path`` and
+    come in ``iter_files`` order, so findings match a scan of that checkout.
+    Only blobs for which ``wanted(name)`` is true, or that are archives, are
+    read. Each source's cache key is its blob id, so unchanged files are
+    never hashed. The tree is listed before this returns, so a bad
+    revision raises ``GitError`` here rather than while iterating.
+    """
+    options = options or DiscoveryOptions()
+    entries = list_tree(repo_path, rev)
+    load = _ignore_loader(repo_path, entries) if options.use_ignore_files else None
+    tree = IgnoreTree(_base_rules(repo_path, options), load, options)
+
+    def selected(entry: TreeEntry) -> bool:
+        if options.max_file_size is not None and entry.size > options.max_file_size:
+            return False
+        name = entry.path.rpartition("/")[2]
+        archive = options.archive_depth > 0 and archive_kind(name) is not None
+        if wanted is not None and not archive and not wanted(name):
+            return False
+        return tree.selected(entry.path)
+
+    chosen = sorted(
+        (entry for entry in entries if selected(entry)), key=lambda entry: walk_order(entry.path)
+    )
+    return _read(repo_path, chosen)
+
+
+def _read(repo_path: Path, entries: List[TreeEntry]) -> Iterator[MemorySource]:
+    blobs = iter_blobs(repo_path, [entry.blob for entry in entries])
+    try:
+        for entry, (_, data) in zip(entries, blobs):
+            path = str(repo_path / entry.path)
+            yield MemorySource(path, data, content_id=f"git:{entry.blob}")
+    finally:
+        blobs.close()
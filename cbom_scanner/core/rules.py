@@ -2,10 +2,21 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
+from functools import cached_property
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from cbom_scanner.core.matcher import CallMatcher, TextMatcher
+
+
+# Fields a call rule may set, beyond the required ``id`` and ``call``.
+_CALL_FIELDS = frozenset(
+    {"api", "library", "asset_type", "confidence", "algorithm", "mode", "key_size_bits"}
+)
+_ARG_INDEX_FIELDS = ("algorithm", "mode", "key_size_bits")
 
 
 @dataclass(frozen=True)
@@ -28,6 +39,19 @@ class RuleSet:
     imports: List[str]
     calls: List[CallRule]
 
+    @cached_property
+    def fingerprint(self) -> str:
+        payload = json.dumps(asdict(self), sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @cached_property
+    def matcher(self) -> CallMatcher:
+        return CallMatcher(self.calls)
+
+    @cached_property
+    def text_matcher(self) -> TextMatcher:
+        return TextMatcher(self.calls)
+
 
 def _as_int(value: Any) -> Optional[int]:
     if value is None:
@@ -38,14 +62,59 @@ def _as_int(value: Any) -> Optional[int]:
         return None
 
 
+def check_rules(data: Any, source: str) -> List[str]:
+    """Problems with parsed rule file ``data``, one message each, prefixed by ``source``.
+
+    ``load_rules`` tolerates all of these; ``rules compile`` refuses them.
+    """
+    if not isinstance(data, dict):
+        return [f"{source}: expected a JSON object"]
+    problems: List[str] = []
+    if not isinstance(data.get("language", ""), str):
+        problems.append(f"{source}: language must be a string")
+    imports = data.get("imports", [])
+    if not isinstance(imports, list) or not all(isinstance(entry, str) for entry in imports):
+        problems.append(f"{source}: imports must be a list of strings")
+    calls = data.get("calls", [])
+    if not isinstance(calls, list):
+        return problems + [f"{source}: calls must be a list"]
+    for position, rule in enumerate(calls):
+        where = f"{source}: calls[{position}]"
+        if not isinstance(rule, dict):
+            problems.append(f"{where}: expected an object")
+            continue
+        where = f"{source}: rule {rule.get('id', position)!r}"
+        for key in ("id", "call"):
+            if not isinstance(rule.get(key), str) or not rule[key]:
+                problems.append(f"{where}: {key} must be a non-empty string")
+        for key in sorted(set(rule) - _CALL_FIELDS - {"id", "call", "arg_indexes"}):
+            problems.append(f"{where}: unknown field {key!r}")
+        for key in sorted(_CALL_FIELDS & set(rule)):
+            if rule[key] is not None and not isinstance(rule[key], str):
+                problems.append(f"{where}: {key} must be a string")
+        arg_indexes = rule.get("arg_indexes", {})
+        if not isinstance(arg_indexes, dict):
+            problems.append(f"{where}: arg_indexes must be an object")
+            continue
+        for key, value in sorted(arg_indexes.items()):
+            if key not in _ARG_INDEX_FIELDS:
+                problems.append(f"{where}: unknown arg_indexes field {key!r}")
+            elif isinstance(value, bool) or _as_int(value) is None or _as_int(value) < 0:
+                problems.append(f"{where}: arg_indexes.{key} must be a non-negative integer")
+    return problems
+
+
 def load_rules(rule_path: Path) -> RuleSet:
-    data = json.loads(rule_path.read_text())
-    language = data.get("language", rule_path.stem)
+    return parse_rules(json.loads(rule_path.read_text()), rule_path.stem)
+
+
+def parse_rules(data: Dict[str, Any], default_language: str) -> RuleSet:
+    language = data.get("language", default_language)
     imports = list(data.get("imports", []))
     calls: List[CallRule] = []
     for rule in data.get("calls", []):
         arg_indexes = {}
-        for key in ("algorithm", "mode", "key_size_bits"):
+        for key in _ARG_INDEX_FIELDS:
             if key in rule.get("arg_indexes", {}):
                 arg_indexes[key] = _as_int(rule["arg_indexes"][key])
         calls.append(
@@ -65,6 +134,16 @@ def load_rules(rule_path: Path) -> RuleSet:
     return RuleSet(language=language, imports=imports, calls=calls)
 
 
+RuleSource = Union[Path, RuleSet]
+
+
+def resolve_rules(rules: RuleSource) -> RuleSet:
+    """``rules`` itself if already loaded (e.g. from a bundle), else ``load_rules(rules)``."""
+    if isinstance(rules, RuleSet):
+        return rules
+    return load_rules(rules)
+
+
 def load_rule_sets(rules_dir: Path) -> Dict[str, RuleSet]:
     rule_sets: Dict[str, RuleSet] = {}
     for path in sorted(rules_dir.glob("*.yaml")):
@@ -0,0 +1,390 @@
+"""Long-running scan daemon with warm scanners and an in-memory result cache."""
+
+from __future__ import annotations
+
+import hmac
+import ipaddress
+import json
+import os
+import re
+import socket
+import socketserver
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from cbom_scanner import __version__
+from cbom_scanner.core.archives import iter_sources
+from cbom_scanner.core.cache import ScanCache, scan_file_cached
+from cbom_scanner.core.discovery import iter_files, select_files
+from cbom_scanner.core.dispatch import DispatchTable
+from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.core.normalizer import normalize_many
+from cbom_scanner.core.options import (
+    DEFAULT_HOST,
+    DEFAULT_MEMORY_ENTRIES,
+    DEFAULT_PORT,
+    ScanOptions,
+)
+from cbom_scanner.core.sources import MemorySource, ScanSource
+from cbom_scanner.formats.cbom import build_cbom
+from cbom_scanner.formats.cyclonedx import build_cyclonedx
+from cbom_scanner.scanners.base import LanguageScanner
+
+
+# Request bodies are small JSON documents; anything larger is refused.
+_MAX_BODY_BYTES = 16 * 1024 * 1024
+
+_Signature = Tuple[int, int, int]
+
+# A Host header: a name, IPv4 address or bracketed IPv6 address, then an optional port.
+_HOST_HEADER = re.compile(r"(\[[^\]]+\]|[^:\[\]]+)(?::(\d+))?")
+
+_BUILDERS = {"cbom": build_cbom, "cyclonedx": build_cyclonedx}
+
+
+class RequestError(ValueError):
+    """A scan request the service cannot run; reported to the client as 400."""
+
+
+def _signature(path: ScanSource) -> Optional[_Signature]:
+    # Archive members are as fresh as the archive holding them.
+    if isinstance(path, MemorySource):
+        if path.origin is None:
+            return None
+        path = path.origin
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+class ResultMemo:
+    """Bounded LRU map of (scanner index, path) to that file's findings.
+
+    Entries remember the file's mtime, size and inode when it was scanned and
+    are only returned while all three are unchanged.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MEMORY_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[
+            Tuple[int, str], Tuple[_Signature, List[CryptoFinding]]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[int, str], signature: _Signature) -> Optional[List[CryptoFinding]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != signature:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(
+        self, key: Tuple[int, str], signature: _Signature, findings: List[CryptoFinding]
+    ) -> None:
+        with self._lock:
+            self._entries[key] = (signature, findings)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class ScanService:
+    """Scans paths with scanners, rule sets and parsers kept resident.
+
+    Scans run one at a time in this process, so the warm tree-sitter parsers
+    and the in-memory results are shared by every request. ``options.jobs``
+    is ignored.
+    """
+
+    def __init__(
+        self,
+        scanners: Sequence[LanguageScanner],
+        options: ScanOptions,
+        max_entries: int = DEFAULT_MEMORY_ENTRIES,
+    ) -> None:
+        self.scanners = scanners
+        self.options = options
+        self.table = DispatchTable(scanners, options)
+        self.memo = ResultMemo(max_entries)
+        # Kept across requests, so eviction can skip the directory walk while
+        # the size it last found leaves room for what was written since.
+        self.cache = ScanCache.from_options(options)
+        self.hits = 0
+        self.misses = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def warm(self) -> None:
+        """Load every scanner's grammar and queries before the first request."""
+        for scanner in self.scanners:
+            scanner.scan_source("<warm-up>", "")
+
+    def _files(self, root: Path, files: Optional[Iterable[str]]) -> Iterable[Path]:
+        if files is None:
+            return iter_files(root, self.options.discovery)
+        root = Path(os.path.normpath(root))
+        rel_paths = []
+        for name in files:
+            # Normalised first, so neither form can climb out with "..".
+            path = Path(os.path.normpath(root / name))
+            try:
+                rel_path = path.relative_to(root)
+            except ValueError:
+                raise RequestError(f"{name} is not inside {root}") from None
+            if rel_path.parts:
+                rel_paths.append(rel_path.as_posix())
+        return select_files(root, rel_paths, self.options.discovery)
+
+    def scan(self, root: Path, files: Optional[Iterable[str]] = None) -> List[CryptoFinding]:
+        """Scan ``root``, or only ``files`` under it, and return findings sorted by id.
+
+        ``files`` are relative to ``root`` (or absolute paths inside it) and
+        go through the same excludes and ignore files as a full walk.
+        """
+        if not root.is_dir():
+            raise RequestError(f"{root} is not a directory")
+        with self._lock:
+            self.requests += 1
+            cache = self.cache
+            findings: List[CryptoFinding] = []
+            try:
+                sources = iter_sources(
+                    self._files(root, files), self.options.discovery, self.table.wants
+                )
+                for source in sources:
+                    for index in self.table.route(source):
+                        findings.extend(self._scan_file(index, source, cache))
+            finally:
+                if cache is not None:
+                    cache.trim()
+        findings.sort(key=lambda finding: finding.id)
+        return findings
+
+    def _scan_file(
+        self, index: int, path: ScanSource, cache: Optional[ScanCache]
+    ) -> List[CryptoFinding]:
+        key = (index, str(path))
+        # Taken before reading, so a write during the scan invalidates the entry.
+        signature = _signature(path)
+        if signature is not None:
+            findings = self.memo.get(key, signature)
+            if findings is not None:
+                self.hits += 1
+                return findings
+        self.misses += 1
+        raw_findings = scan_file_cached(self.scanners[index], path, cache, self.options.limits)
+        findings = normalize_many(raw_findings)
+        if signature is not None:
+            self.memo.put(key, signature, findings)
+        return findings
+
+    def status(self) -> Dict[str, object]:
+        return {
+            "status": "ok",
+            "version": __version__,
+            "requests": self.requests,
+            "cachedFiles": len(self.memo),
+            "cacheHits": self.hits,
+            "cacheMisses": self.misses,
+        }
+
+    def handle_scan(self, request: Dict[str, object]) -> dict:
+        """Run a ``POST /scan`` request and return the report document."""
+        path = request.get("path")
+        if not isinstance(path, str) or not os.path.isabs(path):
+            raise RequestError("'path' must be an absolute path")
+        files = request.get("files")
+        if files is not None and (
+            not isinstance(files, list) or not all(isinstance(name, str) for name in files)
+        ):
+            raise RequestError("'files' must be a list of paths")
+        report_format = request.get("format", "cbom")
+        builder = _BUILDERS.get(report_format) if isinstance(report_format, str) else None
+        if builder is None:
+            raise RequestError(f"'format' must be one of: {', '.join(sorted(_BUILDERS))}")
+        root = Path(path).resolve()
+        return builder(root.name, self.scan(root, files))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = f"cbom-scanner/{__version__}"
+    protocol_version = "HTTP/1.1"
+
+    @property
+    def service(self) -> ScanService:
+        return self.server.service  # type: ignore[attr-defined]
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else "local"
+
+    def log_message(self, format: str, *args: object) -> None:
+        if self.server.verbose:  # type: ignore[attr-defined]
+            super().log_message(format, *args)
+
+    def _refuse(self) -> bool:
+        """Send an error and return True if the request must not be served.
+
+        Over TCP the Host header must name a loopback address at the bound
+        port, so a page whose DNS name rebinds to 127.0.0.1 is turned away,
+        and with a token set every scan must carry it.
+        """
+        port = self.server.port  # type: ignore[attr-defined]
+        if port is not None and not _loopback_host(self.headers.get("Host", ""), port):
+            self.close_connection = True
+            self._send_json(403, {"error": "Host must be a loopback address"})
+            return True
+        token = self.server.token  # type: ignore[attr-defined]
+        if token is not None and self.command == "POST":
+            supplied = self.headers.get("Authorization", "").encode("utf-8")
+            if not hmac.compare_digest(supplied, f"Bearer {token}".encode("utf-8")):
+                self.close_connection = True
+                self._send_json(401, {"error": "missing or wrong Authorization token"})
+                return True
+        return False
+
+    def _send_json(self, status: int, payload: object) -> None:
+        body = (json.dumps(payload) + "\n").encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self._refuse():
+            return
+        if self.path == "/health":
+            self._send_json(200, self.service.status())
+        else:
+            self._send_json(404, {"error": f"no such endpoint: {self.path}"})
+
+    def do_POST(self) -> None:
+        if self._refuse():
+            return
+        if self.path != "/scan":
+            self._send_json(404, {"error": f"no such endpoint: {self.path}"})
+            return
+        # Browsers send text/plain and form bodies cross-site without a preflight.
+        if self.headers.get_content_type() != "application/json":
+            self.close_connection = True
+            self._send_json(415, {"error": "Content-Type must be application/json"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if not 0 <= length <= _MAX_BODY_BYTES:
+            self.close_connection = True
+            self._send_json(400, {"error": "invalid Content-Length"})
+            return
+        try:
+            request = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, {"error": "request body is not valid JSON"})
+            return
+        try:
+            if not isinstance(request, dict):
+                raise RequestError("request body must be a JSON object")
+            report = self.service.handle_scan(request)
+        except RequestError as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+        except Exception as exc:  # keep serving after a failed scan
+            self.log_error("scan failed: %r", exc)
+            self._send_json(500, {"error": f"scan failed: {exc}"})
+            return
+        self._send_json(200, report)
+
+
+class _TCPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            os.unlink(self.server_address)
+        except OSError:
+            pass
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def _check_loopback(host: str) -> None:
+    if not _is_loopback(host):
+        raise ValueError(f"refusing to listen on non-loopback address {host}")
+
+
+def _loopback_host(header: str, port: int) -> bool:
+    match = _HOST_HEADER.fullmatch(header.strip().lower())
+    if match is None:
+        return False
+    host, host_port = match.groups()
+    return _is_loopback(host.strip("[]")) and int(host_port or 80) == port
+
+
+def make_server(
+    service: ScanService,
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    socket_path: Optional[Path] = None,
+    verbose: bool = False,
+    token: Optional[str] = None,
+) -> socketserver.BaseServer:
+    """Bind the daemon to ``socket_path`` if given, else to loopback ``host``:``port``.
+
+    The daemon reads any file its user can, so it only listens locally: a
+    Unix socket is created with owner-only permissions and TCP hosts must be
+    loopback addresses. Over TCP, requests must also name a loopback Host;
+    with a ``token``, scans must send ``Authorization: Bearer <token>``.
+    """
+    server: socketserver.BaseServer
+    if socket_path is not None:
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValueError("Unix sockets are not supported on this platform")
+        if socket_path.is_socket():
+            # Left behind by a daemon that did not shut down cleanly.
+            socket_path.unlink()
+        umask = os.umask(0o077)
+        try:
+            server = _UnixServer(str(socket_path), _Handler)
+        finally:
+            os.umask(umask)
+        # Only the owner can connect; there is no Host to check.
+        server.port = None  # type: ignore[attr-defined]
+    else:
+        _check_loopback(host)
+        server = _TCPServer((host, port), _Handler)
+        server.port = server.server_address[1]  # type: ignore[attr-defined]
+    server.token = token  # type: ignore[attr-defined]
+    server.service = service  # type: ignore[attr-defined]
+    server.verbose = verbose  # type: ignore[attr-defined]
+    return server
+
+
+def server_url(server: socketserver.BaseServer) -> str:
+    address = server.server_address
+    if isinstance(address, str):
+        return f"unix:{address}"
+    host, port = address[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,79 @@
+"""Deterministic partitioning of a scan across machines, and merging the parts."""
+
+from __future__ import annotations
+
+import heapq
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from cbom_scanner.core.models import CryptoFinding
+
+
+# Added to every file's size when balancing, so a shard of many tiny files
+# is not treated as nearly free: each file still costs a read and a parse.
+FILE_OVERHEAD_BYTES = 4096
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` (1-based, ``1 <= i <= N``) into ``(i, N)``."""
+    index, sep, count = spec.partition("/")
+    try:
+        if not sep:
+            raise ValueError
+        parsed = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r}: expected i/N, e.g. 1/4") from None
+    if not 1 <= parsed[0] <= parsed[1]:
+        raise ValueError(f"invalid shard {spec!r}: i must be between 1 and N")
+    return parsed
+
+
+def _weight(path: Path) -> int:
+    try:
+        return os.path.getsize(path) + FILE_OVERHEAD_BYTES
+    except OSError:
+        return FILE_OVERHEAD_BYTES
+
+
+def shard_files(root: Path, files: Sequence[Path], index: int, count: int) -> List[Path]:
+    """Return the files of shard ``index`` of ``count``, in their given order.
+
+    Files are assigned largest first to the least loaded shard (greedy LPT
+    scheduling by size). Ties are broken by path relative to ``root``, so
+    every machine with the same checkout computes the same partition, and
+    the shards together cover each file exactly once.
+    """
+    weighted = sorted(
+        (-_weight(path), Path(os.path.relpath(path, root)).as_posix(), position)
+        for position, path in enumerate(files)
+    )
+    # (load, shard number) of every shard; the least loaded is assigned next.
+    loads = [(0, number) for number in range(1, count + 1)]
+    selected: List[int] = []
+    for negative_weight, _, position in weighted:
+        load, number = loads[0]
+        heapq.heapreplace(loads, (load - negative_weight, number))
+        if number == index:
+            selected.append(position)
+    return [files[position] for position in sorted(selected)]
+
+
+def merge_findings(parts: Iterable[Sequence[CryptoFinding]]) -> List[CryptoFinding]:
+    """Combine the findings of disjoint shards in full-scan order.
+
+    Raises ``ValueError`` if two parts report the same file, which happens
+    when a shard is passed twice or the parts come from different partitions.
+    """
+    owners: Dict[str, int] = {}
+    merged: List[CryptoFinding] = []
+    for number, findings in enumerate(parts):
+        for finding in findings:
+            owner = owners.setdefault(finding.evidence.file, number)
+            if owner != number:
+                raise ValueError(f"{finding.evidence.file} appears in more than one input")
+        merged.extend(findings)
+    # Stable, like the full scan's sort: findings sharing an id come from one
+    # file, and so from one part, in the order it wrote them.
+    merged.sort(key=lambda finding: finding.id)
+    return merged
@@ -0,0 +1,39 @@
+"""Files scanned from memory rather than read from disk."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path, PurePosixPath
+from typing import Optional, Union
+
+
+@dataclass(frozen=True)
+class MemorySource:
+    """A file held in memory: an archive member or a blob read from git.
+
+    It takes the place of a ``Path`` for routing, classification and
+    reporting; ``str()`` gives the logical path that ends up in
+    ``Evidence.file``.
+    """
+
+    path: str
+    data: bytes
+    # An id the content already has (a git blob id), used as the cache key
+    # instead of hashing ``data``.
+    content_id: Optional[str] = None
+    # The file on disk the content came from, if any, for freshness checks.
+    origin: Optional[Path] = None
+
+    @property
+    def name(self) -> str:
+        return PurePosixPath(self.path).name
+
+    @property
+    def suffix(self) -> str:
+        return PurePosixPath(self.path).suffix
+
+    def __str__(self) -> str:
+        return self.path
+
+
+ScanSource = Union[Path, MemorySource]
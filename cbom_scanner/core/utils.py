@@ -2,43 +2,320 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Iterator, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Iterator, List, Optional, Tuple, TYPE_CHECKING, Union
 
 import importlib
 import importlib.util
+import mmap
+import threading
+from pathlib import Path
+
+from cbom_scanner.core import instrument
 
 
 if TYPE_CHECKING:  # pragma: no cover
-    from tree_sitter import Node, Parser
+    from tree_sitter import Language, Node, Parser, Query
+
+
+_UNRESOLVED: Any = object()
+
+# Node types that open a named function scope, per tree-sitter grammar. Calls
+# report the innermost enclosing scope as their function context; anonymous
+# scopes (callbacks, lambdas) that are not bound to a name inherit the name of
+# the scope around them.
+SCOPE_NODE_TYPES: Dict[str, Tuple[str, ...]] = {
+    "c": ("function_definition",),
+    "cpp": ("function_definition",),
+    "go": ("function_declaration", "method_declaration"),
+    "rust": ("function_item",),
+    "python": ("function_definition", "lambda"),
+    "java": ("method_declaration", "constructor_declaration"),
+    "c_sharp": ("method_declaration", "constructor_declaration", "local_function_statement"),
+    "javascript": (
+        "function_declaration",
+        "generator_function_declaration",
+        "method_definition",
+        "function",
+        "generator_function",
+        "arrow_function",
+    ),
+}
+SCOPE_NODE_TYPES["typescript"] = SCOPE_NODE_TYPES["javascript"]
+SCOPE_NODE_TYPES["tsx"] = SCOPE_NODE_TYPES["javascript"]
+
+# Nodes that give an anonymous function its name when it is their value, e.g.
+# ``const handler = () => ...`` or ``{ handler: function () ... }``, mapped to
+# their (name field, value field).
+BINDING_NODE_TYPES: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "python": {"assignment": ("left", "right")},
+    "javascript": {
+        "variable_declarator": ("name", "value"),
+        "assignment_expression": ("left", "right"),
+        "pair": ("key", "value"),
+        "public_field_definition": ("name", "value"),
+        "field_definition": ("property", "value"),
+    },
+}
+BINDING_NODE_TYPES["typescript"] = BINDING_NODE_TYPES["javascript"]
+BINDING_NODE_TYPES["tsx"] = BINDING_NODE_TYPES["javascript"]
+_BINDING_FIELDS = {
+    binding_type: fields
+    for bindings in BINDING_NODE_TYPES.values()
+    for binding_type, fields in bindings.items()
+}
+
+
+class _SourceBuffer:
+    __slots__ = ("text", "data", "_lines")
+
+    def __init__(self, text: str, data: bytes) -> None:
+        self.text = text
+        self.data = data
+        self._lines: Optional[List[str]] = None
+
+    def line(self, index: int) -> str:
+        if self._lines is None:
+            self._lines = self.text.splitlines()
+        return self._lines[index].rstrip() if index < len(self._lines) else ""
 
 
-@dataclass(frozen=True)
 class CallSite:
-    function: str
-    args: List[str]
-    line: int
-    column: int
-    snippet: str
-    function_context: Optional[str]
+    """A call found in source.
+
+    Sites produced by ``collect_call_sites`` resolve ``args`` and ``snippet`` on
+    first access, so calls that no rule matches never pay for decoding their
+    arguments.
+    """
+
+    __slots__ = (
+        "function",
+        "line",
+        "column",
+        "function_context",
+        "_args",
+        "_snippet",
+        "_buffer",
+        "_args_node",
+    )
+
+    def __init__(
+        self,
+        function: str,
+        args: List[str],
+        line: int,
+        column: int,
+        snippet: str,
+        function_context: Optional[str],
+    ) -> None:
+        self.function = function
+        self.line = line
+        self.column = column
+        self.function_context = function_context
+        self._args = args
+        self._snippet = snippet
+        self._buffer: Optional[_SourceBuffer] = None
+        self._args_node: Optional["Node"] = None
+
+    @classmethod
+    def _deferred(
+        cls,
+        buffer: _SourceBuffer,
+        node: "Node",
+        function: str,
+        args_node: "Node",
+        function_context: Optional[str],
+    ) -> "CallSite":
+        line, column = node.start_point
+        site = cls(function, _UNRESOLVED, line + 1, column + 1, _UNRESOLVED, function_context)
+        site._buffer = buffer
+        site._args_node = args_node
+        return site
+
+    @property
+    def args(self) -> List[str]:
+        if self._args is _UNRESOLVED:
+            self._args = _collect_args(self._buffer.data, self._args_node)
+        return self._args
+
+    @property
+    def snippet(self) -> str:
+        if self._snippet is _UNRESOLVED:
+            self._snippet = self._buffer.line(self.line - 1)
+        return self._snippet
+
+    def __repr__(self) -> str:
+        return f"CallSite(function={self.function!r}, line={self.line}, column={self.column})"
+
+
+_tree_sitter_modules: Optional[Tuple[Any, Any]] = None
+_tree_sitter_missing = False
 
 
 def _load_tree_sitter():
-    if importlib.util.find_spec("tree_sitter") is None or importlib.util.find_spec(
-        "tree_sitter_languages"
-    ) is None:  # pragma: no cover - optional dependency
+    global _tree_sitter_modules, _tree_sitter_missing
+    if _tree_sitter_modules is not None:
+        return _tree_sitter_modules
+    if not _tree_sitter_missing:
+        _tree_sitter_missing = importlib.util.find_spec(
+            "tree_sitter"
+        ) is None or importlib.util.find_spec("tree_sitter_languages") is None
+    if _tree_sitter_missing:  # pragma: no cover - optional dependency
         raise RuntimeError(
             "tree-sitter is required for this scanner. "
             "Install tree_sitter and tree_sitter_languages."
         )
     ts_module = importlib.import_module("tree_sitter")
     tsl_module = importlib.import_module("tree_sitter_languages")
-    return ts_module, tsl_module
+    _tree_sitter_modules = (ts_module, tsl_module)
+    return _tree_sitter_modules
+
+
+class ParserPool:
+    """Per-process cache of tree-sitter languages and parsers.
+
+    Languages are shared; parsers are not thread-safe, so each thread gets its
+    own parser per language.
+    """
+
+    def __init__(self) -> None:
+        self._languages: Dict[str, "Language"] = {}
+        self._queries: Dict[Tuple[str, str], Optional["Query"]] = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def language(self, name: str) -> "Language":
+        language = self._languages.get(name)
+        if language is None:
+            _, tsl_module = _load_tree_sitter()
+            with self._lock:
+                language = self._languages.get(name)
+                if language is None:
+                    language = tsl_module.get_language(name)
+                    self._languages[name] = language
+        return language
+
+    def call_query(self, name: str, call_node_type: str) -> Optional["Query"]:
+        """Query capturing calls as ``call``, function scopes as ``scope`` and
+        name bindings as ``binding``."""
+        key = (name, call_node_type)
+        if key in self._queries:
+            return self._queries[key]
+        language = self.language(name)
+        patterns = [f"({call_node_type}) @call"]
+        try:
+            language.query(patterns[0])
+        except NameError:
+            # The grammar has no such node type, so it can contain no calls.
+            query = None
+        else:
+            candidates = [
+                f"({scope_type}) @scope" for scope_type in SCOPE_NODE_TYPES.get(name, ())
+            ] + [
+                f"({binding_type}) @binding" for binding_type in BINDING_NODE_TYPES.get(name, {})
+            ]
+            for pattern in candidates:
+                try:
+                    language.query(pattern)
+                except NameError:
+                    continue
+                patterns.append(pattern)
+            query = language.query("\n".join(patterns))
+        with self._lock:
+            self._queries[key] = query
+        return query
+
+    def parser(self, name: str) -> "Parser":
+        parsers = getattr(self._local, "parsers", None)
+        if parsers is None:
+            parsers = self._local.parsers = {}
+        parser = parsers.get(name)
+        if parser is not None:
+            with self._lock:
+                self.hits += 1
+            return parser
+        ts_module, _ = _load_tree_sitter()
+        language = self.language(name)
+        parser = ts_module.Parser()
+        if hasattr(parser, "set_language"):
+            parser.set_language(language)
+        else:
+            parser.language = language
+        parsers[name] = parser
+        with self._lock:
+            self.misses += 1
+        return parser
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "languages": len(self._languages),
+                "queries": len(self._queries),
+            }
+
+
+_parser_pool = ParserPool()
+
+
+def parser_pool() -> ParserPool:
+    return _parser_pool
 
 
 def _get_language(name: str):
-    _, tsl_module = _load_tree_sitter()
-    return tsl_module.get_language(name)
+    return _parser_pool.language(name)
+
+
+def decode_source(data: Union[bytes, mmap.mmap]) -> str:
+    # Same result as Path.read_text(encoding="utf-8", errors="replace"),
+    # including universal-newline translation. Accepts any buffer, so
+    # memory-mapped files are decoded without an intermediate copy.
+    text = str(data, "utf-8", "replace")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    instrument.source(len(data), text)
+    return text
+
+
+# Bytes decoded at a time by ``iter_source_windows``.
+SOURCE_WINDOW = 1024 * 1024
+# Line breaks str.splitlines() honours besides "\n" and "\r", which
+# ``decode_source`` has already turned into "\n".
+_OTHER_BREAKS = "\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029"
+
+
+def iter_source_windows(
+    data: Union[bytes, mmap.mmap], window: int = SOURCE_WINDOW
+) -> Iterator[Tuple[int, str]]:
+    """Decode ``data`` as ``decode_source`` does, a run of whole lines at a time.
+
+    Yields ``(lines before the window, window text)``. Windows end after a
+    "\n" (or at the end of ``data``), so they are at most ``window`` bytes
+    unless a single line is longer; a memory-mapped file is never decoded
+    whole.
+    """
+    size = len(data)
+    start = 0
+    lines = 0
+    while start < size:
+        if start + window >= size:
+            end = size
+        else:
+            end = data.rfind(b"\n", start, start + window) + 1
+            if end == 0:
+                end = data.find(b"\n", start + window) + 1 or size
+        text = decode_source(data[start:end])
+        yield lines, text
+        lines += text.count("\n") + sum(text.count(char) for char in _OTHER_BREAKS)
+        start = end
+
+
+def read_source(path: Path) -> str:
+    with instrument.stage("read"):
+        data = path.read_bytes()
+    return decode_source(data)
 
 
 def _extract_text(source: bytes, node: "Node") -> str:
@@ -61,41 +338,36 @@ def _collect_args(source: bytes, args_node: "Node") -> List[str]:
     return args
 
 
-def _find_function_context(node: "Node") -> Optional[str]:
-    if node is None:
+def _scope_name(source: bytes, node: "Node", binding: Optional["Node"]) -> Optional[str]:
+    name_node = node.child_by_field_name("name")
+    if name_node is None:
+        # C and C++ name functions through nested declarators, e.g.
+        # function_definition -> pointer_declarator -> function_declarator -> identifier.
+        declarator = node.child_by_field_name("declarator")
+        while declarator is not None:
+            name_node = declarator
+            declarator = declarator.child_by_field_name("declarator")
+            if declarator is None and name_node.type == "reference_declarator":
+                declarator = name_node.named_children[0] if name_node.named_children else None
+    if name_node is None and binding is not None:
+        # ``binding`` is the innermost binding open around ``node``; it names
+        # ``node`` only if ``node`` is its value. (``node.parent`` would tell
+        # directly, but costs a walk down from the root.)
+        name_field, value_field = _BINDING_FIELDS[binding.type]
+        value = binding.child_by_field_name(value_field)
+        if value is not None and value.start_byte == node.start_byte and value.type == node.type:
+            name_node = binding.child_by_field_name(name_field)
+    if name_node is None:
         return None
-    current = node
-    while current is not None:
-        name_node = None
-        if hasattr(current, "child_by_field_name"):
-            try:
-                name_node = current.child_by_field_name("name")
-            except Exception:
-                name_node = None
-        if name_node is None:
-            field_name_for_child = getattr(current, "field_name_for_child", None)
-            if field_name_for_child is not None:
-                for index, child in enumerate(current.children):
-                    try:
-                        if field_name_for_child(index) == "name":
-                            name_node = child
-                            break
-                    except Exception:
-                        continue
-        if name_node is None:
-            for child in getattr(current, "named_children", []):
-                if child.type in (
-                    "identifier",
-                    "property_identifier",
-                    "field_identifier",
-                    "name",
-                ):
-                    name_node = child
-                    break
-        if name_node is not None:
-            return name_node.text.decode("utf-8", errors="replace")
-        current = current.parent
-    return None
+    return _extract_text(source, name_node)
+
+
+def _document_order(node: "Node") -> Tuple[int, int]:
+    return node.start_byte, -node.end_byte
+
+
+def _legacy_order(node: "Node") -> Tuple[int, int]:
+    return -node.end_byte, node.start_byte
 
 
 def collect_call_sites(
@@ -103,39 +375,48 @@ def collect_call_sites(
     language_name: str,
     call_node_type: str = "call_expression",
 ) -> Iterator[CallSite]:
-    ts_module, _ = _load_tree_sitter()
-    parser = ts_module.Parser()
-    language = _get_language(language_name)
-    if hasattr(parser, "set_language"):
-        parser.set_language(language)
-    else:
-        parser.language = language
-    source = source_text.encode("utf-8")
-    tree = parser.parse(source)
-    root = tree.root_node
-    stack: List[Node] = [root]
-    lines = source_text.splitlines()
-    while stack:
-        node = stack.pop()
-        if node.type == call_node_type:
-            function_node = node.child_by_field_name("function")
-            args_node = (
-                node.child_by_field_name("arguments")
-                or node.child_by_field_name("argument_list")
-            )
-            if function_node is None or args_node is None:
-                stack.extend(node.children)
-                continue
-            function_text = _extract_text(source, function_node)
-            args = _collect_args(source, args_node)
-            line, column = node.start_point
-            snippet = lines[line].rstrip() if line < len(lines) else ""
-            yield CallSite(
-                function=function_text,
-                args=args,
-                line=line + 1,
-                column=column + 1,
-                snippet=snippet,
-                function_context=_find_function_context(node),
-            )
-        stack.extend(node.children)
+    parser = _parser_pool.parser(language_name)
+    query = _parser_pool.call_query(language_name, call_node_type)
+    if query is None:
+        return
+    with instrument.stage("parse"):
+        source = source_text.encode("utf-8")
+        tree = parser.parse(source)
+        captures = query.captures(tree.root_node)
+    buffer = _SourceBuffer(source_text, source)
+    captures.sort(key=lambda capture: _document_order(capture[0]))
+    # One sweep in document order: ``scopes`` holds (end_byte, name) for the
+    # function scopes enclosing the current node and ``bindings`` the binding
+    # nodes enclosing it, innermost last.
+    scopes: List[Tuple[int, Optional[str]]] = []
+    bindings: List["Node"] = []
+    calls: List[Tuple["Node", Optional[str]]] = []
+    for node, capture_name in captures:
+        start = node.start_byte
+        while scopes and scopes[-1][0] <= start:
+            scopes.pop()
+        while bindings and bindings[-1].end_byte <= start:
+            bindings.pop()
+        if capture_name == "binding":
+            bindings.append(node)
+            continue
+        context = scopes[-1][1] if scopes else None
+        if capture_name == "scope":
+            binding = bindings[-1] if bindings else None
+            scopes.append((node.end_byte, _scope_name(source, node, binding) or context))
+        else:
+            calls.append((node, context))
+    # Sites are emitted in the order of the former depth-first walk (outer
+    # calls first, later siblings first) so findings with colliding ids keep
+    # their historical relative order.
+    calls.sort(key=lambda call: _legacy_order(call[0]))
+    for node, context in calls:
+        function_node = node.child_by_field_name("function")
+        args_node = (
+            node.child_by_field_name("arguments")
+            or node.child_by_field_name("argument_list")
+        )
+        if function_node is None or args_node is None:
+            continue
+        function_text = _extract_text(source, function_node)
+        yield CallSite._deferred(buffer, node, function_text, args_node, context)
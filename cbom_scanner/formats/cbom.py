@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import reprlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from cbom_scanner import __version__
-from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.core.models import CryptoFinding, Evidence
+from cbom_scanner.formats.jsonstream import open_output, write_document
 
 
 def _finding_payload(finding: CryptoFinding) -> dict:
@@ -33,20 +34,59 @@ def _finding_payload(finding: CryptoFinding) -> dict:
     return payload
 
 
-def build_cbom(component: str, findings: Iterable[CryptoFinding]) -> dict:
+def finding_from_payload(payload: Dict[str, Any]) -> CryptoFinding:
+    """Read one crypto asset; raises ``ValueError`` if it is not one."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), str):
+        raise ValueError(f"crypto asset without a string 'id': {reprlib.repr(payload)}")
+    try:
+        return _finding(payload)
+    except (AttributeError, TypeError, ValueError) as exc:
+        raise ValueError(f"malformed crypto asset {payload['id']!r}: {exc}") from None
+
+
+def _finding(payload: Dict[str, Any]) -> CryptoFinding:
+    evidence = payload.get("evidence") or {}
+    return CryptoFinding(
+        id=payload["id"],
+        asset_type=payload.get("assetType", "UNKNOWN"),
+        algorithm=payload.get("algorithm", "UNKNOWN"),
+        mode=payload.get("mode", "UNKNOWN"),
+        key_size_bits=payload.get("keySizeBits", "UNKNOWN"),
+        library=payload.get("library", "UNKNOWN"),
+        api=payload.get("api", ""),
+        confidence=payload.get("confidence", "LOW"),
+        evidence=Evidence(
+            file=evidence.get("file", ""),
+            line=int(evidence.get("line", 0)),
+            column=int(evidence.get("column", 0)),
+            function=evidence.get("function"),
+            snippet=evidence.get("snippet", ""),
+        ),
+        notes=payload.get("notes"),
+    )
+
+
+def parse_cbom(payload: Dict[str, Any]) -> Tuple[str, List[CryptoFinding]]:
+    findings = [finding_from_payload(asset) for asset in payload.get("cryptoAssets", [])]
+    return payload.get("component", ""), findings
+
+
+def _cbom_head(component: str) -> dict:
     return {
         "cbomVersion": "1.0",
         "generatedAt": datetime.now(timezone.utc).isoformat(),
         "component": component,
         "tool": {"name": "cbom-scanner", "version": __version__},
-        "cryptoAssets": [_finding_payload(finding) for finding in findings],
     }
 
 
-def write_cbom(path: Optional[Path], component: str, findings: List[CryptoFinding]) -> None:
-    payload = build_cbom(component, findings)
-    output = json.dumps(payload, indent=2, sort_keys=True)
-    if path is None or str(path) == "-":
-        print(output)
-        return
-    path.write_text(output)
+def build_cbom(component: str, findings: Iterable[CryptoFinding]) -> dict:
+    payload = _cbom_head(component)
+    payload["cryptoAssets"] = [_finding_payload(finding) for finding in findings]
+    return payload
+
+
+def write_cbom(path: Optional[Path], component: str, findings: Iterable[CryptoFinding]) -> None:
+    payloads = (_finding_payload(finding) for finding in findings)
+    with open_output(path) as stream:
+        write_document(stream, _cbom_head(component), "cryptoAssets", payloads)
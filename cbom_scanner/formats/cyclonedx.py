@@ -2,13 +2,14 @@
 
 from __future__ import annotations
 
-import json
+import reprlib
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from cbom_scanner import __version__
-from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.core.models import CryptoFinding, Evidence
+from cbom_scanner.formats.jsonstream import open_output, write_document
 
 
 def _finding_component(component: str, finding: CryptoFinding) -> dict:
@@ -40,7 +41,45 @@ def _finding_component(component: str, finding: CryptoFinding) -> dict:
     }
 
 
-def build_cyclonedx(component: str, findings: Iterable[CryptoFinding]) -> dict:
+def finding_from_component(payload: Dict[str, Any]) -> CryptoFinding:
+    """Read one component; raises ``ValueError`` if it is not one this tool wrote."""
+    if not isinstance(payload, dict) or not isinstance(payload.get("bom-ref"), str):
+        raise ValueError(f"component without a string 'bom-ref': {reprlib.repr(payload)}")
+    try:
+        return _finding(payload)
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"malformed component {payload['bom-ref']!r}: {exc}") from None
+
+
+def _finding(payload: Dict[str, Any]) -> CryptoFinding:
+    properties = {item["name"]: item.get("value") for item in payload.get("properties", [])}
+    return CryptoFinding(
+        id=payload["bom-ref"],
+        asset_type=properties.get("cbom:assetType", "UNKNOWN"),
+        algorithm=properties.get("cbom:algorithm", "UNKNOWN"),
+        mode=properties.get("cbom:mode", "UNKNOWN"),
+        key_size_bits=properties.get("cbom:keySizeBits", payload.get("version", "UNKNOWN")),
+        library=properties.get("cbom:library", "UNKNOWN"),
+        api=properties.get("cbom:api", ""),
+        confidence=properties.get("cbom:confidence", "LOW"),
+        evidence=Evidence(
+            file=properties.get("cbom:evidence:file", ""),
+            line=int(properties.get("cbom:evidence:line", 0)),
+            column=int(properties.get("cbom:evidence:column", 0)),
+            function=properties.get("cbom:evidence:function"),
+            snippet=properties.get("cbom:evidence:snippet", ""),
+        ),
+        notes=properties.get("cbom:notes"),
+    )
+
+
+def parse_cyclonedx(payload: Dict[str, Any]) -> Tuple[str, List[CryptoFinding]]:
+    findings = [finding_from_component(item) for item in payload.get("components", [])]
+    component = payload.get("metadata", {}).get("component", {}).get("name", "")
+    return component, findings
+
+
+def _cyclonedx_head(component: str) -> dict:
     return {
         "bomFormat": "CycloneDX",
         "specVersion": "1.5",
@@ -50,14 +89,16 @@ def build_cyclonedx(component: str, findings: Iterable[CryptoFinding]) -> dict:
             "tools": [{"name": "cbom-scanner", "version": __version__}],
             "component": {"name": component, "type": "application"},
         },
-        "components": [_finding_component(component, finding) for finding in findings],
     }
 
 
-def write_cyclonedx(path: Optional[Path], component: str, findings: List[CryptoFinding]) -> None:
-    payload = build_cyclonedx(component, findings)
-    output = json.dumps(payload, indent=2, sort_keys=True)
-    if path is None or str(path) == "-":
-        print(output)
-        return
-    path.write_text(output)
+def build_cyclonedx(component: str, findings: Iterable[CryptoFinding]) -> dict:
+    payload = _cyclonedx_head(component)
+    payload["components"] = [_finding_component(component, finding) for finding in findings]
+    return payload
+
+
+def write_cyclonedx(path: Optional[Path], component: str, findings: Iterable[CryptoFinding]) -> None:
+    payloads = (_finding_component(component, finding) for finding in findings)
+    with open_output(path) as stream:
+        write_document(stream, _cyclonedx_head(component), "components", payloads)
@@ -0,0 +1,111 @@
+"""Output of report comparisons as JSON or text."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO
+
+from cbom_scanner.core.diff import ADDED, REMOVED, Change, DiffSummary
+from cbom_scanner.formats.cbom import _finding_payload
+from cbom_scanner.formats.jsonstream import open_output, write_document
+
+
+_MARKS = {ADDED: "+", REMOVED: "-"}
+
+
+def _change_payload(change: Change) -> dict:
+    payload: Dict[str, Any] = {"change": change.kind, "id": change.finding.id}
+    if change.old is not None:
+        payload["old"] = _finding_payload(change.old)
+    if change.new is not None:
+        payload["new"] = _finding_payload(change.new)
+    if change.fields:
+        payload["fields"] = list(change.fields)
+    return payload
+
+
+def _summary_payload(summary: DiffSummary) -> dict:
+    return {
+        "added": summary.added,
+        "removed": summary.removed,
+        "changed": summary.changed,
+        "unchanged": summary.unchanged,
+    }
+
+
+def _group_payloads(summary: DiffSummary) -> List[dict]:
+    return [
+        {
+            "algorithm": algorithm,
+            "mode": mode,
+            "keySizeBits": key_size_bits,
+            "old": counts.old,
+            "new": counts.new,
+            "added": counts.added,
+            "removed": counts.removed,
+            "changed": counts.changed,
+        }
+        for (algorithm, mode, key_size_bits), counts in sorted(summary.groups.items())
+    ]
+
+
+def write_diff_json(
+    path: Optional[Path],
+    old_name: str,
+    new_name: str,
+    changes: Iterable[Change],
+    summary: DiffSummary,
+) -> None:
+    """Write ``{"changes": [...], "groups": [...], "summary": {...}}``.
+
+    Changes are streamed; ``groups`` and ``summary`` sort after ``changes``
+    and are filled in once ``changes`` is exhausted.
+    """
+    head: Dict[str, Any] = {"old": old_name, "new": new_name, "groups": [], "summary": {}}
+
+    def items() -> Iterator[dict]:
+        for change in changes:
+            yield _change_payload(change)
+        head["groups"] = _group_payloads(summary)
+        head["summary"] = _summary_payload(summary)
+
+    with open_output(path) as stream:
+        write_document(stream, head, "changes", items())
+
+
+def _write_text(stream: TextIO, changes: Iterable[Change], summary: DiffSummary) -> None:
+    for change in changes:
+        finding = change.finding
+        line = (
+            f"{_MARKS.get(change.kind, '~')} {finding.algorithm} {finding.mode}"
+            f" {finding.key_size_bits}  {finding.evidence.file}:{finding.evidence.line}"
+            f"  {finding.api}"
+        )
+        if change.fields:
+            line += f"  ({', '.join(change.fields)})"
+        stream.write(line + "\n")
+    moved = [group for group in _group_payloads(summary) if group["old"] != group["new"]]
+    if moved:
+        stream.write("\nby algorithm, mode and key size\n")
+        for group in moved:
+            stream.write(
+                f"  {group['algorithm']} {group['mode']} {group['keySizeBits']}:"
+                f" {group['old']} -> {group['new']}\n"
+            )
+    stream.write(
+        f"\n{summary.added} added, {summary.removed} removed, {summary.changed} changed,"
+        f" {summary.unchanged} unchanged\n"
+    )
+
+
+def write_diff_text(
+    path: Optional[Path], changes: Iterable[Change], summary: DiffSummary
+) -> None:
+    """Write one line per change, the groups whose counts moved, and the totals."""
+    if path is None or str(path) == "-":
+        _write_text(sys.stdout, changes, summary)
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8") as stream:
+        _write_text(stream, changes, summary)
@@ -0,0 +1,166 @@
+"""Incremental JSON document writing and reading."""
+
+from __future__ import annotations
+
+import json
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Collection, Dict, Iterable, Iterator, Optional, TextIO, Tuple
+
+
+def _dumps(value: Any, indent: str) -> str:
+    return json.dumps(value, indent=2, sort_keys=True).replace("\n", "\n" + indent)
+
+
+def write_document(
+    stream: TextIO,
+    head: Dict[str, Any],
+    array_key: str,
+    items: Iterable[Dict[str, Any]],
+) -> None:
+    """Write ``{**head, array_key: [*items]}`` one item at a time.
+
+    The bytes are exactly those of ``json.dumps(document, indent=2,
+    sort_keys=True)``, but only one item is ever serialized at once. Values
+    of ``head`` keys that sort after ``array_key`` are looked up after the
+    items are written, so ``items`` may fill them in as it is consumed.
+    """
+    keys = sorted([*head, array_key])
+    stream.write("{")
+    for position, key in enumerate(keys):
+        stream.write("\n  " + json.dumps(key) + ": ")
+        if key != array_key:
+            stream.write(_dumps(head[key], "  "))
+        else:
+            first = True
+            for item in items:
+                stream.write("[\n    " if first else ",\n    ")
+                stream.write(_dumps(item, "    "))
+                first = False
+            stream.write("[]" if first else "\n  ]")
+        if position < len(keys) - 1:
+            stream.write(",")
+    stream.write("\n}")
+
+
+@contextmanager
+def open_output(path: Optional[Path]) -> Iterator[TextIO]:
+    if path is None or str(path) == "-":
+        yield sys.stdout
+        # Matches the trailing newline print() used to add.
+        sys.stdout.write("\n")
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8") as stream:
+        yield stream
+
+
+_CHUNK_CHARS = 1 << 16
+
+_DECODER = json.JSONDecoder()
+
+
+class _Reader:
+    """A growable window over a text stream for ``raw_decode``."""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.stream.read(_CHUNK_CHARS)
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what has been consumed so memory stays bounded by one value.
+        self.buffer = self.buffer[self.position :] + chunk
+        self.position = 0
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character, or "" at the end."""
+        while True:
+            buffer = self.buffer
+            position = self.position
+            while position < len(buffer) and buffer[position] in " \t\r\n":
+                position += 1
+            self.position = position
+            if position < len(buffer):
+                return buffer[position]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"invalid JSON: expected {char!r}, found {found or 'end of input'!r}")
+        self.position += 1
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # A number at the end of the window may continue in the next chunk.
+            if end == len(self.buffer) and self._fill():
+                continue
+            self.position = end
+            return value
+
+
+def iter_array_items(
+    stream: TextIO, keys: Collection[str], head: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(key, item)`` for each item of the top-level arrays named in ``keys``.
+
+    Reads ``stream`` incrementally: only one item (or one other top-level
+    value) is held in memory at a time. If given, ``head`` receives the
+    other top-level values, and an empty list for each array in ``keys``,
+    so the caller can check the document once it is read. Anything after
+    the top-level object is an error.
+    """
+    reader = _Reader(stream)
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.expect("}")
+        _expect_end(reader)
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in keys and reader.peek() == "[":
+            if head is not None:
+                head[key] = []
+            reader.expect("[")
+            if reader.peek() != "]":
+                while True:
+                    yield key, reader.value()
+                    if reader.peek() != ",":
+                        break
+                    reader.expect(",")
+            reader.expect("]")
+        elif head is not None:
+            head[key] = reader.value()
+        else:
+            reader.value()
+        if reader.peek() != ",":
+            break
+        reader.expect(",")
+    reader.expect("}")
+    _expect_end(reader)
+
+
+def _expect_end(reader: _Reader) -> None:
+    # Catches newline-delimited output, where the first line is an object too.
+    found = reader.peek()
+    if found:
+        raise ValueError(f"invalid JSON: unexpected {found!r} after the top-level object")
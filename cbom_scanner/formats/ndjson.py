@@ -0,0 +1,30 @@
+"""Newline-delimited JSON output: one CBOM crypto asset per line, tagged with its component."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from typing import Iterable, Optional
+
+from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.formats.cbom import _finding_payload
+
+
+def write_ndjson(path: Optional[Path], component: str, findings: Iterable[CryptoFinding]) -> None:
+    if path is None or str(path) == "-":
+        _write_lines(sys.stdout, component, findings)
+        sys.stdout.flush()
+        return
+    with open(path, "w", encoding="utf-8") as stream:
+        _write_lines(stream, component, findings)
+
+
+def _write_lines(stream, component: str, findings: Iterable[CryptoFinding]) -> None:
+    # Each line stands alone, so each carries the component CBOM and
+    # CycloneDX give once for the document.
+    for finding in findings:
+        payload = _finding_payload(finding)
+        payload["component"] = component
+        stream.write(json.dumps(payload, sort_keys=True))
+        stream.write("\n")
@@ -0,0 +1,72 @@
+"""Loading of previously written CBOM and CycloneDX reports."""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from cbom_scanner.core.models import CryptoFinding
+from cbom_scanner.formats.cbom import finding_from_payload, parse_cbom
+from cbom_scanner.formats.cyclonedx import finding_from_component, parse_cyclonedx
+from cbom_scanner.formats.jsonstream import iter_array_items
+
+
+@dataclass(frozen=True)
+class Report:
+    format: str
+    component: str
+    findings: List[CryptoFinding]
+
+
+def detect_format(payload: Dict[str, Any]) -> str:
+    if not isinstance(payload, dict):
+        raise ValueError("Unrecognised report: expected a JSON object")
+    if payload.get("bomFormat") == "CycloneDX":
+        return "cyclonedx"
+    if "cbomVersion" in payload or "cryptoAssets" in payload:
+        return "cbom"
+    raise ValueError("Unrecognised report: expected CBOM or CycloneDX JSON")
+
+
+def parse_report(payload: Dict[str, Any]) -> Report:
+    report_format = detect_format(payload)
+    if report_format == "cyclonedx":
+        component, findings = parse_cyclonedx(payload)
+    else:
+        component, findings = parse_cbom(payload)
+    return Report(format=report_format, component=component, findings=findings)
+
+
+def load_report(path: Path) -> Report:
+    try:
+        return parse_report(json.loads(Path(path).read_text(encoding="utf-8")))
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+
+
+_FINDING_ARRAYS = {"cryptoAssets": finding_from_payload, "components": finding_from_component}
+_ARRAY_KEYS = {"cbom": "cryptoAssets", "cyclonedx": "components"}
+
+
+def iter_findings(path: Path) -> Iterator[CryptoFinding]:
+    """Yield the findings of a CBOM or CycloneDX report without loading it whole.
+
+    Raises ``ValueError`` once the file is read if it is neither format or
+    lacks its findings array, rather than reading it as an empty report.
+    """
+    head: Dict[str, Any] = {}
+    with open(path, encoding="utf-8") as stream:
+        for key, item in iter_array_items(stream, _FINDING_ARRAYS, head):
+            try:
+                finding = _FINDING_ARRAYS[key](item)
+            except ValueError as exc:
+                raise ValueError(f"{path}: {exc}") from None
+            yield finding
+    try:
+        array_key = _ARRAY_KEYS[detect_format(head)]
+    except ValueError as exc:
+        raise ValueError(f"{path}: {exc}") from None
+    if not isinstance(head.get(array_key), list):
+        raise ValueError(f"{path}: report has no {array_key!r} array")
@@ -1,12 +1,20 @@
-"""Language scanners."""
+"""Language scanners.
 
-from cbom_scanner.scanners.c import CScanner
-from cbom_scanner.scanners.csharp import CSharpScanner
-from cbom_scanner.scanners.go import GoScanner
-from cbom_scanner.scanners.java import JavaScanner
-from cbom_scanner.scanners.node import NodeScanner
-from cbom_scanner.scanners.python import PythonScanner
-from cbom_scanner.scanners.rust import RustScanner
+Scanner classes are imported on first attribute access (PEP 562), so
+importing the package does not import every scanner module.
+"""
+
+import importlib
+
+_MODULES = {
+    "CScanner": "cbom_scanner.scanners.c",
+    "CSharpScanner": "cbom_scanner.scanners.csharp",
+    "GoScanner": "cbom_scanner.scanners.go",
+    "JavaScanner": "cbom_scanner.scanners.java",
+    "NodeScanner": "cbom_scanner.scanners.node",
+    "PythonScanner": "cbom_scanner.scanners.python",
+    "RustScanner": "cbom_scanner.scanners.rust",
+}
 
 __all__ = [
     "CScanner",
@@ -17,3 +25,16 @@ __all__ = [
     "PythonScanner",
     "RustScanner",
 ]
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,21 +2,59 @@
 
 from __future__ import annotations
 
+import hashlib
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Iterable, List
+from typing import ClassVar, FrozenSet, Iterable, Iterator, List
 
 from cbom_scanner.core.models import RawFinding
 from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.core.utils import read_source
+from cbom_scanner.scanners.common import scan_regex_source
 
 
 class LanguageScanner(ABC):
     language: str
+    # File suffixes handled by the scanner. Scanners that leave this empty are
+    # asked about every file through ``supports`` instead of the suffix index.
+    suffixes: ClassVar[FrozenSet[str]] = frozenset()
+    # Bump when the scanner's findings for unchanged input change, so cached
+    # results from older versions are not reused.
+    version: ClassVar[str] = "1"
+
+    def suffixes_for(self, options: ScanOptions) -> FrozenSet[str]:
+        return self.suffixes
 
-    @abstractmethod
     def supports(self, path: Path, options: ScanOptions) -> bool:
-        raise NotImplementedError
+        return path.suffix in self.suffixes_for(options)
+
+    def fingerprint(self) -> str:
+        rule_set = getattr(self, "rule_set", None)
+        parts = [
+            type(self).__module__,
+            type(self).__qualname__,
+            self.version,
+            rule_set.fingerprint if rule_set is not None else "",
+        ]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
 
-    @abstractmethod
     def scan(self, files: Iterable[Path]) -> List[RawFinding]:
+        return list(self.iter_scan(files))
+
+    def iter_scan(self, files: Iterable[Path]) -> Iterator[RawFinding]:
+        for path in files:
+            yield from self.scan_file(path)
+
+    def scan_file(self, path: Path) -> List[RawFinding]:
+        return self.scan_source(str(path), read_source(path))
+
+    @abstractmethod
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
         raise NotImplementedError
+
+    def scan_heuristic(self, file: str, source_text: str) -> List[RawFinding]:
+        """Line-based scan for sources too large or too minified to parse."""
+        rule_set = getattr(self, "rule_set", None)
+        if rule_set is None:
+            return self.scan_source(file, source_text)
+        return scan_regex_source(file, source_text, rule_set)
@@ -2,30 +2,23 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, List
+from pathlib import PurePath
+from typing import List
 
 from cbom_scanner.core.models import RawFinding
-from cbom_scanner.core.orchestrator import ScanOptions
-from cbom_scanner.core.rules import load_rules
+from cbom_scanner.core.rules import RuleSource, resolve_rules
 from cbom_scanner.scanners.base import LanguageScanner
-from cbom_scanner.scanners.common import scan_tree_sitter
+from cbom_scanner.scanners.common import scan_tree_sitter_source
 
 
 class CScanner(LanguageScanner):
     language = "c"
+    suffixes = frozenset({".c", ".h", ".cpp", ".hpp"})
+    version = "2"
 
-    def __init__(self, rules_path: Path) -> None:
-        self.rule_set = load_rules(rules_path)
+    def __init__(self, rules: RuleSource) -> None:
+        self.rule_set = resolve_rules(rules)
 
-    def supports(self, path: Path, options: ScanOptions) -> bool:
-        return path.suffix in {".c", ".h", ".cpp", ".hpp"}
-
-    def scan(self, files: Iterable[Path]) -> List[RawFinding]:
-        findings: List[RawFinding] = []
-        for path in files:
-            if path.suffix in {".c", ".h"}:
-                findings.extend(scan_tree_sitter([path], self.rule_set, "c"))
-            else:
-                findings.extend(scan_tree_sitter([path], self.rule_set, "cpp"))
-        return findings
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
+        language_name = "c" if PurePath(file).suffix in {".c", ".h"} else "cpp"
+        return scan_tree_sitter_source(file, source_text, self.rule_set, language_name)
@@ -8,13 +8,11 @@ from typing import Iterable, List, Optional
 import re
 
 from cbom_scanner.core.models import RawFinding
-from cbom_scanner.core.rules import CallRule, RuleSet
-from cbom_scanner.core.utils import CallSite, collect_call_sites
+from cbom_scanner.core.rules import RuleSet
+from cbom_scanner.core.utils import CallSite, collect_call_sites, read_source
 
 
-def _match_call(rule: CallRule, call_site: CallSite) -> bool:
-    function_text = call_site.function
-    return function_text.endswith(rule.call) or function_text == rule.call
+_LITERAL_RE = re.compile(r"['\\\"]([^'\\\"]+)['\\\"]")
 
 
 def _safe_arg(args: List[str], index: Optional[int]) -> Optional[str]:
@@ -25,6 +23,58 @@ def _safe_arg(args: List[str], index: Optional[int]) -> Optional[str]:
     return None
 
 
+def scan_tree_sitter_source(
+    file: str,
+    source_text: str,
+    rule_set: RuleSet,
+    language_name: str,
+    call_node_type: str = "call_expression",
+) -> List[RawFinding]:
+    try:
+        call_sites = list(
+            collect_call_sites(source_text, language_name, call_node_type=call_node_type)
+        )
+    except RuntimeError:
+        return scan_regex_source(file, source_text, rule_set)
+    return match_call_sites(file, call_sites, rule_set)
+
+
+def match_call_sites(
+    file: str, call_sites: Iterable[CallSite], rule_set: RuleSet
+) -> List[RawFinding]:
+    findings: List[RawFinding] = []
+    matcher = rule_set.matcher
+    for call_site in call_sites:
+        for rule in matcher.match(call_site.function):
+            algorithm = rule.algorithm or _safe_arg(
+                call_site.args, rule.arg_indexes.get("algorithm")
+            )
+            mode = rule.mode or _safe_arg(
+                call_site.args, rule.arg_indexes.get("mode")
+            )
+            key_size_bits = rule.key_size_bits or _safe_arg(
+                call_site.args, rule.arg_indexes.get("key_size_bits")
+            )
+            findings.append(
+                RawFinding(
+                    file=file,
+                    line=call_site.line,
+                    column=call_site.column,
+                    snippet=call_site.snippet,
+                    function=call_site.function_context,
+                    api=rule.api,
+                    library=rule.library,
+                    algorithm=algorithm,
+                    mode=mode,
+                    key_size_bits=key_size_bits,
+                    confidence=rule.confidence,
+                    asset_type=rule.asset_type,
+                    notes=None,
+                )
+            )
+    return findings
+
+
 def scan_tree_sitter(
     files: Iterable[Path],
     rule_set: RuleSet,
@@ -33,45 +83,42 @@ def scan_tree_sitter(
 ) -> List[RawFinding]:
     findings: List[RawFinding] = []
     for path in files:
-        source_text = path.read_text(encoding="utf-8", errors="replace")
-        try:
-            call_sites = list(
-                collect_call_sites(
-                    source_text, language_name, call_node_type=call_node_type
-                )
+        findings.extend(
+            scan_tree_sitter_source(
+                str(path), read_source(path), rule_set, language_name, call_node_type
             )
-        except RuntimeError:
-            return scan_regex(files, rule_set, language_name)
-        for call_site in call_sites:
-            for rule in rule_set.calls:
-                if not _match_call(rule, call_site):
-                    continue
-                algorithm = rule.algorithm or _safe_arg(
-                    call_site.args, rule.arg_indexes.get("algorithm")
-                )
-                mode = rule.mode or _safe_arg(
-                    call_site.args, rule.arg_indexes.get("mode")
-                )
-                key_size_bits = rule.key_size_bits or _safe_arg(
-                    call_site.args, rule.arg_indexes.get("key_size_bits")
-                )
-                findings.append(
-                    RawFinding(
-                        file=str(path),
-                        line=call_site.line,
-                        column=call_site.column,
-                        snippet=call_site.snippet,
-                        function=call_site.function_context,
-                        api=rule.api,
-                        library=rule.library,
-                        algorithm=algorithm,
-                        mode=mode,
-                        key_size_bits=key_size_bits,
-                        confidence=rule.confidence,
-                        asset_type=rule.asset_type,
-                        notes=None,
-                    )
+        )
+    return findings
+
+
+def scan_regex_source(file: str, source_text: str, rule_set: RuleSet) -> List[RawFinding]:
+    findings: List[RawFinding] = []
+    for index, line, hits in rule_set.text_matcher.scan(source_text):
+        literal = None
+        for rule, column in hits:
+            algorithm = rule.algorithm
+            if algorithm is None:
+                if literal is None:
+                    match = _LITERAL_RE.search(line)
+                    literal = match.group(1) if match else ""
+                algorithm = literal or None
+            findings.append(
+                RawFinding(
+                    file=file,
+                    line=index,
+                    column=column,
+                    snippet=line.rstrip(),
+                    function=None,
+                    api=rule.api,
+                    library=rule.library,
+                    algorithm=algorithm,
+                    mode=rule.mode,
+                    key_size_bits=rule.key_size_bits,
+                    confidence=rule.confidence,
+                    asset_type=rule.asset_type,
+                    notes="heuristic",
                 )
+            )
     return findings
 
 
@@ -81,34 +128,6 @@ def scan_regex(
     call_pattern: str,
 ) -> List[RawFinding]:
     findings: List[RawFinding] = []
-    literal_re = re.compile(r"['\\\"]([^'\\\"]+)['\\\"]")
     for path in files:
-        lines = path.read_text(encoding="utf-8", errors="replace").splitlines()
-        for index, line in enumerate(lines, start=1):
-            for rule in rule_set.calls:
-                if rule.call not in line:
-                    continue
-                column = line.find(rule.call) + 1
-                algorithm = rule.algorithm
-                if algorithm is None:
-                    match = literal_re.search(line)
-                    if match:
-                        algorithm = match.group(1)
-                findings.append(
-                    RawFinding(
-                        file=str(path),
-                        line=index,
-                        column=column,
-                        snippet=line.rstrip(),
-                        function=None,
-                        api=rule.api,
-                        library=rule.library,
-                        algorithm=algorithm,
-                        mode=rule.mode,
-                        key_size_bits=rule.key_size_bits,
-                        confidence=rule.confidence,
-                        asset_type=rule.asset_type,
-                        notes="heuristic",
-                    )
-                )
+        findings.extend(scan_regex_source(str(path), read_source(path), rule_set))
     return findings
@@ -2,24 +2,20 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, List
+from typing import List
 
 from cbom_scanner.core.models import RawFinding
-from cbom_scanner.core.orchestrator import ScanOptions
-from cbom_scanner.core.rules import load_rules
+from cbom_scanner.core.rules import RuleSource, resolve_rules
 from cbom_scanner.scanners.base import LanguageScanner
-from cbom_scanner.scanners.common import scan_regex
+from cbom_scanner.scanners.common import scan_regex_source
 
 
 class CSharpScanner(LanguageScanner):
     language = "csharp"
+    suffixes = frozenset({".cs"})
 
-    def __init__(self, rules_path: Path) -> None:
-        self.rule_set = load_rules(rules_path)
+    def __init__(self, rules: RuleSource) -> None:
+        self.rule_set = resolve_rules(rules)
 
-    def supports(self, path: Path, options: ScanOptions) -> bool:
-        return path.suffix == ".cs"
-
-    def scan(self, files: Iterable[Path]) -> List[RawFinding]:
-        return scan_regex(files, self.rule_set, "csharp")
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
+        return scan_regex_source(file, source_text, self.rule_set)
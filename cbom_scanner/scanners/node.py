@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, List, Optional
+from pathlib import PurePath
+from typing import FrozenSet, List, Optional
 
 import re
 
 from cbom_scanner.core.models import RawFinding
-from cbom_scanner.core.orchestrator import ScanOptions
-from cbom_scanner.core.rules import load_rules
+from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.core.rules import RuleSource, resolve_rules
 from cbom_scanner.core.utils import collect_call_sites
 from cbom_scanner.scanners.base import LanguageScanner
-from cbom_scanner.scanners.common import scan_regex
+from cbom_scanner.scanners.common import scan_regex_source
 
 
 _CONST_ASSIGN_RE = re.compile(
@@ -54,59 +54,55 @@ def _resolve_arg(args: List[str], index: Optional[int], constants: dict[str, str
 
 class NodeScanner(LanguageScanner):
     language = "node"
-
-    def __init__(self, rules_path: Path) -> None:
-        self.rule_set = load_rules(rules_path)
-
-    def supports(self, path: Path, options: ScanOptions) -> bool:
-        if path.suffix in {".js", ".jsx"}:
-            return True
-        if options.include_ts and path.suffix in {".ts", ".tsx"}:
-            return True
-        return False
-
-    def scan(self, files: Iterable[Path]) -> List[RawFinding]:
+    suffixes = frozenset({".js", ".jsx"})
+    ts_suffixes = frozenset({".ts", ".tsx"})
+    version = "2"
+
+    def __init__(self, rules: RuleSource) -> None:
+        self.rule_set = resolve_rules(rules)
+
+    def suffixes_for(self, options: ScanOptions) -> FrozenSet[str]:
+        if options.include_ts:
+            return self.suffixes | self.ts_suffixes
+        return self.suffixes
+
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
+        language_name = "javascript"
+        if PurePath(file).suffix in self.ts_suffixes:
+            language_name = "typescript"
+        try:
+            call_sites = list(collect_call_sites(source_text, language_name))
+        except RuntimeError:
+            return scan_regex_source(file, source_text, self.rule_set)
         findings: List[RawFinding] = []
-        for path in files:
-            source_text = path.read_text(encoding="utf-8", errors="replace")
-            language_name = "javascript"
-            if path.suffix in {".ts", ".tsx"}:
-                language_name = "typescript"
-            try:
-                call_sites = list(collect_call_sites(source_text, language_name))
-            except RuntimeError:
-                findings.extend(scan_regex([path], self.rule_set, language_name))
-                continue
-            constants = _collect_const_strings(source_text)
-            for call_site in call_sites:
-                for rule in self.rule_set.calls:
-                    function_text = call_site.function
-                    if not (function_text.endswith(rule.call) or function_text == rule.call):
-                        continue
-                    algorithm = rule.algorithm or _resolve_arg(
-                        call_site.args, rule.arg_indexes.get("algorithm"), constants
-                    )
-                    mode = rule.mode or _resolve_arg(
-                        call_site.args, rule.arg_indexes.get("mode"), constants
-                    )
-                    key_size_bits = rule.key_size_bits or _resolve_arg(
-                        call_site.args, rule.arg_indexes.get("key_size_bits"), constants
-                    )
-                    findings.append(
-                        RawFinding(
-                            file=str(path),
-                            line=call_site.line,
-                            column=call_site.column,
-                            snippet=call_site.snippet,
-                            function=call_site.function_context,
-                            api=rule.api,
-                            library=rule.library,
-                            algorithm=algorithm,
-                            mode=mode,
-                            key_size_bits=key_size_bits,
-                            confidence=rule.confidence,
-                            asset_type=rule.asset_type,
-                            notes=None,
-                        )
+        constants = _collect_const_strings(source_text)
+        matcher = self.rule_set.matcher
+        for call_site in call_sites:
+            for rule in matcher.match(call_site.function):
+                algorithm = rule.algorithm or _resolve_arg(
+                    call_site.args, rule.arg_indexes.get("algorithm"), constants
+                )
+                mode = rule.mode or _resolve_arg(
+                    call_site.args, rule.arg_indexes.get("mode"), constants
+                )
+                key_size_bits = rule.key_size_bits or _resolve_arg(
+                    call_site.args, rule.arg_indexes.get("key_size_bits"), constants
+                )
+                findings.append(
+                    RawFinding(
+                        file=file,
+                        line=call_site.line,
+                        column=call_site.column,
+                        snippet=call_site.snippet,
+                        function=call_site.function_context,
+                        api=rule.api,
+                        library=rule.library,
+                        algorithm=algorithm,
+                        mode=mode,
+                        key_size_bits=key_size_bits,
+                        confidence=rule.confidence,
+                        asset_type=rule.asset_type,
+                        notes=None,
                     )
+                )
         return findings
@@ -0,0 +1,148 @@
+"""Registry of the built-in scanners, imported and loaded on first use."""
+
+from __future__ import annotations
+
+import importlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, FrozenSet, List, Optional
+
+from cbom_scanner.core.models import RawFinding
+from cbom_scanner.core.options import ScanOptions
+from cbom_scanner.core.rules import RuleSet
+from cbom_scanner.scanners.base import LanguageScanner
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from cbom_scanner.core.bundle import RuleBundle
+
+RULES_DIR = Path(__file__).resolve().parents[1] / "rules"
+
+
+@dataclass(frozen=True)
+class ScannerSpec:
+    language: str
+    # Module and class implementing the scanner, imported on first use.
+    module: str
+    class_name: str
+    # Rule file name in ``RULES_DIR``.
+    rules: str
+    # Must match the scanner class's ``suffixes``; routing uses these so the
+    # module need not be imported until a matching file turns up.
+    suffixes: FrozenSet[str]
+    # Further suffixes handled only with ``ScanOptions.include_ts``.
+    ts_suffixes: FrozenSet[str] = frozenset()
+
+    def suffixes_for(self, options: ScanOptions) -> FrozenSet[str]:
+        if options.include_ts:
+            return self.suffixes | self.ts_suffixes
+        return self.suffixes
+
+
+# In report order for findings that share an id.
+SCANNERS = (
+    ScannerSpec(
+        "node",
+        "cbom_scanner.scanners.node",
+        "NodeScanner",
+        "node.yaml",
+        frozenset({".js", ".jsx"}),
+        frozenset({".ts", ".tsx"}),
+    ),
+    ScannerSpec("go", "cbom_scanner.scanners.go", "GoScanner", "go.yaml", frozenset({".go"})),
+    ScannerSpec(
+        "rust", "cbom_scanner.scanners.rust", "RustScanner", "rust.yaml", frozenset({".rs"})
+    ),
+    ScannerSpec(
+        "c",
+        "cbom_scanner.scanners.c",
+        "CScanner",
+        "c.yaml",
+        frozenset({".c", ".h", ".cpp", ".hpp"}),
+    ),
+    ScannerSpec(
+        "python", "cbom_scanner.scanners.python", "PythonScanner", "python.yaml", frozenset({".py"})
+    ),
+    ScannerSpec(
+        "java", "cbom_scanner.scanners.java", "JavaScanner", "java.yaml", frozenset({".java"})
+    ),
+    ScannerSpec(
+        "csharp",
+        "cbom_scanner.scanners.csharp",
+        "CSharpScanner",
+        "csharp.yaml",
+        frozenset({".cs"}),
+    ),
+)
+
+
+class LazyScanner(LanguageScanner):
+    """Stands in for a registered scanner until a file is routed to it.
+
+    Routing only needs the suffixes in the spec; the scanner module is
+    imported and its rules loaded the first time anything else is asked.
+    Pickling sends only the spec (and bundled rules), so pool workers load
+    just the scanners their files need.
+    """
+
+    def __init__(
+        self,
+        spec: ScannerSpec,
+        rules_dir: Path = RULES_DIR,
+        bundled: Optional[RuleSet] = None,
+    ) -> None:
+        self.spec = spec
+        self.rules_dir = rules_dir
+        # Rules from a compiled bundle, used instead of the rule file.
+        self.bundled = bundled
+        self.language = spec.language
+        self._scanner: Optional[LanguageScanner] = None
+        self._lock = threading.Lock()
+
+    def __reduce__(self):
+        return type(self), (self.spec, self.rules_dir, self.bundled)
+
+    @property
+    def loaded(self) -> bool:
+        return self._scanner is not None
+
+    @property
+    def scanner(self) -> LanguageScanner:
+        if self._scanner is None:
+            with self._lock:
+                if self._scanner is None:
+                    module = importlib.import_module(self.spec.module)
+                    scanner_class = getattr(module, self.spec.class_name)
+                    if self.bundled is not None:
+                        self._scanner = scanner_class(self.bundled)
+                    else:
+                        self._scanner = scanner_class(self.rules_dir / self.spec.rules)
+        return self._scanner
+
+    @property
+    def rule_set(self):
+        return getattr(self.scanner, "rule_set", None)
+
+    def suffixes_for(self, options: ScanOptions) -> FrozenSet[str]:
+        return self.spec.suffixes_for(options)
+
+    def fingerprint(self) -> str:
+        return self.scanner.fingerprint()
+
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
+        return self.scanner.scan_source(file, source_text)
+
+    def scan_heuristic(self, file: str, source_text: str) -> List[RawFinding]:
+        return self.scanner.scan_heuristic(file, source_text)
+
+
+def build_scanners(
+    rules_dir: Path = RULES_DIR, bundle: Optional["RuleBundle"] = None
+) -> List[LanguageScanner]:
+    """One scanner per registered language, none of them loaded yet.
+
+    With a ``bundle``, languages it covers take their rules from it.
+    """
+    rule_sets = bundle.rule_sets if bundle is not None else {}
+    return [LazyScanner(spec, rules_dir, rule_sets.get(spec.language)) for spec in SCANNERS]
@@ -2,24 +2,21 @@
 
 from __future__ import annotations
 
-from pathlib import Path
-from typing import Iterable, List
+from typing import List
 
 from cbom_scanner.core.models import RawFinding
-from cbom_scanner.core.orchestrator import ScanOptions
-from cbom_scanner.core.rules import load_rules
+from cbom_scanner.core.rules import RuleSource, resolve_rules
 from cbom_scanner.scanners.base import LanguageScanner
-from cbom_scanner.scanners.common import scan_tree_sitter
+from cbom_scanner.scanners.common import scan_tree_sitter_source
 
 
 class RustScanner(LanguageScanner):
     language = "rust"
+    suffixes = frozenset({".rs"})
+    version = "2"
 
-    def __init__(self, rules_path: Path) -> None:
-        self.rule_set = load_rules(rules_path)
+    def __init__(self, rules: RuleSource) -> None:
+        self.rule_set = resolve_rules(rules)
 
-    def supports(self, path: Path, options: ScanOptions) -> bool:
-        return path.suffix == ".rs"
-
-    def scan(self, files: Iterable[Path]) -> List[RawFinding]:
-        return scan_tree_sitter(files, self.rule_set, "rust")
+    def scan_source(self, file: str, source_text: str) -> List[RawFinding]:
+        return scan_tree_sitter_source(file, source_text, self.rule_set, "rust")
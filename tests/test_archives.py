@@ -0,0 +1,109 @@
+from pathlib import Path
+import io
+import sys
+import tarfile
+import zipfile
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FIXTURES = ROOT / "tests" / "fixtures" / "crypto_zoo"
+
+
+def _zip_bytes(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def _tgz_bytes(members):
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    def fixture(name):
+        return (FIXTURES / name).read_bytes()
+
+    root = tmp_path / "repo"
+    root.mkdir()
+    inner = _zip_bytes({"go_sample.go": fixture("go_sample.go")})
+    (root / "app.jar").write_bytes(
+        _zip_bytes(
+            {
+                "com/example/JavaSample.java": fixture("JavaSample.java"),
+                "com/example/JavaSample.class": b"\xca\xfe\xba\xbe",
+                "lib/inner.zip": inner,
+            }
+        )
+    )
+    (root / "pkg.tgz").write_bytes(
+        _tgz_bytes(
+            {
+                "package/index.js": fixture("node_sample.js"),
+                "package/node_modules/dep/index.js": fixture("node_sample.js"),
+            }
+        )
+    )
+    (root / "broken.zip").write_bytes(b"PK\x03\x04 not really a zip")
+    (root / "plain.py").write_bytes(fixture("python_sample.py"))
+    return root
+
+
+def _scan(root, **discovery):
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.options import DiscoveryOptions, ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+
+    options = ScanOptions(discovery=DiscoveryOptions(**discovery))
+    return Orchestrator(_build_scanners()).scan(root, options)
+
+
+def _located(findings, file):
+    return sorted(
+        (f.evidence.line, f.evidence.column, f.api, f.algorithm, f.evidence.function)
+        for f in findings
+        if f.evidence.file == file
+    )
+
+
+def test_archive_members_are_scanned_in_place(repo):
+    findings = _scan(repo)
+    files = {finding.evidence.file for finding in findings}
+    jar = f"{repo / 'app.jar'}!/com/example/JavaSample.java"
+    nested = f"{repo / 'app.jar'}!/lib/inner.zip!/go_sample.go"
+    tarball = f"{repo / 'pkg.tgz'}!/package/index.js"
+    assert files == {jar, nested, tarball, str(repo / "plain.py")}
+
+    originals = _scan(FIXTURES)
+    for member, name in ((jar, "JavaSample.java"), (nested, "go_sample.go")):
+        assert _located(findings, member) == _located(originals, str(FIXTURES / name))
+    assert _located(findings, tarball) == _located(originals, str(FIXTURES / "node_sample.js"))
+
+
+def test_archive_depth_limits(repo):
+    shallow = {finding.evidence.file for finding in _scan(repo, archive_depth=1)}
+    assert not any("inner.zip" in file for file in shallow)
+    assert any("app.jar!/" in file for file in shallow)
+    disabled = {finding.evidence.file for finding in _scan(repo, archive_depth=0)}
+    assert disabled == {str(repo / "plain.py")}
+
+
+def test_archive_members_in_worker_processes(repo):
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+
+    serial = _scan(repo)
+    assert Orchestrator(_build_scanners()).scan(repo, ScanOptions(jobs=2)) == serial
@@ -0,0 +1,49 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _tree(root):
+    return {
+        path.relative_to(root).as_posix(): path.read_bytes()
+        for path in sorted(root.rglob("*"))
+        if path.is_file()
+    }
+
+
+def test_synthetic_repo_is_deterministic(tmp_path):
+    from benchmarks.synth import SynthConfig, ensure_repo, generate_repo
+
+    config = SynthConfig(files=40, functions=2, statements=5, density=0.3, minified=0.5, seed=7)
+    first = generate_repo(tmp_path / "a", config)
+    second = generate_repo(tmp_path / "b", config)
+    assert _tree(tmp_path / "a") == _tree(tmp_path / "b")
+    assert first == second
+    assert first.files == 40 and first.crypto_calls > 0 and first.minified_files > 0
+    assert ensure_repo(tmp_path / "a", config) == first
+
+
+def test_run_benchmarks_times_each_stage(tmp_path):
+    from benchmarks.stages import compare_results, run_benchmarks
+    from benchmarks.synth import SynthConfig, generate_repo
+
+    config = SynthConfig(files=20, functions=2, statements=4, density=0.5)
+    stats = generate_repo(tmp_path, config)
+    results = run_benchmarks(tmp_path, config, stats, repeat=1)
+    assert set(results["stages"]) == {
+        "discovery",
+        "read",
+        "tree-sitter.parse",
+        "tree-sitter.match",
+        "tree-sitter.normalize",
+        "tree-sitter.serialize",
+        "regex.match",
+        "regex.normalize",
+        "regex.serialize",
+        "end-to-end",
+    }
+    assert results["findings"]["tree-sitter"] == results["findings"]["end-to-end"] > 0
+    assert not any(row[3] for row in compare_results(results, results))
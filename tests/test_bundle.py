@@ -0,0 +1,127 @@
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+GO_ZOO = ROOT / "testdata" / "crypto_zoo" / "go"
+
+_PACK_RULE = {
+    "id": "acme-make-key",
+    "call": "make",
+    "api": "builtin.make",
+    "library": "builtin",
+    "asset_type": "KEY",
+    "confidence": "MED",
+}
+
+
+def _write_pack(directory: Path, calls) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "acme-go.json").write_text(json.dumps({"language": "go", "calls": calls}))
+    return directory
+
+
+def test_bundle_scans_like_rule_files_and_adds_packs(tmp_path):
+    from cbom_scanner.core.bundle import compile_rules, load_bundle, write_bundle
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners.registry import RULES_DIR, build_scanners
+
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    expected = Orchestrator(build_scanners()).scan(GO_ZOO, options)
+
+    write_bundle(compile_rules([RULES_DIR]), tmp_path / "builtin.bundle")
+    bundle = load_bundle(tmp_path / "builtin.bundle")
+    scanners = build_scanners(bundle=bundle)
+    assert Orchestrator(scanners).scan(GO_ZOO, options) == expected
+    # Same rules, same cache keys as the rule files.
+    assert scanners[1].fingerprint() == build_scanners()[1].fingerprint()
+    assert "text_matcher" in vars(bundle.rule_sets["go"])
+
+    pack = _write_pack(tmp_path / "pack", [_PACK_RULE])
+    write_bundle(compile_rules([RULES_DIR, pack]), tmp_path / "acme.bundle")
+    acme = load_bundle(tmp_path / "acme.bundle")
+    assert acme.fingerprint != bundle.fingerprint
+    assert acme.rule_count == bundle.rule_count + 1
+    findings = Orchestrator(build_scanners(bundle=acme)).scan(GO_ZOO, options)
+    assert len(findings) > len(expected)
+    assert {finding.api for finding in findings} - {finding.api for finding in expected} == {
+        "builtin.make"
+    }
+
+
+def test_compile_reports_every_problem_and_load_checks_version(tmp_path):
+    from cbom_scanner.core.bundle import BundleError, compile_rules, load_bundle, write_bundle
+    from cbom_scanner.scanners.registry import RULES_DIR
+
+    bad = dict(_PACK_RULE, id="go-aes-newcipher", severity="high")
+    broken = dict(_PACK_RULE, id="acme-broken", arg_indexes={"algorithm": -1})
+    pack = _write_pack(tmp_path / "pack", [bad, broken])
+    with pytest.raises(BundleError) as error:
+        compile_rules([RULES_DIR, pack])
+    message = str(error.value)
+    assert "unknown field 'severity'" in message
+    assert "arg_indexes.algorithm must be a non-negative integer" in message
+
+    pack = _write_pack(tmp_path / "pack", [dict(_PACK_RULE, id="go-aes-newcipher")])
+    with pytest.raises(BundleError, match="already defined"):
+        compile_rules([RULES_DIR, pack])
+
+    path = tmp_path / "rules.bundle"
+    write_bundle(compile_rules([RULES_DIR]), path)
+    magic, header, payload = path.read_bytes().split(b"\n", 2)
+    header = header.replace(b'"version": "', b'"version": "0')
+    path.write_bytes(b"\n".join([magic, header, payload]))
+    with pytest.raises(BundleError, match="rules compile"):
+        load_bundle(path)
+    (tmp_path / "notes.txt").write_text("not a bundle\n")
+    with pytest.raises(BundleError, match="not a rule bundle"):
+        load_bundle(tmp_path / "notes.txt")
+
+
+def test_load_treats_the_body_as_untrusted_data(tmp_path):
+    import pickle
+
+    from cbom_scanner.core.bundle import BundleError, compile_rules, load_bundle, write_bundle
+    from cbom_scanner.scanners.registry import RULES_DIR
+
+    path = tmp_path / "rules.bundle"
+    write_bundle(compile_rules([RULES_DIR]), path)
+    magic, header, body = path.read_bytes().split(b"\n", 2)
+
+    def load(payload):
+        path.write_bytes(b"\n".join([magic, header, payload]))
+        return load_bundle(path)
+
+    assert load(body).rule_count > 0
+    # A pickle is never unpickled, so it cannot run code on load.
+    with pytest.raises(BundleError, match="corrupt"):
+        load(pickle.dumps(print))
+    data = json.loads(body)
+    rule = data["go"]["rules"]["calls"][0]
+    for changed in (dict(rule, severity="high"), dict(rule, arg_indexes={"algorithm": -1})):
+        data["go"]["rules"]["calls"][0] = changed
+        with pytest.raises(BundleError, match="rule"):
+            load(json.dumps(data).encode("utf-8"))
+    # Valid rules that differ from what was compiled do not match the fingerprint.
+    data["go"]["rules"]["calls"][0] = dict(rule, algorithm="DES")
+    with pytest.raises(BundleError, match="fingerprint"):
+        load(json.dumps(data).encode("utf-8"))
+    data["go"]["rules"]["calls"][0] = rule
+    index = data["go"]["textIndex"]
+    assert index["pattern"]
+    # A pattern that would miss calls, match non-calls or not compile at all.
+    for pattern in (index["pattern"][: len(index["pattern"]) // 2], "crypto", "(?:"):
+        data["go"]["textIndex"] = dict(index, pattern=pattern)
+        with pytest.raises(BundleError, match="fingerprint"):
+            load(json.dumps(data).encode("utf-8"))
+    data["go"]["textIndex"] = index
+    assert load(json.dumps(data).encode("utf-8")).rule_count > 0
+    index["prefixes"].popitem()
+    with pytest.raises(BundleError, match="matcher index"):
+        load(json.dumps(data).encode("utf-8"))
@@ -0,0 +1,116 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _go_orchestrator():
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners import GoScanner
+
+    rules_dir = ROOT / "cbom_scanner" / "rules"
+    return Orchestrator([GoScanner(rules_dir / "go.yaml")])
+
+
+def test_cache_hit_skips_scanning(tmp_path, monkeypatch):
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.scanners.go import GoScanner
+
+    fixture_path = ROOT / "testdata" / "crypto_zoo" / "go"
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    first = _go_orchestrator().scan(fixture_path, options)
+    assert first
+
+    def fail(self, file, source_text):
+        raise AssertionError("cached file was rescanned")
+
+    monkeypatch.setattr(GoScanner, "scan_source", fail)
+    assert _go_orchestrator().scan(fixture_path, options) == first
+
+
+def test_cache_is_content_addressed_and_evicts(tmp_path):
+    from cbom_scanner.core.cache import ScanCache
+    from cbom_scanner.core.options import ScanOptions
+
+    source = (ROOT / "testdata" / "crypto_zoo" / "go" / "go_sample.go").read_text()
+    for name in ("a", "b"):
+        (tmp_path / "repo" / name).mkdir(parents=True)
+        (tmp_path / "repo" / name / "main.go").write_text(source)
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    findings = _go_orchestrator().scan(tmp_path / "repo", options)
+    assert {Path(finding.evidence.file).parent.name for finding in findings} == {"a", "b"}
+    assert len(list((tmp_path / "cache").glob("*/*.json"))) == 1
+
+    cache = ScanCache(tmp_path / "cache", max_bytes=0)
+    assert cache.evict() == 1
+    assert not list((tmp_path / "cache").glob("*/*.json"))
+
+
+def test_eviction_walks_the_cache_only_after_writes(tmp_path, monkeypatch):
+    from cbom_scanner.core.cache import ScanCache
+    from cbom_scanner.core.options import ScanOptions
+
+    fixture_path = ROOT / "testdata" / "crypto_zoo" / "go"
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    passes = []
+    evict = ScanCache.evict
+
+    def counted(self):
+        passes.append(self.written)
+        return evict(self)
+
+    monkeypatch.setattr(ScanCache, "evict", counted)
+    parallel = ScanOptions(cache_dir=tmp_path / "parallel", jobs=2)
+    for scan_options in (options, parallel):
+        _go_orchestrator().scan(fixture_path, scan_options)
+    # Workers report what they wrote, so both scans found new bytes to evict.
+    assert len(passes) == 2 and all(passes)
+    for scan_options in (options, parallel):
+        _go_orchestrator().scan(fixture_path, scan_options)
+    assert len(passes) == 2
+
+    # A long-lived cache remembers its size and skips passes while there is room.
+    cache = ScanCache(tmp_path / "daemon", max_bytes=1 << 20)
+    cache.put("a" * 64, [])
+    assert cache.trim() == 0 and len(passes) == 3
+    cache.put("b" * 64, [])
+    assert cache.trim() == 0 and len(passes) == 3
+    cache.max_bytes = 2
+    cache.put("c" * 64, [])
+    assert cache.trim() == 2 and len(passes) == 4
+
+
+def test_malformed_entries_are_misses(tmp_path):
+    from cbom_scanner.core.options import ScanOptions
+
+    fixture_path = ROOT / "testdata" / "crypto_zoo" / "go"
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    first = _go_orchestrator().scan(fixture_path, options)
+    entries = list((tmp_path / "cache").glob("*/*.json"))
+    assert entries
+    for payload in ('{"id": "x"}', '[{"id": "x"}]', "[1]", "not json"):
+        for entry in entries:
+            entry.write_text(payload, encoding="utf-8")
+        assert _go_orchestrator().scan(fixture_path, options) == first
+
+
+def test_minified_name_is_part_of_the_key(tmp_path):
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners.registry import build_scanners
+
+    source = (ROOT / "testdata" / "crypto_zoo" / "node" / "node_sample.js").read_bytes()
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    (repo / "app.js").write_bytes(source)
+    (repo / "app.min.js").write_bytes(source)
+    uncached = Orchestrator(build_scanners()).scan(repo, ScanOptions())
+    notes = {Path(finding.evidence.file).name: finding.notes for finding in uncached}
+    assert notes["app.min.js"] and "minified" in notes["app.min.js"]
+    assert notes["app.js"] is None
+
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    for _ in range(2):
+        assert Orchestrator(build_scanners()).scan(repo, options) == uncached
@@ -0,0 +1,125 @@
+from dataclasses import replace
+from pathlib import Path
+import json
+import random
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+@pytest.fixture()
+def findings():
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+
+    orchestrator = Orchestrator(_build_scanners())
+    return orchestrator.scan(ROOT / "tests" / "fixtures" / "crypto_zoo", ScanOptions())
+
+
+@pytest.mark.parametrize("module_name", ["cbom", "cyclonedx"])
+def test_streaming_reader_matches_load_report(tmp_path, monkeypatch, findings, module_name):
+    import importlib
+
+    from cbom_scanner.formats import jsonstream
+    from cbom_scanner.formats.reader import iter_findings, load_report
+
+    module = importlib.import_module(f"cbom_scanner.formats.{module_name}")
+    path = tmp_path / "report.json"
+    getattr(module, f"write_{module_name}")(path, "zoo", findings)
+    monkeypatch.setattr(jsonstream, "_CHUNK_CHARS", 7)
+    assert list(iter_findings(path)) == load_report(path).findings == findings
+
+
+def test_diff_findings_with_external_sort(findings):
+    from cbom_scanner.core.diff import ADDED, CHANGED, REMOVED, DiffSummary, diff_findings
+
+    removed, changed, *rest = findings
+    moved = replace(changed, key_size_bits="4096")
+    added = replace(rest[0], id="f" * 64)
+    # Two matches on one line share an id; the second is new.
+    duplicate = replace(rest[1], evidence=replace(rest[1].evidence, column=99))
+    new = [moved, *rest, added, duplicate]
+    random.Random(0).shuffle(new)
+
+    summary = DiffSummary()
+    changes = list(diff_findings(findings, new, summary))
+    spilled = DiffSummary()
+    assert list(diff_findings(iter(findings), new, spilled, run_size=2)) == changes
+    assert spilled == summary
+
+    kinds = {(change.kind, change.finding.id) for change in changes}
+    assert kinds == {
+        (REMOVED, removed.id),
+        (CHANGED, moved.id),
+        (ADDED, added.id),
+        (ADDED, duplicate.id),
+    }
+    assert [change.fields for change in changes if change.kind == CHANGED] == [("keySizeBits",)]
+    assert (summary.added, summary.removed, summary.changed) == (2, 1, 1)
+    assert summary.unchanged == len(rest)
+    group = summary.groups[(moved.algorithm, moved.mode, "4096")]
+    assert (group.old, group.new, group.changed) == (0, 1, 1)
+
+
+def test_diff_command_gates_on_changes(tmp_path, findings):
+    from cbom_scanner import cli
+    from cbom_scanner.formats.cbom import write_cbom
+    from cbom_scanner.formats.cyclonedx import write_cyclonedx
+
+    old, new = tmp_path / "old.json", tmp_path / "new.json"
+    write_cbom(old, "zoo", findings[1:])
+    write_cyclonedx(new, "zoo", findings)
+    added = findings[0].algorithm
+    out = tmp_path / "diff.json"
+
+    assert cli.main(["diff", str(old), str(new), "--format", "json", "--out", str(out)]) == 0
+    report = json.loads(out.read_text(encoding="utf-8"))
+    assert report["summary"] == {
+        "added": 1,
+        "removed": 0,
+        "changed": 0,
+        "unchanged": len(findings) - 1,
+    }
+    assert [change["id"] for change in report["changes"]] == [findings[0].id]
+    assert sum(group["new"] for group in report["groups"]) == len(findings)
+
+    args = ["diff", str(old), str(new), "--out", str(tmp_path / "diff.txt"), "--fail-on", "added"]
+    assert cli.main(args) == 1
+    assert cli.main([*args, "--fail-algorithm", added.lower()]) == 1
+    assert cli.main([*args, "--fail-algorithm", "NO-SUCH"]) == 0
+    text = (tmp_path / "diff.txt").read_text(encoding="utf-8")
+    assert text.startswith(f"+ {added} ")
+    assert text.endswith(f"1 added, 0 removed, 0 changed, {len(findings) - 1} unchanged\n")
+    reverse = ["diff", str(new), str(old), "--out", str(out), "--fail-on", "added"]
+    assert cli.main(reverse) == 0
+
+
+def test_diff_refuses_files_that_are_not_reports(tmp_path, findings, capsys):
+    from cbom_scanner import cli
+    from cbom_scanner.formats.cbom import write_cbom
+    from cbom_scanner.formats.ndjson import write_ndjson
+
+    old = tmp_path / "old.json"
+    write_cbom(old, "zoo", findings[1:])
+    write_ndjson(tmp_path / "new.ndjson", "zoo", findings)
+    truncated = old.read_text(encoding="utf-8")
+    others = {
+        "new.ndjson": None,
+        "other.json": '{"foo": 1}',
+        "no-assets.json": '{"cbomVersion": "1.0", "component": "zoo"}',
+        "no-id.json": '{"cbomVersion": "1.0", "cryptoAssets": [{"algorithm": "AES"}]}',
+        "truncated.json": truncated[: len(truncated) // 2],
+    }
+    for name, text in others.items():
+        new = tmp_path / name
+        if text is not None:
+            new.write_text(text, encoding="utf-8")
+        args = ["diff", str(old), str(new), "--out", str(tmp_path / "diff.txt")]
+        # A gate must fail, not pass, on a file it cannot read as a report.
+        assert cli.main([*args, "--fail-on", "added"]) == 2, name
+        assert capsys.readouterr().err.startswith("error: ")
@@ -0,0 +1,62 @@
+from pathlib import Path
+import os
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _touch(root: Path, relative: str, content: str = "") -> None:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+
+
+def _relative(root: Path, files) -> list:
+    return [path.relative_to(root).as_posix() for path in files]
+
+
+def test_default_excludes_and_order(tmp_path):
+    from cbom_scanner.core.discovery import iter_files
+
+    for name in ("b.go", "a/z.c", "a.py", "node_modules/x.js", ".git/config", "vendor/v.go"):
+        _touch(tmp_path, name)
+    assert _relative(tmp_path, iter_files(tmp_path)) == ["a/z.c", "a.py", "b.go"]
+
+
+def test_ignore_files(tmp_path):
+    from cbom_scanner.core.discovery import iter_files
+
+    _touch(tmp_path, ".gitignore", "*.log\n/generated/\n!keep.log\n")
+    _touch(tmp_path, "src/.cbomignore", "fixtures/\n")
+    for name in ("app.log", "keep.log", "generated/g.c", "src/generated/ok.c", "src/fixtures/f.c", "src/m.c"):
+        _touch(tmp_path, name)
+    assert _relative(tmp_path, iter_files(tmp_path)) == [
+        ".gitignore",
+        "keep.log",
+        "src/.cbomignore",
+        "src/generated/ok.c",
+        "src/m.c",
+    ]
+
+
+def test_size_and_depth_limits(tmp_path):
+    from cbom_scanner.core.discovery import iter_files
+    from cbom_scanner.core.options import DiscoveryOptions
+
+    _touch(tmp_path, "small.c", "x")
+    _touch(tmp_path, "big.c", "x" * 100)
+    _touch(tmp_path, "a/b/deep.c", "x")
+    options = DiscoveryOptions(max_file_size=10, max_depth=1)
+    assert _relative(tmp_path, iter_files(tmp_path, options)) == ["small.c"]
+
+
+def test_symlink_loop_is_skipped(tmp_path):
+    from cbom_scanner.core.discovery import iter_files
+    from cbom_scanner.core.options import DiscoveryOptions
+
+    _touch(tmp_path, "pkg/main.go")
+    os.symlink(tmp_path, tmp_path / "pkg" / "loop")
+    options = DiscoveryOptions(follow_symlinks=True)
+    assert _relative(tmp_path, iter_files(tmp_path, options)) == ["pkg/main.go"]
@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import json
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+class _FixedDatetime:
+    @staticmethod
+    def now(tz=None):
+        return datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def findings():
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners import GoScanner, JavaScanner
+
+    rules_dir = ROOT / "cbom_scanner" / "rules"
+    orchestrator = Orchestrator(
+        [GoScanner(rules_dir / "go.yaml"), JavaScanner(rules_dir / "java.yaml")]
+    )
+    return orchestrator.scan(ROOT / "tests" / "fixtures" / "crypto_zoo", ScanOptions())
+
+
+@pytest.mark.parametrize("module_name", ["cbom", "cyclonedx"])
+def test_streaming_writer_matches_json_dumps(tmp_path, monkeypatch, findings, module_name):
+    import importlib
+
+    module = importlib.import_module(f"cbom_scanner.formats.{module_name}")
+    monkeypatch.setattr(module, "datetime", _FixedDatetime)
+    build = getattr(module, f"build_{module_name}")
+    write = getattr(module, f"write_{module_name}")
+    for subset in (findings, []):
+        out_path = tmp_path / "out.json"
+        write(out_path, "zoo", iter(subset))
+        expected = json.dumps(build("zoo", subset), indent=2, sort_keys=True)
+        assert out_path.read_text() == expected
+
+
+def test_ndjson_output(tmp_path, findings):
+    from cbom_scanner.formats.cbom import finding_from_payload
+    from cbom_scanner.formats.ndjson import write_ndjson
+
+    out_path = tmp_path / "out.ndjson"
+    write_ndjson(out_path, "zoo", findings)
+    payloads = [json.loads(line) for line in out_path.read_text().splitlines()]
+    assert [finding_from_payload(payload) for payload in payloads] == findings
+    assert {payload["component"] for payload in payloads} == {"zoo"}
@@ -0,0 +1,95 @@
+from pathlib import Path
+import json
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ZOO = ROOT / "testdata" / "crypto_zoo"
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+@pytest.fixture()
+def orchestrator():
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners import (
+        CScanner,
+        CSharpScanner,
+        GoScanner,
+        JavaScanner,
+        NodeScanner,
+        PythonScanner,
+        RustScanner,
+    )
+
+    rules_dir = ROOT / "cbom_scanner" / "rules"
+    return Orchestrator(
+        [
+            NodeScanner(rules_dir / "node.yaml"),
+            GoScanner(rules_dir / "go.yaml"),
+            RustScanner(rules_dir / "rust.yaml"),
+            CScanner(rules_dir / "c.yaml"),
+            PythonScanner(rules_dir / "python.yaml"),
+            JavaScanner(rules_dir / "java.yaml"),
+            CSharpScanner(rules_dir / "csharp.yaml"),
+        ]
+    )
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def test_scan_changes_matches_full_scan(tmp_path, orchestrator):
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.formats.cbom import build_cbom
+    from cbom_scanner.formats.reader import parse_report
+
+    repo = tmp_path / "repo"
+    shutil.copytree(ZOO, repo)
+    shutil.copy(ROOT / "tests" / "fixtures" / "crypto_zoo" / "python_sample.py", repo / "keep.py")
+    _git(repo, "init", "-q")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "base")
+    options = ScanOptions(include_ts=True)
+    baseline = parse_report(build_cbom("repo", orchestrator.scan(repo, options))).findings
+
+    (repo / "go" / "go_sample.go").unlink()
+    _git(repo, "mv", "node/node_sample.js", "node/renamed.js")
+    c_file = repo / "c" / "openssl_sample.c"
+    c_file.write_text(c_file.read_text().replace("2048", "4096"))
+    shutil.copy(ROOT / "tests" / "fixtures" / "crypto_zoo" / "go_sample.go", repo / "new.go")
+
+    updated = orchestrator.scan_changes(repo, "HEAD", baseline, options)
+    assert updated == orchestrator.scan(repo, options)
+    assert any(finding.evidence.file.endswith("keep.py") for finding in updated)
+
+
+def test_scan_rejects_unreadable_baseline(tmp_path, capsys):
+    from cbom_scanner import cli
+
+    args = ["scan", str(ZOO), "--since", "HEAD", "--baseline"]
+    assert cli.main([*args, str(tmp_path / "missing.json")]) == 2
+    (tmp_path / "bad.json").write_text("{not json")
+    assert cli.main([*args, str(tmp_path / "bad.json")]) == 2
+    assert capsys.readouterr().err.startswith("error: ")
+    reports = {
+        "no-id.json": {"cbomVersion": "1.0", "cryptoAssets": [{"algorithm": "AES"}]},
+        "not-an-asset.json": {"cbomVersion": "1.0", "cryptoAssets": ["AES"]},
+        "no-ref.json": {"bomFormat": "CycloneDX", "components": [{"name": "AES"}]},
+    }
+    for name, report in reports.items():
+        (tmp_path / name).write_text(json.dumps(report))
+        assert cli.main([*args, str(tmp_path / name)]) == 2
+        assert capsys.readouterr().err.startswith(f"error: {tmp_path / name}: ")
@@ -0,0 +1,65 @@
+from pathlib import Path
+import json
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def test_hooks_are_inert_without_a_recorder():
+    from cbom_scanner.core import instrument
+
+    assert instrument.active() is None
+    assert instrument.stage("parse") is instrument.stage("match")
+    items = [1, 2]
+    assert instrument.timed("discovery", items) is items
+
+
+def test_stage_times_are_exclusive():
+    from cbom_scanner.core import instrument
+
+    recorder = instrument.Recorder()
+    with instrument.recording(recorder):
+        with instrument.stage("write"):
+            for _ in instrument.timed("discovery", range(3)):
+                with instrument.stage("parse"):
+                    pass
+    report = recorder.report()
+    stages = report["stages"]
+    assert stages["discovery"]["calls"] == 4
+    assert stages["parse"]["calls"] == 3 and stages["write"]["calls"] == 1
+    assert sum(stage["wallSeconds"] for stage in stages.values()) <= report["wallSeconds"]
+    assert instrument.active() is None
+
+
+def test_scan_profile_reports_stages_scanners_and_files(tmp_path):
+    from cbom_scanner.cli import main
+
+    fixture_path = ROOT / "testdata" / "crypto_zoo"
+    profile = tmp_path / "profile.json"
+    status = main(
+        [
+            "scan",
+            str(fixture_path),
+            "--jobs",
+            "1",
+            "--no-cache",
+            "--out",
+            str(tmp_path / "cbom.json"),
+            "--profile",
+            str(profile),
+            "--slowest",
+            "2",
+        ]
+    )
+    assert status == 0
+    report = json.loads(profile.read_text(encoding="utf-8"))
+    assert {"discovery", "read", "parse", "match", "normalize", "sort", "write"} <= set(
+        report["stages"]
+    )
+    assert set(report["scanners"]) == {"c", "go", "node"}
+    sizes = [path.stat().st_size for path in fixture_path.rglob("*") if path.is_file()]
+    assert report["files"] == 3 and report["bytes"] == sum(sizes)
+    assert len(report["slowestFiles"]) == 2
+    assert report["slowestFiles"][0]["wallSeconds"] >= report["slowestFiles"][1]["wallSeconds"]
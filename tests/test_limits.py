@@ -0,0 +1,92 @@
+from pathlib import Path
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def _orchestrator():
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.orchestrator import Orchestrator
+
+    return Orchestrator(_build_scanners())
+
+
+def _write_samples(root):
+    statements = ";".join(f"var a{i}=f({i})" for i in range(3000))
+    (root / "bundle.js").write_text(
+        statements + ";crypto.createHash('sha256');" + statements + "\n", encoding="utf-8"
+    )
+    (root / "gen.go").write_text(
+        "// Code generated by protoc-gen-go. DO NOT EDIT.\n"
+        "package x\n\nfunc F() { aes.NewCipher(key) }\n",
+        encoding="utf-8",
+    )
+    (root / "plain.py").write_text("import hashlib\nhashlib.sha256(b'')\n", encoding="utf-8")
+
+
+def test_minified_generated_and_snippet_limits(tmp_path):
+    from cbom_scanner.core.options import ScanOptions, SourceLimits
+
+    _write_samples(tmp_path)
+    limits = SourceLimits(snippet_chars=60)
+    findings = {
+        Path(finding.evidence.file).name: finding
+        for finding in _orchestrator().scan(tmp_path, ScanOptions(limits=limits))
+    }
+    bundle = findings["bundle.js"]
+    assert bundle.notes == "heuristic; minified; snippet truncated"
+    assert len(bundle.evidence.snippet) <= 60
+    assert "crypto.createHash('sha256')" in bundle.evidence.snippet
+    assert findings["gen.go"].notes == "generated"
+    assert findings["plain.py"].notes is None
+
+    skipped = _orchestrator().scan(
+        tmp_path, ScanOptions(limits=SourceLimits(skip_generated=True))
+    )
+    assert [Path(finding.evidence.file).name for finding in skipped] == ["plain.py"]
+
+
+def test_parse_limit_and_mmap_reads(tmp_path, monkeypatch):
+    from cbom_scanner.core import limits
+    from cbom_scanner.core.options import ScanOptions, SourceLimits
+
+    _write_samples(tmp_path)
+    options = ScanOptions(limits=SourceLimits(parse_limit=10))
+    expected = _orchestrator().scan(tmp_path, options)
+    by_name = {Path(finding.evidence.file).name: finding for finding in expected}
+    assert by_name["plain.py"].notes == "heuristic; large file"
+    assert by_name["gen.go"].notes == "heuristic; large file; generated"
+
+    monkeypatch.setattr(limits, "MMAP_THRESHOLD", 0)
+    assert _orchestrator().scan(tmp_path, options) == expected
+
+
+def test_heuristic_windows_match_whole_file_scan(tmp_path):
+    from dataclasses import replace
+
+    from cbom_scanner.core.rules import load_rules
+    from cbom_scanner.core.utils import decode_source, iter_source_windows
+    from cbom_scanner.scanners.common import scan_regex_source
+
+    rule_set = load_rules(ROOT / "cbom_scanner" / "rules" / "node.yaml")
+    line = "x = crypto.createHash('sha256'); é\r\n"
+    data = (
+        (line * 5)
+        + "a\x0bcrypto.createCipheriv('aes-128-cbc') b\r"
+        + "z" * 300
+        + " crypto.randomBytes(16)\n"
+        + line
+    ).encode("utf-8") + b"\xff tail crypto.createHash('md5')"
+    expected = scan_regex_source("f.js", decode_source(data), rule_set)
+    assert len(expected) == 8
+    for window in (1, 7, 64, len(data)):
+        windows = list(iter_source_windows(data, window))
+        assert "".join(text for _, text in windows) == decode_source(data)
+        found = [
+            replace(finding, line=finding.line + before)
+            for before, text in windows
+            for finding in scan_regex_source("f.js", text, rule_set)
+        ]
+        assert found == expected
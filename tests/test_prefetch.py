@@ -0,0 +1,61 @@
+from pathlib import Path
+import sys
+import threading
+import time
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+
+def test_prefetch_keeps_order_and_bounds_reads(tmp_path, monkeypatch):
+    from cbom_scanner.core import prefetch
+    from cbom_scanner.core.sources import MemorySource
+
+    files = []
+    for number in range(24):
+        path = tmp_path / f"f{number:02d}.go"
+        path.write_bytes(b"x" * (2000 if number == 5 else number))
+        files.append(path)
+    member = MemorySource("bundle.jar!/a.go", b"member")
+    missing = tmp_path / "missing.go"
+
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    read = prefetch._read
+
+    def slow_read(path, limit):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return read(path, limit)
+
+    monkeypatch.setattr(prefetch, "_read", slow_read)
+    # Two threads read ahead 8 files of at most 1024 bytes each.
+    sources = [*files[:3], member, missing, *files[3:]]
+    out = list(prefetch.prefetch_sources(sources, threads=2, budget=8192))
+    assert [str(source) for source in out] == [str(source) for source in sources]
+    assert 1 < peak <= 2
+    for source, result in zip(sources, out):
+        if source in (member, missing, files[5]):
+            # Archive members are already in memory; files that fail to read,
+            # or exceed their share of the budget, are left to the scanner.
+            assert result is source
+        else:
+            assert result.origin == source and result.data == source.read_bytes()
+
+
+def test_prefetched_scan_matches_direct_scan(tmp_path):
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners.registry import build_scanners
+
+    zoo = ROOT / "tests" / "fixtures" / "crypto_zoo"
+    direct = Orchestrator(build_scanners()).scan(zoo, ScanOptions(include_ts=True))
+    options = ScanOptions(include_ts=True, prefetch_threads=3, prefetch_bytes=1 << 20)
+    assert Orchestrator(build_scanners()).scan(zoo, options) == direct
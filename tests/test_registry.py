@@ -0,0 +1,73 @@
+from pathlib import Path
+import pickle
+import subprocess
+import sys
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ZOO = ROOT / "testdata" / "crypto_zoo"
+
+# Modules that must not load just to start the CLI: every scanner module, the
+# parsers, the daemon's HTTP stack and the process pool.
+_STARTUP_EXCLUDED = (
+    "cbom_scanner.scanners.c",
+    "cbom_scanner.scanners.csharp",
+    "cbom_scanner.scanners.go",
+    "cbom_scanner.scanners.java",
+    "cbom_scanner.scanners.node",
+    "cbom_scanner.scanners.python",
+    "cbom_scanner.scanners.rust",
+    "cbom_scanner.core.server",
+    "tree_sitter",
+    "tree_sitter_languages",
+    "http.server",
+    "concurrent.futures",
+    "multiprocessing",
+)
+
+
+def test_cli_startup_stays_within_import_budget():
+    code = (
+        "import sys\n"
+        "from cbom_scanner.cli import build_parser\n"
+        "build_parser().parse_args(['scan', '.'])\n"
+        "print('\\n'.join(sys.modules))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, check=True, capture_output=True, text=True
+    )
+    loaded = set(completed.stdout.split())
+    assert not loaded & set(_STARTUP_EXCLUDED)
+
+
+def test_scanners_load_only_for_routed_files():
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.scanners import GoScanner
+    from cbom_scanner.scanners.registry import RULES_DIR, build_scanners
+
+    scanners = build_scanners()
+    findings = Orchestrator(scanners).scan(ZOO / "go", ScanOptions())
+    assert [scanner.language for scanner in scanners if scanner.loaded] == ["go"]
+    assert findings == Orchestrator([GoScanner(RULES_DIR / "go.yaml")]).scan(
+        ZOO / "go", ScanOptions()
+    )
+
+    # Pool workers get the spec only and load what their files need.
+    copy = pickle.loads(pickle.dumps(scanners[1]))
+    assert copy.spec == scanners[1].spec and not copy.loaded
+    assert copy.fingerprint() == scanners[1].fingerprint()
+
+
+def test_registry_suffixes_match_scanner_classes():
+    import importlib
+
+    from cbom_scanner.scanners.registry import SCANNERS
+
+    for spec in SCANNERS:
+        scanner_class = getattr(importlib.import_module(spec.module), spec.class_name)
+        assert scanner_class.language == spec.language
+        assert scanner_class.suffixes == spec.suffixes
+        assert getattr(scanner_class, "ts_suffixes", frozenset()) == spec.ts_suffixes
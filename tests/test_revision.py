@@ -0,0 +1,112 @@
+from pathlib import Path
+import shutil
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ZOO = ROOT / "testdata" / "crypto_zoo"
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is required")
+
+
+def _orchestrator():
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.scanners import CScanner, GoScanner, NodeScanner
+
+    rules_dir = ROOT / "cbom_scanner" / "rules"
+    return Orchestrator(
+        [
+            NodeScanner(rules_dir / "node.yaml"),
+            GoScanner(rules_dir / "go.yaml"),
+            CScanner(rules_dir / "c.yaml"),
+        ]
+    )
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        stdout=subprocess.DEVNULL,
+    )
+
+
+def _committed_zoo(tmp_path: Path) -> Path:
+    repo = tmp_path / "repo"
+    shutil.copytree(ZOO, repo)
+    (repo / "ignored").mkdir()
+    shutil.copy(ZOO / "go" / "go_sample.go", repo / "ignored" / "skip.go")
+    (repo / ".gitignore").write_text("")
+    (repo / "c" / ".cbomignore").write_text("skip_*.c\n")
+    shutil.copy(ZOO / "c" / "openssl_sample.c", repo / "c" / "skip_me.c")
+    with zipfile.ZipFile(repo / "bundle.jar", "w") as archive:
+        archive.write(ZOO / "go" / "go_sample.go", "src/main.go")
+    _git(repo, "init", "-q")
+    _git(repo, "add", "-A")
+    # Ignored only after the commit, so the tracked file is in the tree.
+    (repo / ".gitignore").write_text("ignored/\n")
+    _git(repo, "add", "-A")
+    _git(repo, "commit", "-qm", "base")
+    return repo
+
+
+def test_revision_scan_matches_checkout_scan(tmp_path):
+    from cbom_scanner.core.options import ScanOptions
+
+    repo = _committed_zoo(tmp_path)
+    orchestrator = _orchestrator()
+    options = ScanOptions()
+    expected = orchestrator.scan(repo, options)
+    files = {Path(finding.evidence.file).name for finding in expected}
+    assert "skip_me.c" not in files and "skip.go" not in files
+    assert any("bundle.jar!/" in finding.evidence.file for finding in expected)
+
+    (repo / "go" / "go_sample.go").unlink()
+    c_file = repo / "c" / "openssl_sample.c"
+    c_file.write_text(c_file.read_text().replace("2048", "4096"))
+    (repo / ".gitignore").write_text("c/\n")
+    shutil.copy(ZOO / "go" / "go_sample.go", repo / "new.go")
+
+    scanned = list(orchestrator.iter_scan_revision(repo, "HEAD", options, ordered=True))
+    assert scanned == expected
+
+
+def test_revision_scan_caches_by_blob_id(tmp_path, monkeypatch):
+    from cbom_scanner.core import cache
+    from cbom_scanner.core.git import GitError
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.scanners.go import GoScanner
+
+    repo = _committed_zoo(tmp_path)
+    options = ScanOptions(cache_dir=tmp_path / "cache")
+    first = list(_orchestrator().iter_scan_revision(repo, "HEAD", options, ordered=True))
+    assert first
+
+    def fail(self, file, source_text):
+        raise AssertionError("cached blob was rescanned")
+
+    hashed = []
+    sha256 = cache.hashlib.sha256
+
+    def record(data):
+        hashed.append(data)
+        return sha256(data)
+
+    monkeypatch.setattr(GoScanner, "scan_source", fail)
+    monkeypatch.setattr(cache.hashlib, "sha256", record)
+    again = list(_orchestrator().iter_scan_revision(repo, "HEAD", options, ordered=True))
+    assert again == first
+    # Archive members have no blob of their own and are still hashed.
+    assert (ZOO / "go" / "go_sample.go").read_bytes() in hashed
+    for tracked in (ZOO / "c" / "openssl_sample.c", ZOO / "node" / "node_sample.js"):
+        assert tracked.read_bytes() not in hashed
+
+    with pytest.raises(GitError):
+        _orchestrator().iter_scan_revision(repo, "no-such-rev", options)
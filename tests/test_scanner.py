@@ -68,3 +68,196 @@ def test_cyclonedx_output(orchestrator):
     assert payload["bomFormat"] == "CycloneDX"
     assert payload["specVersion"] == "1.5"
     assert payload["components"]
+
+
+def test_parallel_scan_matches_serial(orchestrator):
+    from cbom_scanner.core.options import ScanOptions
+
+    fixture_path = Path(__file__).parents[1] / "testdata" / "crypto_zoo"
+    serial = orchestrator.scan(fixture_path, ScanOptions(include_ts=True))
+    parallel = orchestrator.scan(fixture_path, ScanOptions(include_ts=True, jobs=2))
+    assert parallel == serial
+
+
+def test_dispatch_table_routes_by_suffix(orchestrator):
+    from cbom_scanner.core.dispatch import DispatchTable
+    from cbom_scanner.core.options import ScanOptions
+
+    names = [scanner.language for scanner in orchestrator.scanners]
+    table = DispatchTable(orchestrator.scanners, ScanOptions())
+    assert [names[i] for i in table.route(Path("a/b.cpp"))] == ["c"]
+    assert [names[i] for i in table.route(Path("app.js"))] == ["node"]
+    assert table.route(Path("app.ts")) == ()
+    assert table.route(Path("README.md")) == ()
+    ts_table = DispatchTable(orchestrator.scanners, ScanOptions(include_ts=True))
+    assert [names[i] for i in ts_table.route(Path("app.ts"))] == ["node"]
+
+
+def test_parser_pool_reuses_parsers(tmp_path):
+    from cbom_scanner.core.utils import collect_call_sites, parser_pool
+
+    pool = parser_pool()
+    list(collect_call_sites("f(1)\n", "python", call_node_type="call"))
+    before = pool.stats()
+    for _ in range(3):
+        list(collect_call_sites("g(2)\n", "python", call_node_type="call"))
+    after = pool.stats()
+    assert after["misses"] == before["misses"]
+    assert after["hits"] == before["hits"] + 3
+
+
+def test_collect_call_sites_query_order_and_lazy_args():
+    from cbom_scanner.core.utils import _UNRESOLVED, collect_call_sites
+
+    source = "def f():\n    outer(inner('a'), 2)\n    last('b')\n"
+    sites = list(collect_call_sites(source, "python", call_node_type="call"))
+    assert [site.function for site in sites] == ["last", "outer", "inner"]
+    assert sites[1]._args is _UNRESOLVED
+    assert sites[1].args == ["inner('a')", "2"]
+    assert sites[2].snippet == "    outer(inner('a'), 2)"
+    assert (sites[2].line, sites[2].column) == (2, 11)
+
+
+def test_call_matcher_matches_endswith_semantics():
+    from cbom_scanner.core.rules import load_rule_sets
+
+    rules_dir = Path(__file__).parents[1] / "cbom_scanner" / "rules"
+    for rule_set in load_rule_sets(rules_dir).values():
+        for rule in rule_set.calls:
+            for text in (rule.call, "x." + rule.call, "my" + rule.call, rule.call[1:], "zzz"):
+                expected = tuple(
+                    candidate for candidate in rule_set.calls if text.endswith(candidate.call)
+                )
+                assert rule_set.matcher.match(text) == expected
+
+
+def test_text_matcher_matches_per_line_substring_semantics(monkeypatch):
+    import random
+
+    from cbom_scanner.core import matcher as matcher_module
+    from cbom_scanner.core.rules import CallRule
+
+    def legacy(text, rules):
+        out = []
+        for index, line in enumerate(text.splitlines(), start=1):
+            hits = [(rule, line.find(rule.call) + 1) for rule in rules if rule.call in line]
+            if hits:
+                out.append((index, line, hits))
+        return out
+
+    rng = random.Random(7)
+    pieces = ["a", "b", "ab", "x.", "(", "'", " ", "\n", "\r\n", "\x0b"]
+    for limit in (0, matcher_module._FIND_LIMIT):
+        monkeypatch.setattr(matcher_module, "_FIND_LIMIT", limit)
+        for _ in range(300):
+            calls = ["".join(rng.choice("abx.") for _ in range(rng.randint(1, 3))) for _ in range(4)]
+            rules = [
+                CallRule(str(i), call, call, "lib", None, "LOW", None, None, None, {})
+                for i, call in enumerate(calls)
+            ]
+            text = "".join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+            assert list(matcher_module.TextMatcher(rules).scan(text)) == legacy(text, rules)
+
+
+def test_iter_scan_streams_findings(orchestrator):
+    from cbom_scanner.core.options import ScanOptions
+
+    fixture_path = Path(__file__).parents[1] / "testdata" / "crypto_zoo"
+    options = ScanOptions(include_ts=True)
+    expected = orchestrator.scan(fixture_path, options)
+    streamed = orchestrator.iter_scan(fixture_path, options)
+    first = next(streamed)
+    assert first in expected
+    rest = [first, *streamed]
+    assert sorted(rest, key=lambda finding: finding.id) == expected
+    assert list(orchestrator.iter_scan(fixture_path, options, ordered=True)) == expected
+
+
+def test_collect_call_sites_function_context():
+    from cbom_scanner.core.utils import collect_call_sites
+
+    def contexts(source, language, call_node_type="call_expression"):
+        sites = collect_call_sites(source, language, call_node_type=call_node_type)
+        return sorted((site.function, site.function_context) for site in sites)
+
+    python_source = (
+        "top()\n"
+        "class Box:\n"
+        "    def seal(self):\n"
+        "        wrap = lambda: inner()\n"
+        "        after()\n"
+    )
+    assert contexts(python_source, "python", "call") == [
+        ("after", "seal"),
+        ("inner", "wrap"),
+        ("top", None),
+    ]
+    js_source = (
+        "function outer() {\n"
+        "  run(function () { a(); });\n"
+        "  const handler = () => b();\n"
+        "}\n"
+        "class K { method() { c(); } }\n"
+    )
+    assert contexts(js_source, "javascript") == [
+        ("a", "outer"),
+        ("b", "handler"),
+        ("c", "method"),
+        ("run", "outer"),
+    ]
+    cpp_source = "char *Box::seal(int n) { return encrypt(n); }\nint main() { go(); }\n"
+    assert contexts(cpp_source, "cpp") == [("encrypt", "Box::seal"), ("go", "main")]
+
+
+def test_findings_are_slotted_and_share_strings():
+    import pickle
+
+    from cbom_scanner.core.models import RawFinding
+    from cbom_scanner.core.normalizer import normalize
+
+    def raw(line):
+        return RawFinding(
+            file="".join(["src/", "a.c"]),
+            line=line,
+            column=1,
+            snippet="EVP_sha256();",
+            function="".join(["dig", "est"]),
+            api="EVP_sha256",
+            library="openssl",
+            algorithm="sha256",
+            mode=None,
+            key_size_bits=None,
+            confidence="HIGH",
+            asset_type="HASH",
+            notes=None,
+        )
+
+    first, second = normalize(raw(1)), pickle.loads(pickle.dumps(normalize(raw(2))))
+    assert not hasattr(first, "__dict__") and not hasattr(first.evidence, "__dict__")
+    assert first.evidence.file is second.evidence.file
+    assert first.evidence.function is second.evidence.function
+    assert first.algorithm is second.algorithm
+    assert second == normalize(raw(2))
+
+
+def test_normalize_many_matches_normalize():
+    from cbom_scanner.core.models import RawFinding
+    from cbom_scanner.core.normalizer import normalize, normalize_many
+
+    fields = [
+        ("aes-256-gcm", None, None, None),
+        ("EVP_aes_128_cbc()", None, None, None),
+        ("ChaCha20_Poly1305", None, None, None),
+        ("RSA_SHA256", None, None, None),
+        ("ecdsa", None, "NID_X9_62_prime256v1", "SIGNATURE"),
+        ("sha256", None, None, None),
+        (None, "cbc_pkcs", "secp384r1", None),
+    ]
+    raws = [
+        RawFinding("a.c", line, 1, "", None, "api", "lib", *fields[line % len(fields)][:3],
+                   "HIGH", fields[line % len(fields)][3], None)
+        for line in range(30)
+    ]
+    assert normalize_many(raws) == [normalize(raw) for raw in raws]
+    assert normalize(raws[4]).key_size_bits == "256"
+    assert normalize(raws[3]).algorithm == "RSA" and normalize(raws[3]).mode == "SHA-256"
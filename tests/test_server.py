@@ -0,0 +1,173 @@
+from pathlib import Path
+import http.client
+import json
+import shutil
+import socket
+import sys
+import threading
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+ZOO = ROOT / "testdata" / "crypto_zoo"
+
+
+class _UnixConnection(http.client.HTTPConnection):
+    def __init__(self, path: str) -> None:
+        super().__init__("localhost")
+        self.socket_path = path
+
+    def connect(self) -> None:
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.socket_path)
+
+
+def _serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+
+def _request(connection, method, path, payload=None, headers=None):
+    body = json.dumps(payload) if payload is not None else None
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    connection.request(method, path, body=body, headers=headers)
+    response = connection.getresponse()
+    return response.status, json.loads(response.read())
+
+
+def _service():
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.server import ScanService
+
+    service = ScanService(_build_scanners(), ScanOptions())
+    service.warm()
+    return service
+
+
+def test_http_scan_matches_cli_and_reuses_results(tmp_path):
+    from cbom_scanner.cli import _build_scanners
+    from cbom_scanner.core.options import ScanOptions
+    from cbom_scanner.core.orchestrator import Orchestrator
+    from cbom_scanner.core.server import make_server
+    from cbom_scanner.formats.cbom import build_cbom
+
+    repo = tmp_path / "repo"
+    shutil.copytree(ZOO, repo)
+    expected = build_cbom("repo", Orchestrator(_build_scanners()).scan(repo, ScanOptions()))
+
+    service = _service()
+    server = make_server(service, port=0)
+    thread = _serve(server)
+    try:
+        connection = http.client.HTTPConnection(*server.server_address[:2])
+        status, report = _request(connection, "POST", "/scan", {"path": str(repo)})
+        assert status == 200
+        assert report["cryptoAssets"] == expected["cryptoAssets"]
+        misses = service.misses
+
+        status, again = _request(connection, "POST", "/scan", {"path": str(repo)})
+        assert again["cryptoAssets"] == expected["cryptoAssets"]
+        assert service.misses == misses
+
+        changed = repo / "go" / "go_sample.go"
+        changed.write_text(changed.read_text(encoding="utf-8") + "\n// edited\n", encoding="utf-8")
+        status, subset = _request(
+            connection, "POST", "/scan", {"path": str(repo), "files": ["go/go_sample.go"]}
+        )
+        assert status == 200
+        assert service.misses == misses + 1
+        assert subset["cryptoAssets"]
+        assert {asset["evidence"]["file"] for asset in subset["cryptoAssets"]} == {str(changed)}
+
+        status, health = _request(connection, "GET", "/health")
+        assert health["requests"] == 3 and health["cacheHits"] > 0
+
+        status, error = _request(connection, "POST", "/scan", {"path": "relative"})
+        assert status == 400 and "absolute" in error["error"]
+        outside = tmp_path / "outside.go"
+        shutil.copy(changed, outside)
+        for name in ("../outside.go", "go/../../outside.go", str(outside)):
+            status, error = _request(
+                connection, "POST", "/scan", {"path": str(repo), "files": [name]}
+            )
+            assert status == 400 and "not inside" in error["error"]
+        status, subset = _request(
+            connection, "POST", "/scan", {"path": str(repo), "files": ["node/../go/go_sample.go"]}
+        )
+        assert status == 200 and subset["cryptoAssets"]
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix sockets are required")
+def test_unix_socket_and_loopback_only(tmp_path):
+    from cbom_scanner.core.server import make_server
+
+    service = _service()
+    with pytest.raises(ValueError):
+        make_server(service, host="0.0.0.0", port=0)
+
+    socket_path = tmp_path / "cbom.sock"
+    server = make_server(service, socket_path=socket_path)
+    thread = _serve(server)
+    try:
+        connection = _UnixConnection(str(socket_path))
+        status, report = _request(
+            connection, "POST", "/scan", {"path": str(ZOO), "format": "cyclonedx"}
+        )
+        assert status == 200
+        assert report["bomFormat"] == "CycloneDX"
+        connection.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+    assert not socket_path.exists()
+
+
+def test_http_refuses_foreign_hosts_content_types_and_tokens():
+    from cbom_scanner.core.server import make_server
+
+    server = make_server(_service(), port=0, token="s3cret")
+    thread = _serve(server)
+    host, port = server.server_address[:2]
+    auth = {"Authorization": "Bearer s3cret"}
+    payload = {"path": str(ZOO), "files": ["go/go_sample.go"]}
+
+    def send(headers, payload=payload):
+        connection = http.client.HTTPConnection(host, port)
+        try:
+            return _request(connection, "POST", "/scan", payload, headers)
+        finally:
+            connection.close()
+
+    try:
+        # DNS rebinding: the browser sends the attacker's name as Host.
+        for bad_host in ("evil.example.com", f"evil.example.com:{port}", "localhost:1"):
+            status, error = send({**auth, "Host": bad_host})
+            assert status == 403 and "Host" in error["error"]
+        # Cross-site form posts cannot set a JSON content type.
+        status, error = send({**auth, "Content-Type": "text/plain"})
+        assert status == 415
+        status, error = send({})
+        assert status == 401
+        status, error = send({"Authorization": "Bearer wrong"})
+        assert status == 401
+
+        for good_host in (f"localhost:{port}", f"127.0.0.1:{port}"):
+            status, report = send({**auth, "Host": good_host})
+            assert status == 200 and report["cryptoAssets"]
+        status, _ = send({"Content-Type": "application/json; charset=utf-8", **auth})
+        assert status == 200
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from pathlib import Path
+import shutil
+import sys
+
+import pytest
+
+ROOT = Path(__file__).parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+FIXTURES = ROOT / "tests" / "fixtures" / "crypto_zoo"
+
+
+class _FixedDatetime:
+    @staticmethod
+    def now(tz=None):
+        return datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture()
+def repo(tmp_path):
+    root = tmp_path / "repo"
+    shutil.copytree(ROOT / "testdata" / "crypto_zoo", root)
+    shutil.copytree(FIXTURES, root / "fixtures")
+    (root / "fixtures" / "copy").mkdir()
+    for path in sorted(FIXTURES.iterdir()):
+        shutil.copy(path, root / "fixtures" / "copy" / path.name)
+    return root
+
+
+def test_parse_shard():
+    from cbom_scanner.core.shard import parse_shard
+
+    assert parse_shard("2/4") == (2, 4)
+    for spec in ("0/4", "5/4", "1", "a/b"):
+        with pytest.raises(ValueError):
+            parse_shard(spec)
+
+
+def test_shards_partition_files_by_size(repo):
+    from cbom_scanner.core.discovery import iter_files
+    from cbom_scanner.core.shard import FILE_OVERHEAD_BYTES, shard_files
+
+    files = list(iter_files(repo))
+    shards = [shard_files(repo, files, index, 3) for index in (1, 2, 3)]
+    assert sorted(path for shard in shards for path in shard) == sorted(files)
+    for shard in shards:
+        assert shard == [path for path in files if path in shard]
+    assert shard_files(repo, list(reversed(files)), 2, 3) == list(reversed(shards[1]))
+
+    loads = [sum(path.stat().st_size + FILE_OVERHEAD_BYTES for path in shard) for shard in shards]
+    largest = max(path.stat().st_size + FILE_OVERHEAD_BYTES for path in files)
+    assert max(loads) - min(loads) <= largest
+
+
+@pytest.mark.parametrize("report_format", ["cbom", "cyclonedx"])
+def test_merged_shards_match_full_scan(tmp_path, monkeypatch, repo, report_format):
+    from cbom_scanner import cli
+    from cbom_scanner.formats import cbom, cyclonedx
+    from cbom_scanner.formats.reader import load_report
+
+    monkeypatch.setattr(cbom, "datetime", _FixedDatetime)
+    monkeypatch.setattr(cyclonedx, "datetime", _FixedDatetime)
+    common = ["--format", report_format, "--no-cache", "--jobs", "1", "--include-ts"]
+    full = tmp_path / "full.json"
+    assert cli.main(["scan", str(repo), "--out", str(full), *common]) == 0
+    shards = []
+    for index in (1, 2, 3):
+        shards.append(tmp_path / f"shard{index}.json")
+        args = ["scan", str(repo), "--shard", f"{index}/3", "--out", str(shards[-1]), *common]
+        assert cli.main(args) == 0
+    merged = tmp_path / "merged.json"
+    merge = ["merge", *map(str, shards), "--format", report_format, "--out", str(merged)]
+    assert cli.main(merge) == 0
+    assert merged.read_bytes() == full.read_bytes()
+
+    reports = [load_report(path) for path in shards]
+    assert all(report.findings for report in reports)
+    twice = ["merge", str(shards[0]), str(shards[0]), "--out", str(tmp_path / "bad.json")]
+    assert cli.main(twice) == 2
+    no_id = tmp_path / "no-id.json"
+    no_id.write_text('{"cbomVersion": "1.0", "cryptoAssets": [{"algorithm": "AES"}]}')
+    assert cli.main(["merge", str(shards[0]), str(no_id), "--out", str(tmp_path / "bad.json")]) == 2